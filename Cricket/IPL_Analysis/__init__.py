@@ -0,0 +1 @@
+"""IPL phase-wise analysis dashboard and its data store."""
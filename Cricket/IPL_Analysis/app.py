@@ -1,21 +1,33 @@
 import streamlit as st
-import numpy as np
 import pandas as pd
-import plotly.express as px
 import base64
-import zipfile
 import os
+import sys
+from ipl_store import available_seasons, ensure_store
+import leaderboards
+import matchups
+import figures
+import form
+import player_index
+import rankings
+
+# Repo root, for the shared (opt-in) stage instrumentation
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import instrumentation
+
+instrumentation.start_run("ipl")
+instrumentation.instrument(leaderboards, "update_cube", "top_n")
+instrumentation.instrument(rankings, "load_leaderboards", "leaderboard")
+instrumentation.instrument(player_index, "build_player_index", "player_rows")
+instrumentation.instrument(figures, "trend_figure")
+instrumentation.instrument(form, "update_state", "form_leaderboards")
+instrumentation.instrument(matchups, "update_cube", "build_index", "pair_summary", "worst_matchups")
 
 st.set_page_config(layout="wide")  # Set layout to wide to prevent horizontal overflow
 
-zip_path = "Cricket/IPL_Analysis/ipl_phase_dataset.zip"
-if os.path.exists(zip_path):
-    with zipfile.ZipFile(zip_path, "r") as zip_ref:
-        zip_ref.extractall("Cricket/IPL_Analysis")
-else:
-    st.warning("Dataset ZIP not found — loading pre-extracted files.")
-
+@st.cache_resource
 def get_base64_image(image_path):
+    # Read and encode once per process, only when the home page is shown
     with open(image_path, "rb") as img_file:
         return base64.b64encode(img_file.read()).decode()
 
@@ -38,33 +50,68 @@ st.markdown("""
     """, unsafe_allow_html=True)    
 
 # ---- Data Loaders ----
+TREND_SOURCES = figures.TREND_SOURCES
+
+@instrumentation.traced()
 @st.cache_data
 def load_team_batting_stats():
-    return pd.read_csv('Cricket/IPL_Analysis/season_team_batting_phase.csv')
+    return pd.read_csv(TREND_SOURCES['team_batting'])
 
+@instrumentation.traced()
 @st.cache_data
 def load_team_bowling_stats():
-    return pd.read_csv('Cricket/IPL_Analysis/season_team_bowling_phase.csv')
+    return pd.read_csv(TREND_SOURCES['team_bowling'])
 
-@st.cache_data
-def load_team_stats():
-    return pd.read_csv('Cricket/IPL_Analysis/ipl_phase_dataset.csv')
+@instrumentation.traced()
+@st.cache_resource
+def load_store():
+    # One-time CSV -> Parquet conversion per process; later reruns just open the store
+    return ensure_store()
 
+@instrumentation.traced()
 @st.cache_data
+def load_seasons():
+    return available_seasons(load_store())
+
+@instrumentation.traced()
+@st.cache_resource
+def load_cap_cube(kind):
+    # Per-season, per-player counts; only seasons new to the store are aggregated
+    return leaderboards.update_cube(kind, store_dir=load_store())
+
+@instrumentation.traced()
+@st.cache_resource
 def load_player_batting():
-    return pd.read_csv('Cricket/IPL_Analysis/player_batting_20_25.csv')
+    # Every phase x metric leaderboard, ratios recomputed from summed counts
+    return rankings.load_leaderboards('batting')
 
-@st.cache_data
+@instrumentation.traced()
+@st.cache_resource
 def load_player_bowling():
-    return pd.read_csv('Cricket/IPL_Analysis/player_bowling_20_25.csv')
+    return rankings.load_leaderboards('bowling')
 
-@st.cache_data
+@instrumentation.traced()
+@st.cache_resource
+def load_form_boards(kind):
+    # Time-decayed per-player form; only matches new to the store are folded in
+    return form.load_form_leaderboards(kind, store_dir=load_store())
+
+@instrumentation.traced()
+@st.cache_resource
 def load_batting_stats():
-    return pd.read_csv('Cricket/IPL_Analysis/season_phase_batting_df.csv')
+    # Player -> contiguous season-sorted block, plus dropdown name lists per season window
+    return player_index.build_player_index(pd.read_csv(TREND_SOURCES['player_batting']), 'striker')
 
-@st.cache_data
+@instrumentation.traced()
+@st.cache_resource
 def load_bowling_stats():
-    return pd.read_csv('Cricket/IPL_Analysis/season_phase_bowling_df.csv')
+    return player_index.build_player_index(pd.read_csv(TREND_SOURCES['player_bowling']), 'bowler')
+
+@instrumentation.traced()
+@st.cache_resource
+def load_matchups():
+    # Integer-coded (striker, bowler, phase, season) counts; only seasons new to the store are aggregated
+    return matchups.build_index(matchups.update_cube(store_dir=load_store()))
 
 # ---- Main App ----
 analytics_option = {"Select" : "Select",
@@ -76,8 +123,12 @@ analytics_option = {"Select" : "Select",
     "Orange Cap" : "🔥 Orange Cap (Most Runs)",
     "Top Player Batting": "🌟🏏 Top Batters",
     "Top Player Bowling": "🌟🎯 Top Bowlers",
+    "Matchups": "⚔️ Batter vs Bowler",
     "Scouting Recommendation" : "🔍 Scouting Perspective"}
 
+# Top Batters / Top Bowlers: fixed 2020-25 window or time-decayed form
+RANKING_BASES = ['Last 5 seasons', 'Current form']
+
 selected_label = st.sidebar.selectbox("Select Analysis Type", list(analytics_option.values()))
 analysis_type = [k for k, v in analytics_option.items() if v == selected_label][0]
 
@@ -101,12 +152,8 @@ st.markdown("""
 
 # Image for home page
 # -------
-with open(IMAGE_PATH, "rb") as f:
-    data = f.read()
-    img_base64 = base64.b64encode(data).decode()
-    
 if analysis_type == 'Select':
-    #img_base64 = get_base64_image("Cricket/IPL_Analysis/images/welcome.png")
+    img_base64 = get_base64_image(IMAGE_PATH)
     st.markdown(f"""
     <div style='text-align:center; margin-top:40px;'>
         <img src="data:Cricket/IPL_Analysis/image/png;base64,{img_base64}" width="90" style="margin-bottom:10px;">
@@ -142,125 +189,16 @@ team_images = {
 # 1. Define Plotting Functions at the Top of Script
 # -------------------------
 
-def plot_team_batting(df,team, metric, by):
-    filtered_df = df[df['cleaned_team_batting'] == team]
-    fig = px.line(filtered_df,x='season',y= metric,color= by,
-                  title=f'📈 Evolution of {metric} Across IPL Seasons', 
-                  labels={ 'run_rate' : 'Run Rate (RPO)','wickets' : 'Total Wickets', 'season': 'IPL Season'}, 
-                  color_discrete_map={'Powerplay': '#FF6B6B','Middle': '#4ECDC4','Death': '#45B7D1'})
-    # Enhanced styling
-    hover_labels = {'run_rate': 'Run Rate','wickets': 'Wickets'}
-    label = hover_labels.get(metric, metric.replace('_', ' ').title())
-    fig.update_traces(mode='lines+markers',line=dict(width=4),marker=dict(size=8), 
-                      hovertemplate='<b>%{fullData.name}</b><br>' +
-                      'Season: %{x}<br>' +
-                      f'{label} : ' +'%{y:.2f} <extra></extra>')
-
-    fig.update_layout(title_font_size=18,title_x = 0.3,height=500, 
-                      hovermode='x unified',legend=dict(orientation="h",
-                                                        yanchor="bottom", 
-                                                        y=1,
-                                                        xanchor="center",
-                                                        x=0.5))
-    return fig
-
-def plot_team_bowling(df,team, metric,by): 
-    filtered_df = df[df['cleaned_team_bowling'] == team]
-    fig = px.line(filtered_df,x='season',y= metric,color= by, 
-                  title = f'📈 Evolution of {metric} Across IPL Seasons',
-                  labels={ 'economy_rate' : 'Economy Rate (RPO)','wickets' : 'Total Wickets', 'season': 'IPL Season'},
-                  color_discrete_map={'Powerplay': '#FF6B6B','Middle': '#4ECDC4','Death': '#45B7D1'})
-    # Enhanced styling
-    hover_labels = {'run_rate': 'Run Rate','wickets': 'Wickets'}
-    label = hover_labels.get(metric, metric.replace('_', ' ').title())
-    fig.update_traces(mode='lines+markers',line=dict(width=4),marker=dict(size=8),
-                        hovertemplate='<b>%{fullData.name}</b><br>' +
-                        'Season: %{x}<br>' +
-                        f'{label} : ' +'%{y:.2f} <extra></extra>')
-    
-    fig.update_layout(title_font_size=18,title_x=0.3,height=500,
-                        hovermode='x unified',legend=dict(orientation="h",
-                                                          yanchor="bottom",
-                                                          y=1,xanchor="center",
-                                                          x=0.5))
-    return fig
-    pass
-
+@st.cache_resource
+def load_figure_cache():
+    # Serialized trend figures shared by every session in this process (LRU, byte-capped)
+    return figures.FigureCache()
 
-def plot_player_batting(df, player, metric,by):
-    
-    # Filter data for selected player
-    player_df = df[df['striker'] == player]
-
-    # Retrieve the latest or overall performance index
-    performance_idx = player_df['performance_index'].mean()  # or use latest season
-
-    fig = px.line(player_df,x='season',y= metric,color= by, 
-                  title = f'📈 Evolution of {metric} Across IPL Seasons',
-                  labels={ 'run_rate' : 'Run Rate (RPO)','runs' : 'Total Runs', 'season': 'IPL Season'},
-                  color_discrete_map={'Powerplay': '#FF6B6B','Middle': '#4ECDC4','Death': '#45B7D1'})
-    # Enhanced styling
-    hover_labels = {'run_rate': 'Run Rate','wickets': 'Wickets'}
-    label = hover_labels.get(metric, metric.replace('_', ' ').title())
-    fig.update_traces(mode='lines+markers',line=dict(width=4),marker=dict(size=8),
-                        hovertemplate='<b>%{fullData.name}</b><br>' +
-                        'Season: %{x}<br>' +
-                        f'{label} : ' +'%{y:.2f} <extra></extra>')
-    
-    fig.update_layout(title_font_size=18,title_x=0.3,height=500,
-                        hovermode='x unified',legend=dict(orientation="h",
-                                                          yanchor="bottom",
-                                                          y=1,xanchor="center",
-                                                          x=0.5))
-
-    # Optionally, annotate best season/metric
-    max_season = player_df.loc[player_df[metric].idxmax(), 'season']
-    max_value = player_df[metric].max()
-    fig.add_annotation(
-        x=max_season, y=max_value,
-        text=f'Best: {max_value:.2f} in {max_season}',
-        showarrow=True, arrowhead=2, ax=0, ay=-40,
-        font=dict(size=12, color="green")
-    )
-
-    return fig
-
-def plot_player_bowling(df, player, metric,by):
-    
-    # Filter data for selected player
-    player_df = df[df['bowler'] == player]
-
-    # Retrieve the latest or overall performance index
-    performance_idx = player_df['performance_index'].mean()  # or use latest season
-
-    fig = px.line(player_df,x='season',y= metric,color= by, 
-                  title = f'📈 Evolution of {metric} Across IPL Seasons',
-                  labels={ 'economy_rate' : 'Economy Rate (RPO)','wickets' : 'Total Wickets', 'season': 'IPL Season'},
-                  color_discrete_map={'Powerplay': '#FF6B6B','Middle': '#4ECDC4','Death': '#45B7D1'})
-    # Enhanced styling
-    hover_labels = {'run_rate': 'Run Rate','wickets': 'Wickets'}
-    label = hover_labels.get(metric, metric.replace('_', ' ').title())
-    fig.update_traces(mode='lines+markers',line=dict(width=4),marker=dict(size=8),
-                        hovertemplate='<b>%{fullData.name}</b><br>' +
-                        'Season: %{x}<br>' +
-                        f'{label} : ' +'%{y:.2f} <extra></extra>')
-    
-    fig.update_layout(title_font_size=18,title_x=0.3,height=500,
-                        hovermode='x unified',legend=dict(orientation="h",
-                                                          yanchor="bottom",
-                                                          y=1,xanchor="center",
-                                                          x=0.5))
-    #Optionally, annotate best season/metric
-    max_season = player_df.loc[player_df[metric].idxmax(), 'season']
-    max_value = player_df[metric].max()
-    fig.add_annotation(
-        x=max_season, y=max_value,
-        text=f'Best: {max_value:.2f} in {max_season}',
-        showarrow=True, arrowhead=2, ax=0, ay=-40,
-        font=dict(size=12, color="green")
-    )
-
-    return fig
+@instrumentation.traced()
+def plot_trend(df, view, entity, metric, by):
+    # Team/player season trends: one builder, cached per (view, entity, metric, data version)
+    version = figures.data_version(TREND_SOURCES[view])
+    return figures.cached_trend_figure(load_figure_cache(), df, view, entity, metric, version, by)
 
 # -------------------------
 # 2. In Streamlit App Logic: Use IF/ELSE To Select and Call Functions
@@ -269,7 +207,7 @@ def plot_player_bowling(df, player, metric,by):
 if analysis_type == 'Team Batting':
     df = load_team_batting_stats()
     team = st.sidebar.selectbox("🏆 Team", sorted(df['cleaned_team_batting'].unique()))
-    metric = st.sidebar.selectbox("⚡ Metric", ['run_rate', 'total_runs','boundaries','fours','sixes'])
+    metric = st.sidebar.selectbox("⚡ Metric", figures.TREND_VIEWS['team_batting']['metrics'])
     st.sidebar.markdown("""
         <style>
         /* Change sidebar section title and label text color */
@@ -286,8 +224,9 @@ if analysis_type == 'Team Batting':
     else:
         st.sitebar.write("Logo not found for selected team.")
         
-    fig = plot_team_batting(df,team, metric, 'phase')   # <--- call function here
-    st.plotly_chart(fig)
+    fig = plot_trend(df, 'team_batting', team, metric, 'phase')   # <--- call function here
+    with instrumentation.stage("render trend chart"):
+        st.plotly_chart(fig)
     
     insights = {
         'CSK': "CSK: \n\nLegendary death-over finishing; boosting Powerplay aggression could elevate totals.",
@@ -316,7 +255,7 @@ if analysis_type == 'Team Batting':
 elif analysis_type == 'Team Bowling':
     df = load_team_bowling_stats()
     team = st.sidebar.selectbox("🏆 Team", sorted(df['cleaned_team_bowling'].unique()))
-    metric = st.sidebar.selectbox("⚡ Metric", ['economy_rate', 'total_runs','boundaries','fours','sixes'])
+    metric = st.sidebar.selectbox("⚡ Metric", figures.TREND_VIEWS['team_bowling']['metrics'])
     st.sidebar.markdown("""
         <style>
         /* Change sidebar section title and label text color */
@@ -345,8 +284,9 @@ elif analysis_type == 'Team Bowling':
     else:
         st.sitebar.write("Logo not found for selected team.")
     
-    fig = plot_team_bowling(df, team, metric, 'phase')   # <--- call function here
-    st.plotly_chart(fig)
+    fig = plot_trend(df, 'team_bowling', team, metric, 'phase')   # <--- call function here
+    with instrumentation.stage("render trend chart"):
+        st.plotly_chart(fig)
 
     if team in insights:
         st.info(insights[team])
@@ -361,99 +301,56 @@ elif analysis_type == 'Team Bowling':
         """)
 
 elif analysis_type == 'Orange Cap':
-    df = load_team_stats()
-    legal = df[~df["extras_type"].isin(["wide"])]
-    season = st.sidebar.selectbox('Season', sorted(df['season'].unique()))
-    agg = legal.groupby(['season','striker']).agg(
-        runs = ('batsman_runs','sum'),
-        balls_faced = ('ball','count'),
-        lost_wicket=('player_dismissed', lambda x: x.notna().sum()),
-        dot_balls = ('batsman_runs',lambda x: (x==0).sum()),
-        boundaries=('batsman_runs', lambda x: ((x==4)| (x ==6)).sum()),
-        fours = ('is_four','sum'),
-        sixes = ('is_six','sum')).reset_index()
-    # Filter on min_balls per phase
-    agg['strike_rate'] = (agg['runs'] / agg['balls_faced'] *100).round(2)
-    agg['balls_per_dismissal'] = (agg.apply(lambda row: row['balls_faced'] / row['lost_wicket']
-                                             if row['lost_wicket'] > 0 else np.nan,axis=1)).round(2)
-    agg['batting_avg'] = (agg.apply(lambda row: row['runs'] / row['lost_wicket']
-                                             if row['lost_wicket'] > 0 else np.nan,axis=1)).round(2)
-    agg['dot_ball_pct'] = (agg['dot_balls'] / agg['balls_faced']).round(2)
-    agg['dismissal_rate'] = (agg['lost_wicket'] / agg['balls_faced']).round(2)
-    # --- 3. Sort and take Top N ------------------------------------
+    season = st.sidebar.selectbox('Season', load_seasons())
+    # --- Indexed season slice + top N from the precomputed cube ----
     top_n = 10   # change as you like
-    orange_top = (agg[agg['season']==season].sort_values('runs', ascending=False).head(top_n).reset_index(drop=True))
-    if "season" in orange_top.columns:
-        orange_top = orange_top.drop(columns="season")
+    orange_top = leaderboards.top_n(load_cap_cube('batting'), 'batting', season, 'runs', top_n)
 
     # --- 4. Display -------------------------------------------------
     st.subheader(f"🏏🟠 Top Orange-Cap Performers for {season}")
     st.dataframe(orange_top, hide_index=True)
 
 elif analysis_type == 'Purple Cap':
-    df = load_team_stats()
-    season = st.sidebar.selectbox('Season', sorted(df['season'].unique()))
-    bowler_dismissals = {"caught","bowled","lbw","caught and bowled","stumped","hit wicket"}
-    df['bowler_wicket'] = df['wicket_type'].isin(bowler_dismissals)
-    agg = df.groupby(['season','bowler']).agg(
-        wickets=('bowler_wicket', 'sum'),
-        runs_conceded = ('total_runs','sum'),
-        balls_bowled = ('ball','count'),
-        dot_balls = ('batsman_runs',lambda x: (x==0).sum()),
-        boundaries=('batsman_runs', lambda x: ((x==4)| (x ==6)).sum()),
-        fours = ('is_four','sum'),
-        sixes = ('is_six','sum')).reset_index()
-    # Filter on min_balls per phase
-    agg['economy_rate'] = (agg['runs_conceded'] / (agg['balls_bowled']/6)).round(2)
-    agg['balls_per_wicket'] = (agg.apply(lambda row: row['balls_bowled'] / row['wickets']
-                                         if row['wickets'] > 0 else np.nan,axis=1)).round(2)
-    agg['bowling_avg'] = (agg.apply(lambda row: row['runs_conceded'] / row['wickets']
-                                         if row['wickets'] > 0 else np.nan,axis=1)).round(2)
-    agg['dot_ball_pct'] = (agg['dot_balls'] / agg['balls_bowled']).round(2)
-    agg['boundary_pct'] = (agg['boundaries'] / agg['balls_bowled']).round(2)
-    agg['six_pct'] = (agg['sixes'] / agg['balls_bowled']).round(2)
-    # --- 3. Sort and take Top N ------------------------------------
+    season = st.sidebar.selectbox('Season', load_seasons())
+    # --- Indexed season slice + top N from the precomputed cube ----
     top_n = 10   # change as you like
-    purple_top = (agg[agg['season']==season].sort_values('wickets', ascending=False).head(top_n).reset_index(drop=True))
-    if "season" in purple_top.columns:
-        purple_top = purple_top.drop(columns="season")
+    purple_top = leaderboards.top_n(load_cap_cube('bowling'), 'bowling', season, 'wickets', top_n)
 
     # --- 4. Display -------------------------------------------------
     st.subheader(f"🏏🟣 Top Purple-Cap Performers for {season}")
     st.dataframe(purple_top, hide_index=True)
     
 elif analysis_type == 'Player Batting':
-    df = load_batting_stats()
-    recent = df[df['season'] > 2020].copy()
+    index = load_batting_stats()
     st.markdown(f"### 📊 Season-wise Player batting Performance")
-    name = st.sidebar.selectbox('Player Name', sorted(recent['striker'].unique()))
-    metric = st.sidebar.selectbox("Select Metric for Ranking",
-                                  ['strike_rate','runs', 'sixes', 'fours', 'boundaries', 
-                                   'performance_index'])
-    fig = plot_player_batting(df,name, metric, 'phase')   # <--- call function here
-    st.plotly_chart(fig)
+    name = st.sidebar.selectbox('Player Name', player_index.player_names(index, since=player_index.RECENT_SINCE))
+    metric = st.sidebar.selectbox("Select Metric for Ranking", figures.TREND_VIEWS['player_batting']['metrics'])
+    fig = plot_trend(player_index.player_rows(index, name), 'player_batting', name, metric, 'phase')   # <--- call function here
+    with instrumentation.stage("render trend chart"):
+        st.plotly_chart(fig)
     
 elif analysis_type == 'Player Bowling':
-    df = load_bowling_stats()
-    recent = df[df['season'] > 2020].copy()
+    index = load_bowling_stats()
     st.markdown(f"### 📊 Season-wise Player bowling Performance")
-    name = st.sidebar.selectbox('Player Name', sorted(recent['bowler'].unique()))
-    metric = st.sidebar.selectbox("Select Metric for Ranking",
-                                  ['economy_rate','runs_conceded','wickets', 'sixes', 'fours', 'boundaries', 
-                                   'performance_index'])
+    name = st.sidebar.selectbox('Player Name', player_index.player_names(index, since=player_index.RECENT_SINCE))
+    metric = st.sidebar.selectbox("Select Metric for Ranking", figures.TREND_VIEWS['player_bowling']['metrics'])
 
-    fig = plot_player_bowling(df,name, metric, 'phase')   # <--- call function here
-    st.plotly_chart(fig)
+    fig = plot_trend(player_index.player_rows(index, name), 'player_bowling', name, metric, 'phase')   # <--- call function here
+    with instrumentation.stage("render trend chart"):
+        st.plotly_chart(fig)
     
 elif analysis_type == 'Top Player Batting':
-    df = load_player_batting()
-    st.markdown(f"### 📊 Ranking based on Last 5 Season Performance and min balls played 120")
+    basis = st.sidebar.selectbox("Rank by", RANKING_BASES)
+    if basis == 'Current form':
+        boards, metrics = load_form_boards('batting'), form.FORM_METRICS['batting']
+        st.markdown(f"### 📊 Ranking based on Current Form (matches weighted by a {form.HALF_LIFE_DAYS}-day half-life)")
+    else:
+        boards, metrics = load_player_batting(), rankings.RANKINGS['batting']['metrics']
+        st.markdown(f"### 📊 Ranking based on Last 5 Season Performance and min balls played 200 (50 at the death)")
     # For Top 5 Batting Players
     phase = st.sidebar.selectbox("Select Phase",['Powerplay','Middle','Death'])
-    metric = st.sidebar.selectbox("Select Metric for Ranking",
-                                  ['strike_rate','runs', 'sixes', 'fours', 'boundaries', 
-                                   'performance_index'])
-    player = st.sidebar.number_input("Top N Player", min_value=1, step=1)
+    metric = st.sidebar.selectbox("Select Metric for Ranking", list(metrics))
+    player = st.sidebar.number_input("Top N Player", min_value=1, max_value=rankings.TOP_K, step=1)
     st.sidebar.markdown("""
         <style>
         /* Change sidebar section title and label text color */
@@ -464,25 +361,24 @@ elif analysis_type == 'Top Player Batting':
         }
         </style>
         """, unsafe_allow_html=True)
-    filtered_df = df[df['phase'] == phase]
-    player_stats = filtered_df.groupby('striker')[metric].sum().reset_index()
-    top5_batsmen = player_stats.sort_values(by=metric, ascending=False).head(player)
+    top5_batsmen = rankings.leaderboard(boards, phase, metric, player)
 
     st.subheader("Top Batsmen")
     st.dataframe(top5_batsmen, hide_index=True)
     
 elif analysis_type == 'Top Player Bowling':
-    df = load_player_bowling()
-    st.markdown(f"### 📊 Ranking based on Last 5 Season Performance and min balls bowled 120")
+    basis = st.sidebar.selectbox("Rank by", RANKING_BASES)
+    if basis == 'Current form':
+        boards, metrics = load_form_boards('bowling'), form.FORM_METRICS['bowling']
+        st.markdown(f"### 📊 Ranking based on Current Form (matches weighted by a {form.HALF_LIFE_DAYS}-day half-life)")
+    else:
+        boards, metrics = load_player_bowling(), rankings.RANKINGS['bowling']['metrics']
+        st.markdown(f"### 📊 Ranking based on Last 5 Season Performance and min balls bowled 120")
     # For Top 5 Bowling Players
     phase = st.sidebar.selectbox("Select Phase",['Powerplay','Middle','Death'])
-    metric = st.sidebar.selectbox("Select Metric for Ranking",
-                                  ['economy_rate','runs_conceded', 'sixes', 'fours', 'boundaries', 
-                                   'performance_index'])
-    player = st.sidebar.number_input("Top N Player", min_value=1, step=1)
+    metric = st.sidebar.selectbox("Select Metric for Ranking", list(metrics))
+    player = st.sidebar.number_input("Top N Player", min_value=1, max_value=rankings.TOP_K, step=1)
     
-    filtered_df = df[df['phase'] == phase]
-    player_stats = filtered_df.groupby('bowler')[metric].sum().reset_index()
     st.sidebar.markdown("""
         <style>
         /* Change sidebar section title and label text color */
@@ -493,14 +389,36 @@ elif analysis_type == 'Top Player Bowling':
         }
         </style>
         """, unsafe_allow_html=True)
-    if metric != 'performance_index':
-        top5_bowler = player_stats.sort_values(by=metric, ascending=True).head(player)
-    else :
-        top5_bowler = player_stats.sort_values(by=metric, ascending=False).head(player)
+    # Economy and runs/boundaries conceded rank ascending, performance_index descending
+    top5_bowler = rankings.leaderboard(boards, phase, metric, player)
 
     st.subheader("Top Bowler")
     st.dataframe(top5_bowler, hide_index=True)
     
+elif analysis_type == 'Matchups':
+    index = load_matchups()
+    st.markdown(f"### ⚔️ Batter vs Bowler Matchups (all seasons, wides excluded)")
+    batter = st.sidebar.selectbox("🏏 Batter", matchups.batters(index))
+    bowler = st.sidebar.selectbox("🎯 Bowler", ['All'] + matchups.bowlers_faced(index, batter))
+    phase = st.sidebar.selectbox("Select Phase", ['All'] + matchups.PHASES)
+
+    if bowler == 'All':
+        # Toughest opponents: per-bowler sums over this batter's block, partial top-k
+        metric = st.sidebar.selectbox("Worst by", list(matchups.WORST_BY))
+        top_n = st.sidebar.number_input("Top N Bowler", min_value=1, max_value=25, value=10, step=1)
+        worst = matchups.worst_matchups(index, batter, metric, top_n, phase=None if phase == 'All' else phase)
+        st.subheader(f"Toughest bowlers for {batter}")
+        st.caption(f"Bowlers faced for at least {matchups.MIN_BALLS} balls; dismissals exclude run-outs.")
+        st.dataframe(worst, hide_index=True)
+    else:
+        st.subheader(f"{batter} vs {bowler}")
+        st.dataframe(matchups.pair_summary(index, batter, bowler), hide_index=True)
+        rows = matchups.pair_rows(index, batter, bowler)
+        if phase != 'All':
+            rows = rows[rows['phase'] == phase]
+        st.markdown("**Season by season**")
+        st.dataframe(rows, hide_index=True)
+
 elif analysis_type == 'Scouting Recommendation':
     recommended = {
     "Openers"      : ["KL Rahul", "Faf du Plessis",'Rishab Pant','Klaasen'],
@@ -520,6 +438,8 @@ elif analysis_type == 'Scouting Recommendation':
 
 st.markdown("---\n*Created by Sachin Kumar Gupta — IPL Phase Portfolio*")
 
+instrumentation.debug_panel()
+
 
 
 
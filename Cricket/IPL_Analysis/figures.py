@@ -0,0 +1,156 @@
+"""Season-trend line charts for the team and player views, with a shared figure cache.
+
+One builder covers the four trend views (team batting/bowling, player
+batting/bowling); they differ only in the entity column, axis labels and
+whether the best season is annotated. Built figures are kept serialized in
+an LRU cache keyed by (view, entity, metric, by, data version) with a byte
+budget, so revisiting a team or player skips the filter and `px.line` call.
+Plotly is imported on first use, so importing this module for the source
+paths and view config stays cheap.
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+TREND_SOURCES = {
+    'team_batting': os.path.join(CURRENT_DIR, 'season_team_batting_phase.csv'),
+    'team_bowling': os.path.join(CURRENT_DIR, 'season_team_bowling_phase.csv'),
+    'player_batting': os.path.join(CURRENT_DIR, 'season_phase_batting_df.csv'),
+    'player_bowling': os.path.join(CURRENT_DIR, 'season_phase_bowling_df.csv'),
+}
+
+PHASE_COLORS = {'Powerplay': '#FF6B6B', 'Middle': '#4ECDC4', 'Death': '#45B7D1'}
+HOVER_LABELS = {'run_rate': 'Run Rate', 'wickets': 'Wickets'}
+
+TREND_VIEWS = {
+    "team_batting": {
+        "entity": "cleaned_team_batting",
+        "metrics": ['run_rate', 'total_runs', 'boundaries', 'fours', 'sixes'],
+        "labels": {'run_rate': 'Run Rate (RPO)', 'wickets': 'Total Wickets', 'season': 'IPL Season'},
+        "annotate_best": False,
+    },
+    "team_bowling": {
+        "entity": "cleaned_team_bowling",
+        "metrics": ['economy_rate', 'total_runs', 'boundaries', 'fours', 'sixes'],
+        "labels": {'economy_rate': 'Economy Rate (RPO)', 'wickets': 'Total Wickets', 'season': 'IPL Season'},
+        "annotate_best": False,
+    },
+    "player_batting": {
+        "entity": "striker",
+        "metrics": ['strike_rate', 'runs', 'sixes', 'fours', 'boundaries', 'performance_index'],
+        "labels": {'run_rate': 'Run Rate (RPO)', 'runs': 'Total Runs', 'season': 'IPL Season'},
+        "annotate_best": True,
+    },
+    "player_bowling": {
+        "entity": "bowler",
+        "metrics": ['economy_rate', 'runs_conceded', 'wickets', 'sixes', 'fours', 'boundaries',
+                    'performance_index'],
+        "labels": {'economy_rate': 'Economy Rate (RPO)', 'wickets': 'Total Wickets', 'season': 'IPL Season'},
+        "annotate_best": True,
+    },
+}
+
+# Serialized figures kept per process
+FIGURE_CACHE_BYTES = 64 * 1024 * 1024
+
+
+def data_version(path):
+    """Cheap version tag for a source file: changes whenever it is rewritten."""
+    stat = os.stat(path)
+    return f"{stat.st_size}-{stat.st_mtime_ns}"
+
+
+def trend_figure(df, view, entity, metric, by='phase'):
+    """Season-by-season line chart of `metric` for one team or player, split by `by`."""
+    import plotly.express as px
+
+    config = TREND_VIEWS[view]
+    entity_df = df[df[config["entity"]] == entity]
+
+    fig = px.line(entity_df, x='season', y=metric, color=by,
+                  title=f'📈 Evolution of {metric} Across IPL Seasons',
+                  labels=config["labels"],
+                  color_discrete_map=PHASE_COLORS)
+    # Enhanced styling
+    label = HOVER_LABELS.get(metric, metric.replace('_', ' ').title())
+    fig.update_traces(mode='lines+markers', line=dict(width=4), marker=dict(size=8),
+                      hovertemplate='<b>%{fullData.name}</b><br>' +
+                      'Season: %{x}<br>' +
+                      f'{label} : ' + '%{y:.2f} <extra></extra>')
+
+    fig.update_layout(title_font_size=18, title_x=0.3, height=500,
+                      hovermode='x unified', legend=dict(orientation="h",
+                                                         yanchor="bottom",
+                                                         y=1, xanchor="center",
+                                                         x=0.5))
+
+    if config["annotate_best"]:
+        # Annotate best season/metric
+        max_season = entity_df.loc[entity_df[metric].idxmax(), 'season']
+        max_value = entity_df[metric].max()
+        fig.add_annotation(
+            x=max_season, y=max_value,
+            text=f'Best: {max_value:.2f} in {max_season}',
+            showarrow=True, arrowhead=2, ax=0, ay=-40,
+            font=dict(size=12, color="green")
+        )
+    return fig
+
+
+class FigureCache:
+    """LRU cache of serialized Plotly figures bounded by total payload size.
+
+    One instance is shared by every Streamlit session thread, so lookups,
+    inserts and evictions happen under a lock. Figures are built outside it;
+    two sessions missing on the same key both build, and the later payload
+    replaces the earlier one.
+    """
+
+    def __init__(self, max_bytes=FIGURE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_or_build(self, key, build):
+        """Figure for `key`, calling `build()` and storing its JSON on a miss."""
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+        if payload is not None:
+            import plotly.graph_objects as go
+
+            # Payloads come from validated figures, so skip re-validating on the way out
+            return go.Figure(json.loads(payload), _validate=False)
+
+        fig = build()
+        payload = fig.to_json()
+        if len(payload) <= self.max_bytes:
+            with self._lock:
+                previous = self._entries.pop(key, None)
+                if previous is not None:
+                    self.size -= len(previous)
+                self._entries[key] = payload
+                self.size += len(payload)
+                while self.size > self.max_bytes:
+                    _, evicted = self._entries.popitem(last=False)
+                    self.size -= len(evicted)
+        return fig
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+def cached_trend_figure(cache, df, view, entity, metric, version, by='phase'):
+    """`trend_figure()` served from `cache`; `version` must change when `df` does."""
+    return cache.get_or_build((view, entity, metric, by, version),
+                              lambda: trend_figure(df, view, entity, metric, by))
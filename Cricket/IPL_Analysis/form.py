@@ -0,0 +1,160 @@
+"""Time-decayed per-player, per-phase form for the Top Batters / Top Bowlers views.
+
+For every (player, phase) the state keeps exponentially decayed sums of the
+counts `rankings` uses (runs, balls, wickets, dots, boundaries, fours,
+sixes). A match played `d` days before the reference date weighs
+0.5 ** (d / HALF_LIFE_DAYS), so form follows recent matches instead of a
+fixed 2020-25 window. Rates are recomputed from the decayed sums, exactly as
+`rankings` recomputes them from plain sums.
+
+Each row is stored as of that player's last match. Folding in a match
+decays only the involved players' rows to the match date and adds the
+match's counts; everyone else is untouched. A batch of new matches is
+folded in one vectorized pass, with the same result as applying them one
+by one in date order.
+
+    python Cricket/IPL_Analysis/form.py            # fold in matches not rated yet
+    python Cricket/IPL_Analysis/form.py --rebuild  # replay every match
+"""
+
+import json
+import os
+
+import pandas as pd
+
+import rankings
+from ipl_store import STORE_DIR, read_deliveries
+from phase_tables import SCAN_COLUMNS, player_counts
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+STATE_DIR = os.path.join(CURRENT_DIR, "form_state")
+
+HALF_LIFE_DAYS = 365
+COLUMNS = SCAN_COLUMNS + ["match_id", "date"]
+KINDS = ("batting", "bowling")
+# Decayed-ball qualifiers; a full season's play is worth about 0.7 of its balls
+FORM_MIN_BALLS = {
+    "batting": {'Powerplay': 100, 'Middle': 100, 'Death': 30},
+    "bowling": 80,
+}
+# performance_index is a PCA score of the shipped tables, not a count: it has no decayed form
+FORM_METRICS = {kind: {m: asc for m, asc in rankings.RANKINGS[kind]["metrics"].items() if m != 'performance_index'}
+                for kind in KINDS}
+
+
+def _decay(days):
+    return 0.5 ** (days / HALF_LIFE_DAYS)
+
+
+def _days(later, earlier):
+    return (later - earlier).dt.total_seconds() / 86400
+
+
+# ---- Folding in matches ----
+def match_counts(deliveries, kind):
+    """Counts per (match, date, phase, player) for `kind`."""
+    return player_counts(deliveries, kind, ["match_id", "date", "phase"])
+
+
+def fold_in(state, counts, kind):
+    """`state` with the per-match `counts` added; only their (player, phase) rows change."""
+    keys = [rankings.RANKINGS[kind]["player"], 'phase']
+    columns = rankings.RANKINGS[kind]["counts"]
+    counts = counts.reset_index()
+
+    # Decay each match to the latest of its player's new matches, then sum per (player, phase)
+    latest = counts.groupby(keys, sort=False)['date'].transform('max')
+    weighted = counts[columns].mul(_decay(_days(latest, counts['date'])), axis=0)
+    new = weighted.groupby([counts[k] for k in keys], sort=True).sum()
+    new['as_of'] = counts.groupby(keys, sort=True)['date'].max()
+    if state is None or state.empty:
+        return new
+
+    touched = state.index.intersection(new.index)
+    old = state.loc[touched]
+    added = new.loc[touched]
+    as_of = old['as_of'].where(old['as_of'] > added['as_of'], added['as_of'])
+    merged = (old[columns].mul(_decay(_days(as_of, old['as_of'])), axis=0)
+              + added[columns].mul(_decay(_days(as_of, added['as_of'])), axis=0))
+    merged['as_of'] = as_of
+
+    untouched = state.drop(touched)
+    fresh = new.drop(touched)
+    return pd.concat([untouched, merged, fresh]).sort_index()
+
+
+# ---- Current form ----
+def form_stats(state, kind, as_of=None):
+    """Every (player, phase) with its sums decayed to `as_of` (default: the latest rated match) and rates."""
+    columns = rankings.RANKINGS[kind]["counts"]
+    as_of = state['as_of'].max() if as_of is None else pd.Timestamp(as_of)
+    decayed = state[columns].mul(_decay(_days(pd.Series(as_of, index=state.index), state['as_of'])), axis=0)
+    stats = rankings.RATES[kind](decayed.reset_index())
+    stats[columns] = stats[columns].round(1)
+    return stats
+
+
+def form_leaderboards(state, kind, k=rankings.TOP_K, as_of=None, min_balls=None):
+    """`rankings`-style (phase, metric) boards ranked by current form."""
+    min_balls = FORM_MIN_BALLS[kind] if min_balls is None else min_balls
+    stats = rankings.qualified(form_stats(state, kind, as_of), kind, min_balls)
+    return rankings.rank(stats, kind, k, FORM_METRICS[kind])
+
+
+# ---- Persistence ----
+def state_path(kind, state_dir=STATE_DIR):
+    return os.path.join(state_dir, f"{kind}.parquet")
+
+
+def load_state(state_dir=STATE_DIR):
+    """({kind: state}, rated match ids), or ({}, set()) if nothing is saved."""
+    manifest = os.path.join(state_dir, "rated_matches.json")
+    if not os.path.exists(manifest):
+        return {}, set()
+    with open(manifest) as fh:
+        rated = set(json.load(fh))
+    return {kind: pd.read_parquet(state_path(kind, state_dir)) for kind in KINDS}, rated
+
+
+def save_state(states, rated, state_dir=STATE_DIR):
+    os.makedirs(state_dir, exist_ok=True)
+    for kind, state in states.items():
+        path = state_path(kind, state_dir)
+        state.to_parquet(path + ".tmp")
+        os.replace(path + ".tmp", path)
+    # Written last: a run interrupted before this point re-rates the same matches from the old state
+    manifest = os.path.join(state_dir, "rated_matches.json")
+    with open(manifest + ".tmp", "w") as fh:
+        json.dump(sorted(rated), fh)
+    os.replace(manifest + ".tmp", manifest)
+
+
+def update_state(store_dir=STORE_DIR, state_dir=STATE_DIR, rebuild=False):
+    """Load the persisted form state and fold in every store match not rated yet."""
+    states, rated = ({}, set()) if rebuild else load_state(state_dir)
+    matches = read_deliveries(["match_id"], store_dir=store_dir).drop_duplicates("match_id")
+    new = matches[~matches["match_id"].isin(rated)]
+    if new.empty:
+        return states
+
+    deliveries = read_deliveries(COLUMNS, new["season"].unique(), store_dir=store_dir)
+    deliveries = deliveries[deliveries["match_id"].isin(new["match_id"])]
+    states = {kind: fold_in(states.get(kind), match_counts(deliveries, kind), kind) for kind in KINDS}
+    save_state(states, rated | set(new["match_id"].tolist()), state_dir)
+    return states
+
+
+def load_form_leaderboards(kind, store_dir=STORE_DIR, k=rankings.TOP_K):
+    """`form_leaderboards()` over the up-to-date persisted state."""
+    return form_leaderboards(update_state(store_dir)[kind], kind, k)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rebuild", action="store_true", help="replay every match from the store")
+    args = parser.parse_args()
+    states = update_state(rebuild=args.rebuild)
+    for kind, state in states.items():
+        print(f"{kind}: {len(state)} player x phase rows, form as of {state['as_of'].max():%Y-%m-%d}")
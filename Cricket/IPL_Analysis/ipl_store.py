@@ -0,0 +1,141 @@
+"""Typed, season-partitioned Parquet store for the IPL ball-by-ball dataset.
+
+`ipl_phase_dataset.csv` is ~73 MB of untyped text. Converting it once into a
+compressed Parquet dataset (one directory per season, categorical names,
+small integer runs, boolean flags) lets the dashboard read only the columns
+and seasons a view needs.
+
+One-time conversion (re-run whenever the zipped CSV changes):
+
+    python Cricket/IPL_Analysis/ipl_store.py
+"""
+
+import os
+import shutil
+import zipfile
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+ZIP_PATH = os.path.join(CURRENT_DIR, "ipl_phase_dataset.zip")
+CSV_NAME = "ipl_phase_dataset.csv"
+STORE_DIR = os.path.join(CURRENT_DIR, "ipl_phase_store")
+
+# ---- Schema ----
+# Only the columns a view (or a derived analysis) actually reads are kept;
+# venue/toss/umpire style metadata stays in the source CSV.
+CATEGORY_COLUMNS = [
+    "batting_team", "bowling_team", "striker", "bowler", "extras_type",
+    "player_dismissed", "wicket_type", "winner", "cleaned_team_batting",
+    "cleaned_team_bowling", "cleaned_winner", "phase",
+]
+INT_COLUMNS = {
+    "match_id": "int32",
+    "season": "int16",
+    "inning": "int8",
+    "over": "int8",
+    "ball": "int8",
+    "batsman_runs": "int8",
+    "extra_runs": "int8",
+    "total_runs": "int8",
+    "target_runs": "Int16",
+}
+BOOL_COLUMNS = ["is_wicket", "is_boundary", "is_six", "is_four", "is_dot_ball"]
+DATE_COLUMNS = ["date"]
+
+STORE_COLUMNS = list(INT_COLUMNS) + DATE_COLUMNS + CATEGORY_COLUMNS + BOOL_COLUMNS
+
+
+def _source_path():
+    """Prefer an already-extracted CSV, otherwise read straight from the zip."""
+    csv_path = os.path.join(CURRENT_DIR, CSV_NAME)
+    if os.path.exists(csv_path):
+        return csv_path
+    return ZIP_PATH
+
+
+def read_source(path=None):
+    """Parse the raw CSV (or zip) into the typed, column-pruned frame."""
+    path = path or _source_path()
+    dtypes = {col: "category" for col in CATEGORY_COLUMNS}
+    dtypes.update({col: "bool" for col in BOOL_COLUMNS})
+    # target_runs is a float column with NaNs in the CSV; cast after parsing
+    dtypes.update({col: t for col, t in INT_COLUMNS.items() if col != "target_runs"})
+
+    if path.endswith(".zip"):
+        with zipfile.ZipFile(path) as zf, zf.open(CSV_NAME) as fh:
+            df = pd.read_csv(fh, usecols=STORE_COLUMNS, dtype=dtypes)
+    else:
+        df = pd.read_csv(path, usecols=STORE_COLUMNS, dtype=dtypes)
+
+    df["target_runs"] = df["target_runs"].astype(INT_COLUMNS["target_runs"])
+    df["date"] = pd.to_datetime(df["date"], format="%d-%m-%Y")
+    return df[STORE_COLUMNS]
+
+
+def build_store(source=None, store_dir=STORE_DIR):
+    """Convert the ball-by-ball CSV into the season-partitioned Parquet store."""
+    df = read_source(source)
+    tmp_dir = store_dir + ".tmp"
+    if os.path.exists(tmp_dir):
+        shutil.rmtree(tmp_dir)
+    df.to_parquet(tmp_dir, partition_cols=["season"], compression="zstd", index=False)
+    if os.path.exists(store_dir):
+        shutil.rmtree(store_dir)
+    os.replace(tmp_dir, store_dir)
+    return store_dir
+
+
+def store_is_stale(store_dir=STORE_DIR):
+    """True when the store is missing or older than its source file."""
+    if not os.path.isdir(store_dir):
+        return True
+    source = _source_path()
+    return os.path.exists(source) and os.path.getmtime(source) > os.path.getmtime(store_dir)
+
+
+def ensure_store(store_dir=STORE_DIR):
+    """Build the store on first use so a fresh checkout still works."""
+    if store_is_stale(store_dir):
+        build_store(store_dir=store_dir)
+    return store_dir
+
+
+def available_seasons(store_dir=STORE_DIR):
+    """List seasons from the partition directory names (no data is read)."""
+    return sorted(
+        int(name.split("=", 1)[1])
+        for name in os.listdir(store_dir)
+        if name.startswith("season=")
+    )
+
+
+def season_row_counts(store_dir=STORE_DIR):
+    """Rows per season partition, from the Parquet footers (no data is read)."""
+    counts = {}
+    for season in available_seasons(store_dir):
+        partition = os.path.join(store_dir, f"season={season}")
+        counts[season] = sum(pq.ParquetFile(os.path.join(partition, name)).metadata.num_rows
+                             for name in os.listdir(partition) if name.endswith(".parquet"))
+    return counts
+
+
+def read_deliveries(columns=None, seasons=None, store_dir=STORE_DIR):
+    """Read a column/season projection of the store.
+
+    Only the requested season partitions are opened and only the requested
+    columns are decoded. `season` is always returned as a regular integer
+    column, whether or not it was asked for.
+    """
+    if columns is not None:
+        columns = list(dict.fromkeys(["season"] + list(columns)))
+    filters = [("season", "in", list(seasons))] if seasons is not None else None
+    df = pd.read_parquet(store_dir, columns=columns, filters=filters)
+    df["season"] = df["season"].astype(INT_COLUMNS["season"])
+    return df
+
+
+if __name__ == "__main__":
+    path = build_store()
+    print(f"Wrote season-partitioned store to {path} (seasons: {available_seasons(path)})")
@@ -0,0 +1,196 @@
+"""Materialized per-season, per-player aggregate cube for the Orange/Purple Cap views.
+
+The cube stores only additive counts (runs, balls, wickets, dots, boundaries)
+indexed by (season, player). A refresh recounts only the seasons that are new
+or whose row count in the store changed (e.g. later match days of the current
+season), and a cap leaderboard is an indexed season slice plus a partial top-N
+selection. Ratio columns are derived on those N rows only.
+
+Build or refresh the cube from the Parquet store:
+
+    python Cricket/IPL_Analysis/leaderboards.py            # recount new or changed seasons
+    python Cricket/IPL_Analysis/leaderboards.py --rebuild  # recompute everything
+"""
+
+import json
+import os
+
+import pandas as pd
+
+from ipl_store import STORE_DIR, read_deliveries, season_row_counts
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+CUBE_DIR = os.path.join(CURRENT_DIR, "leaderboard_cube")
+
+BOWLER_DISMISSALS = ["caught", "bowled", "lbw", "caught and bowled", "stumped", "hit wicket"]
+
+BATTING_COLUMNS = ["striker", "extras_type", "batsman_runs", "player_dismissed", "is_four", "is_six"]
+BOWLING_COLUMNS = ["bowler", "wicket_type", "total_runs", "batsman_runs", "is_four", "is_six"]
+
+CUBES = {
+    "batting": {"player": "striker", "columns": BATTING_COLUMNS},
+    "bowling": {"player": "bowler", "columns": BOWLING_COLUMNS},
+}
+
+
+# ---- Aggregation ----
+def _batting_counts(deliveries):
+    legal = deliveries[deliveries["extras_type"] != "wide"]
+    runs = legal["batsman_runs"]
+    counts = pd.DataFrame({
+        "season": legal["season"],
+        "striker": legal["striker"].astype(str),
+        "runs": runs.astype("int32"),
+        "balls_faced": 1,
+        "lost_wicket": legal["player_dismissed"].notna(),
+        "dot_balls": runs == 0,
+        "boundaries": (runs == 4) | (runs == 6),
+        "fours": legal["is_four"],
+        "sixes": legal["is_six"],
+    })
+    return counts.groupby(["season", "striker"], sort=True).sum().astype("int32")
+
+
+def _bowling_counts(deliveries):
+    runs = deliveries["batsman_runs"]
+    counts = pd.DataFrame({
+        "season": deliveries["season"],
+        "bowler": deliveries["bowler"].astype(str),
+        "wickets": deliveries["wicket_type"].isin(BOWLER_DISMISSALS),
+        "runs_conceded": deliveries["total_runs"].astype("int32"),
+        "balls_bowled": 1,
+        "dot_balls": runs == 0,
+        "boundaries": (runs == 4) | (runs == 6),
+        "fours": deliveries["is_four"],
+        "sixes": deliveries["is_six"],
+    })
+    return counts.groupby(["season", "bowler"], sort=True).sum().astype("int32")
+
+
+_COUNTERS = {"batting": _batting_counts, "bowling": _bowling_counts}
+
+
+def build_cube(kind, deliveries):
+    """Aggregate deliveries into the (season, player) count cube for `kind`."""
+    return _COUNTERS[kind](deliveries)
+
+
+def append_deliveries(cube, kind, deliveries):
+    """Add counts for *new* deliveries to an existing cube.
+
+    Only the seasons present in `deliveries` are touched; every other season
+    slice is carried over as-is. Passing deliveries already in the cube
+    double-counts them.
+    """
+    partial = build_cube(kind, deliveries)
+    touched = partial.index.unique(level="season")
+    in_touched = cube.index.get_level_values("season").isin(touched)
+    merged = cube[in_touched].add(partial, fill_value=0).astype("int32")
+    return pd.concat([cube[~in_touched], merged]).sort_index()
+
+
+def _replace_seasons(cube, partial, seasons):
+    keep = cube[~cube.index.get_level_values("season").isin(seasons)]
+    return pd.concat([keep, partial]).sort_index()
+
+
+# ---- Derived ratios (computed on the selected rows only) ----
+def _safe_ratio(num, den):
+    return (num / den.where(den > 0)).round(2)
+
+
+def _batting_ratios(top):
+    top["strike_rate"] = (top["runs"] / top["balls_faced"] * 100).round(2)
+    top["balls_per_dismissal"] = _safe_ratio(top["balls_faced"], top["lost_wicket"])
+    top["batting_avg"] = _safe_ratio(top["runs"], top["lost_wicket"])
+    top["dot_ball_pct"] = (top["dot_balls"] / top["balls_faced"]).round(2)
+    top["dismissal_rate"] = (top["lost_wicket"] / top["balls_faced"]).round(2)
+    return top
+
+
+def _bowling_ratios(top):
+    top["economy_rate"] = (top["runs_conceded"] / (top["balls_bowled"] / 6)).round(2)
+    top["balls_per_wicket"] = _safe_ratio(top["balls_bowled"], top["wickets"])
+    top["bowling_avg"] = _safe_ratio(top["runs_conceded"], top["wickets"])
+    top["dot_ball_pct"] = (top["dot_balls"] / top["balls_bowled"]).round(2)
+    top["boundary_pct"] = (top["boundaries"] / top["balls_bowled"]).round(2)
+    top["six_pct"] = (top["sixes"] / top["balls_bowled"]).round(2)
+    return top
+
+
+_RATIOS = {"batting": _batting_ratios, "bowling": _bowling_ratios}
+
+
+def top_n(cube, kind, season, sort_by, n=10):
+    """Top `n` players of one season by `sort_by`, with ratio columns attached."""
+    try:
+        season_slice = cube.xs(season, level="season")
+    except KeyError:
+        return pd.DataFrame(columns=[CUBES[kind]["player"]] + list(cube.columns))
+    top = season_slice.nlargest(n, sort_by)
+    return _RATIOS[kind](top.reset_index())
+
+
+# ---- Persistence ----
+def cube_path(kind, cube_dir=CUBE_DIR):
+    return os.path.join(cube_dir, f"{kind}.parquet")
+
+
+def _manifest_path(kind, cube_dir=CUBE_DIR):
+    return os.path.join(cube_dir, f"{kind}.seasons.json")
+
+
+def load_cube(kind, cube_dir=CUBE_DIR):
+    """(cube, season row counts) from disk, or (None, {}) if missing."""
+    path, manifest = cube_path(kind, cube_dir), _manifest_path(kind, cube_dir)
+    if not (os.path.exists(path) and os.path.exists(manifest)):
+        return None, {}
+    with open(manifest) as fh:
+        row_counts = {int(s): n for s, n in json.load(fh).items()}
+    return pd.read_parquet(path), row_counts
+
+
+def save_cube(cube, kind, row_counts, cube_dir=CUBE_DIR):
+    os.makedirs(cube_dir, exist_ok=True)
+    path = cube_path(kind, cube_dir)
+    cube.to_parquet(path + ".tmp")
+    os.replace(path + ".tmp", path)
+    # Written last: a run interrupted before this point is redone from scratch
+    manifest = _manifest_path(kind, cube_dir)
+    with open(manifest + ".tmp", "w") as fh:
+        json.dump({str(s): n for s, n in sorted(row_counts.items())}, fh, indent=1)
+    os.replace(manifest + ".tmp", manifest)
+
+
+def update_cube(kind, store_dir=STORE_DIR, cube_dir=CUBE_DIR, rebuild=False):
+    """Load the persisted cube and recount every store season that is new, changed or removed.
+
+    A season has changed when its row count in the store differs from the one
+    recorded when it was last counted.
+    """
+    row_counts = season_row_counts(store_dir)
+    cube, previous = (None, {}) if rebuild else load_cube(kind, cube_dir)
+    changed = sorted(s for s, n in row_counts.items() if previous.get(s) != n)
+    removed = sorted(set(previous) - set(row_counts))
+    if cube is not None and not (changed or removed):
+        return cube
+
+    columns = CUBES[kind]["columns"]
+    if cube is None:
+        cube = build_cube(kind, read_deliveries(columns, store_dir=store_dir))
+    else:
+        partial = build_cube(kind, read_deliveries(columns, changed, store_dir=store_dir)) if changed else None
+        cube = _replace_seasons(cube, partial, changed + removed)
+    save_cube(cube, kind, row_counts, cube_dir)
+    return cube
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rebuild", action="store_true", help="recompute every season from the store")
+    args = parser.parse_args()
+    for kind in CUBES:
+        cube = update_cube(kind, rebuild=args.rebuild)
+        print(f"{kind}: {len(cube)} rows, seasons {sorted(cube.index.unique(level='season'))}")
@@ -0,0 +1,234 @@
+"""Batter-vs-bowler matchup index for the Matchups view.
+
+Deliveries are reduced to additive counts (balls, runs, dismissals, dots,
+boundaries) per (striker, bowler, phase, season). Only pairs that actually
+met get a row (about 61k rows for 2008-2025 against 270k deliveries), and
+names and phases are stored as integer category codes. The cube is
+persisted like the cap cube and extended season by season.
+
+Rows are sorted by (striker, bowler, phase, season) codes, so every pair and
+every batter is one contiguous block:
+
+- a pair lookup is a dict lookup plus a positional slice
+- "worst matchups for a batter" sums the batter's block per bowler with
+  `np.bincount` and picks the top k with a partial sort
+
+Build or extend the cube from the Parquet store:
+
+    python Cricket/IPL_Analysis/matchups.py            # append missing seasons
+    python Cricket/IPL_Analysis/matchups.py --rebuild  # recompute everything
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from ipl_store import STORE_DIR, available_seasons, read_deliveries
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+CUBE_DIR = os.path.join(CURRENT_DIR, "matchup_cube")
+
+BOWLER_DISMISSALS = ["caught", "bowled", "lbw", "caught and bowled", "stumped", "hit wicket"]
+COLUMNS = ["striker", "bowler", "phase", "extras_type", "batsman_runs", "wicket_type"]
+PHASES = ['Powerplay', 'Middle', 'Death']
+KEYS = ["striker", "bowler", "phase", "season"]
+COUNTS = ["balls", "runs", "dismissals", "dot_balls", "boundaries"]
+
+# Balls faced before a pair is ranked in worst_matchups()
+MIN_BALLS = 12
+# metric -> worst is the lowest value?
+WORST_BY = {'strike_rate': True, 'dismissals': False, 'balls_per_dismissal': True, 'batting_avg': True,
+            'dot_ball_pct': False}
+
+
+# ---- Aggregation ----
+def build_cube(deliveries):
+    """(striker, bowler, phase, season) counts of balls faced, wides excluded."""
+    legal = deliveries[deliveries["extras_type"] != "wide"]
+    runs = legal["batsman_runs"]
+    counts = pd.DataFrame({
+        "striker": legal["striker"].astype(str),
+        "bowler": legal["bowler"].astype(str),
+        "phase": legal["phase"].astype(str),
+        "season": legal["season"],
+        "balls": 1,
+        "runs": runs,
+        # Dismissals credited to the bowler, i.e. no run-outs
+        "dismissals": legal["wicket_type"].isin(BOWLER_DISMISSALS),
+        "dot_balls": runs == 0,
+        "boundaries": (runs == 4) | (runs == 6),
+    })
+    cube = counts.groupby(KEYS, sort=False)[COUNTS].sum().astype("int32").reset_index()
+    return _encoded(cube)
+
+
+def _encoded(cube):
+    """Categorical name/phase codes with rows sorted by (striker, bowler, phase, season)."""
+    cube = cube.assign(
+        striker=pd.Categorical(cube["striker"].astype(str), categories=sorted(set(cube["striker"].astype(str)))),
+        bowler=pd.Categorical(cube["bowler"].astype(str), categories=sorted(set(cube["bowler"].astype(str)))),
+        phase=pd.Categorical(cube["phase"].astype(str), categories=PHASES),
+        season=cube["season"].astype("int16"),
+    )
+    return cube.sort_values(KEYS, kind="stable").reset_index(drop=True)
+
+
+def append_deliveries(cube, deliveries):
+    """Add counts for deliveries of seasons not yet in the cube (existing seasons are not merged)."""
+    return _encoded(pd.concat([cube, build_cube(deliveries)], ignore_index=True))
+
+
+# ---- Index ----
+def _blocks(keys):
+    """{key: (start, stop)} for runs of equal values in sorted `keys`."""
+    if len(keys) == 0:
+        return {}
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    stops = np.r_[starts[1:], len(keys)]
+    return dict(zip(keys[starts].tolist(), zip(starts.tolist(), stops.tolist())))
+
+
+def build_index(cube):
+    """Integer-coded arrays plus pair and batter block offsets over the sorted cube."""
+    strikers = cube["striker"].cat.categories
+    bowlers = cube["bowler"].cat.categories
+    striker_codes = cube["striker"].cat.codes.to_numpy().astype(np.int64)
+    bowler_codes = cube["bowler"].cat.codes.to_numpy().astype(np.int64)
+    return {
+        'strikers': {name: code for code, name in enumerate(strikers)},
+        'bowlers': {name: code for code, name in enumerate(bowlers)},
+        'bowler_names': np.asarray(bowlers, dtype=object),
+        'pairs': _blocks(striker_codes * len(bowlers) + bowler_codes),
+        'batters': _blocks(striker_codes),
+        'bowler': bowler_codes,
+        'phase': cube["phase"].cat.codes.to_numpy(),
+        'season': cube["season"].to_numpy(),
+        'counts': cube[COUNTS].to_numpy(),
+    }
+
+
+def _frame(index, rows):
+    frame = pd.DataFrame({'season': index['season'][rows], 'phase': np.asarray(PHASES)[index['phase'][rows]]})
+    frame[COUNTS] = index['counts'][rows]
+    return frame
+
+
+# ---- Queries ----
+def _per_ball(numerator, balls, scale=1):
+    return (numerator / balls.where(balls > 0) * scale).round(2)
+
+
+def _per_dismissal(numerator, dismissals):
+    return (numerator / dismissals.where(dismissals > 0)).round(2)
+
+
+def _rates(agg):
+    agg['strike_rate'] = _per_ball(agg['runs'], agg['balls'], 100)
+    agg['batting_avg'] = _per_dismissal(agg['runs'], agg['dismissals'])
+    agg['balls_per_dismissal'] = _per_dismissal(agg['balls'], agg['dismissals'])
+    agg['dot_ball_pct'] = _per_ball(agg['dot_balls'], agg['balls'])
+    agg['boundary_pct'] = _per_ball(agg['boundaries'], agg['balls'])
+    return agg
+
+
+def batters(index):
+    """Sorted names of every striker in the index."""
+    return sorted(index['strikers'])
+
+
+def bowlers_faced(index, striker):
+    """Sorted names of the bowlers `striker` has faced."""
+    start, stop = index['batters'].get(index['strikers'].get(striker), (0, 0))
+    return sorted(index['bowler_names'][np.unique(index['bowler'][start:stop])])
+
+
+def pair_rows(index, striker, bowler):
+    """(season, phase) counts for one pair, ordered by phase then season (empty if they never met)."""
+    s, b = index['strikers'].get(striker), index['bowlers'].get(bowler)
+    start, stop = (0, 0) if s is None or b is None else index['pairs'].get(s * len(index['bowlers']) + b, (0, 0))
+    return _frame(index, slice(start, stop))
+
+
+def pair_summary(index, striker, bowler):
+    """One row per phase the pair met in plus an 'All' row, with rates."""
+    rows = pair_rows(index, striker, bowler)
+    by_phase = rows.groupby('phase', sort=False)[COUNTS].sum()
+    by_phase.loc['All'] = by_phase.sum()
+    return _rates(by_phase.astype('int64').reset_index())
+
+
+def matchup_table(cube, by=KEYS):
+    """Counts and rates summed per `by` group of the cube (default: one row per pair, phase and season)."""
+    agg = cube.groupby(list(by), observed=True, sort=True)[COUNTS].sum().astype('int64').reset_index()
+    return _rates(agg)
+
+
+def worst_matchups(index, striker, metric='strike_rate', k=10, phase=None, min_balls=MIN_BALLS, since=None):
+    """The `k` bowlers `striker` has fared worst against on `metric`.
+
+    Counts are summed per bowler over the batter's block (optionally one
+    phase / seasons after `since`); pairs under `min_balls` are not ranked.
+    """
+    start, stop = index['batters'].get(index['strikers'].get(striker), (0, 0))
+    keep = np.ones(stop - start, dtype=bool)
+    if phase is not None:
+        keep &= index['phase'][start:stop] == PHASES.index(phase)
+    if since is not None:
+        keep &= index['season'][start:stop] > since
+    bowler = index['bowler'][start:stop][keep]
+    counts = index['counts'][start:stop][keep]
+
+    faced, local = np.unique(bowler, return_inverse=True)
+    totals = np.column_stack([np.bincount(local, weights=counts[:, i], minlength=len(faced))
+                              for i in range(len(COUNTS))]).astype('int64')
+    agg = pd.DataFrame(totals, columns=COUNTS)
+    agg.insert(0, 'bowler', index['bowler_names'][faced])
+    agg = _rates(agg[agg['balls'] >= min_balls].copy()).dropna(subset=[metric])
+
+    select = agg.nsmallest if WORST_BY[metric] else agg.nlargest
+    return select(k, metric).reset_index(drop=True)
+
+
+# ---- Persistence ----
+def cube_path(cube_dir=CUBE_DIR):
+    return os.path.join(cube_dir, "matchups.parquet")
+
+
+def load_cube(cube_dir=CUBE_DIR):
+    path = cube_path(cube_dir)
+    if not os.path.exists(path):
+        return None
+    return pd.read_parquet(path)
+
+
+def save_cube(cube, cube_dir=CUBE_DIR):
+    os.makedirs(cube_dir, exist_ok=True)
+    path = cube_path(cube_dir)
+    cube.to_parquet(path + ".tmp", index=False)
+    os.replace(path + ".tmp", path)
+
+
+def update_cube(store_dir=STORE_DIR, cube_dir=CUBE_DIR, rebuild=False):
+    """Load the persisted cube and fold in any store seasons it has not seen yet."""
+    cube = None if rebuild else load_cube(cube_dir)
+    cube_seasons = set() if cube is None else set(cube["season"].unique())
+    missing = [s for s in available_seasons(store_dir) if s not in cube_seasons]
+    if not missing:
+        return cube
+
+    deliveries = read_deliveries(COLUMNS, missing, store_dir=store_dir)
+    cube = build_cube(deliveries) if cube is None else append_deliveries(cube, deliveries)
+    save_cube(cube, cube_dir)
+    return cube
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rebuild", action="store_true", help="recompute every season from the store")
+    args = parser.parse_args()
+    cube = update_cube(rebuild=args.rebuild)
+    print(f"matchups: {len(cube)} rows, {cube['striker'].nunique()} batters x {cube['bowler'].nunique()} bowlers, "
+          f"seasons {sorted(cube['season'].unique())}")
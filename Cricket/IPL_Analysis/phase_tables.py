@@ -0,0 +1,424 @@
+"""Scripted derivation of the phase/season summary CSVs shipped with the dashboard.
+
+Replaces the hand-run cells of `IPL_Match_Phase_Analysis_Project.ipynb`
+that wrote `overall_phase_stats.csv`, `season_phase_stats.csv`, the team
+and player `*_20_25.csv` tables, the season x team tables and the season x
+player tables the trend views read.
+
+The Parquet store is scanned once. Every delivery is counted into two
+shared cubes of additive counts:
+
+- teams:   (season, batting team, bowling team, phase)
+- players: (season, phase, player) for strikers and bowlers
+
+and every output is a sum over some of those keys followed by the
+notebook's ratio and PCA-index formulas.
+
+Against the bundled store, eight of the ten tables match the shipped CSVs
+(PCA indices to ~1e-15). The two 2020-25 player tables do not. The shipped
+copies were built from an earlier version of the dataset, which spelt a
+few players differently in some seasons. They count 2025 deliveries of
+Chahal, Pathirana, Unadkat, Nortje and Zampa under a separate name, and
+Jaiswal's 2025 deliveries under `YBK Jaiswal`. Wadhera's 2023-24
+deliveries are also under a separate name. The notebook itself has no name
+handling to reproduce this. The tables are therefore written to
+`phase_tables_out/` by default, and every run is checked against the
+shipped CSVs. The script refuses to overwrite the shipped copies while any
+table differs.
+
+The cubes are persisted with a content fingerprint per season. On a
+refresh only seasons whose deliveries changed are re-aggregated, and only
+outputs whose content changed are rewritten:
+
+    python Cricket/IPL_Analysis/ipl_store.py      # after replacing the zipped CSV
+    python Cricket/IPL_Analysis/phase_tables.py   # derive the CSVs; exit status 1 if they differ from the shipped ones
+"""
+
+import hashlib
+import io
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from ipl_store import STORE_DIR, ensure_store, read_deliveries
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+# The shipped CSVs the dashboard reads
+SHIPPED_DIR = CURRENT_DIR
+OUTPUT_DIR = os.path.join(CURRENT_DIR, "phase_tables_out")
+CUBE_DIR = os.path.join(CURRENT_DIR, "phase_cube")
+
+RECENT_SINCE = 2020
+BOWLER_DISMISSALS = ["caught", "bowled", "lbw", "caught and bowled", "stumped", "hit wicket"]
+# Minimum balls per (player, phase) for the 2020-25 player tables
+BATTING_MIN_BALLS = {'Powerplay': 200, 'Middle': 200, 'Death': 50}
+BOWLING_MIN_BALLS = 120
+# ... and per (season, player, phase) for the season x player tables
+SEASON_MIN_BALLS = 12
+
+SCAN_COLUMNS = ["phase", "cleaned_team_batting", "cleaned_team_bowling", "striker", "bowler",
+                "batsman_runs", "total_runs", "player_dismissed", "wicket_type", "is_four", "is_six"]
+
+TEAM_KEYS = ["season", "cleaned_team_batting", "cleaned_team_bowling", "phase"]
+# The season/overall tables count boundaries as batsman_runs >= 4, the 2020-25 tables as 4s and 6s only
+TEAM_COUNTS = {"deliveries": "balls", "total_runs": "total_runs", "wickets": "dismissed", "boundaries": "boundary",
+               "boundaries_4_plus": "boundary_4_plus", "fours": "is_four", "sixes": "is_six", "dot_balls": "dot"}
+PLAYER_KINDS = {
+    "batting": {
+        "player": "striker",
+        "counts": {"runs": "batsman_runs", "balls_faced": "balls", "lost_wicket": "dismissed",
+                   "dot_balls": "dot", "boundaries": "boundary", "fours": "is_four", "sixes": "is_six"},
+    },
+    "bowling": {
+        "player": "bowler",
+        "counts": {"runs_conceded": "total_runs", "balls_bowled": "balls", "wickets": "bowler_wicket",
+                   "dot_balls": "dot", "boundaries": "boundary", "fours": "is_four", "sixes": "is_six"},
+    },
+}
+CUBES = ("teams", "batting", "bowling")
+
+
+# ---- Scan: deliveries -> count cubes ----
+def _flags(deliveries):
+    """Per-delivery count columns every cube sums."""
+    runs = deliveries["batsman_runs"]
+    return deliveries.assign(
+        balls=1,
+        dismissed=deliveries["player_dismissed"].notna(),
+        bowler_wicket=deliveries["wicket_type"].isin(BOWLER_DISMISSALS),
+        dot=runs == 0,
+        boundary=(runs == 4) | (runs == 6),
+        boundary_4_plus=runs >= 4,
+    )
+
+
+def _sum_by(flags, keys, counts):
+    """Group `flags` by `keys` (categoricals as strings, sorted) and sum {output: input column} counts."""
+    columns = {out: flags[col] for out, col in counts.items()}
+    columns.update({key: flags[key].astype(str) if isinstance(flags[key].dtype, pd.CategoricalDtype) else flags[key]
+                    for key in keys})
+    return pd.DataFrame(columns).groupby(keys, sort=True)[list(counts)].sum().astype("int64")
+
+
+def player_counts(deliveries, kind, keys):
+    """Batting/bowling counts (rankings' column names) per `keys` + player."""
+    config = PLAYER_KINDS[kind]
+    return _sum_by(_flags(deliveries), list(keys) + [config["player"]], config["counts"])
+
+
+def build_cubes(deliveries):
+    """Team and player count cubes for the given deliveries."""
+    flags = _flags(deliveries)
+    cubes = {"teams": _sum_by(flags, TEAM_KEYS, TEAM_COUNTS)}
+    for kind, config in PLAYER_KINDS.items():
+        cubes[kind] = _sum_by(flags, ["season", "phase", config["player"]], config["counts"])
+    return cubes
+
+
+def season_fingerprints(deliveries):
+    """Content hash of each season's deliveries (independent of category sets and file layout)."""
+    fingerprints = {}
+    for season, rows in deliveries.groupby("season", sort=True):
+        hashes = pd.util.hash_pandas_object(rows[SCAN_COLUMNS], index=False)
+        fingerprints[int(season)] = hashlib.md5(hashes.to_numpy().tobytes()).hexdigest()
+    return fingerprints
+
+
+def _replace_seasons(cube, partial, seasons):
+    keep = cube[~cube.index.get_level_values("season").isin(seasons)]
+    return pd.concat([keep, partial]).sort_index()
+
+
+# ---- Persistence ----
+def load_cubes(cube_dir=CUBE_DIR):
+    """(cubes, fingerprints) from disk, or (None, {}) if missing."""
+    manifest = os.path.join(cube_dir, "fingerprints.json")
+    if not os.path.exists(manifest):
+        return None, {}
+    with open(manifest) as fh:
+        fingerprints = {int(s): h for s, h in json.load(fh).items()}
+    cubes = {name: pd.read_parquet(os.path.join(cube_dir, f"{name}.parquet")) for name in CUBES}
+    return cubes, fingerprints
+
+
+def save_cubes(cubes, fingerprints, cube_dir=CUBE_DIR):
+    os.makedirs(cube_dir, exist_ok=True)
+    for name, cube in cubes.items():
+        path = os.path.join(cube_dir, f"{name}.parquet")
+        cube.to_parquet(path + ".tmp")
+        os.replace(path + ".tmp", path)
+    # Written last: a run interrupted before this point is redone from scratch
+    manifest = os.path.join(cube_dir, "fingerprints.json")
+    with open(manifest + ".tmp", "w") as fh:
+        json.dump({str(s): h for s, h in sorted(fingerprints.items())}, fh, indent=1)
+    os.replace(manifest + ".tmp", manifest)
+
+
+def update_cubes(store_dir=STORE_DIR, cube_dir=CUBE_DIR, rebuild=False):
+    """Persisted cubes with every changed, new or removed season brought up to date.
+
+    Returns (cubes, changed seasons).
+    """
+    deliveries = read_deliveries(SCAN_COLUMNS, store_dir=store_dir)
+    fingerprints = season_fingerprints(deliveries)
+    cubes, previous = (None, {}) if rebuild else load_cubes(cube_dir)
+
+    changed = sorted(s for s, h in fingerprints.items() if previous.get(s) != h)
+    removed = sorted(set(previous) - set(fingerprints))
+    if cubes is None:
+        cubes = build_cubes(deliveries)
+    elif changed or removed:
+        partial = build_cubes(deliveries[deliveries["season"].isin(changed)])
+        cubes = {name: _replace_seasons(cubes[name], partial[name], changed + removed) for name in CUBES}
+    if cubes is not None and (changed or removed or not previous):
+        save_cubes(cubes, fingerprints, cube_dir)
+    return cubes, changed + removed
+
+
+# ---- Notebook formulas ----
+def _per(numerator, denominator):
+    """numerator / denominator, NaN where the denominator is 0."""
+    return numerator / denominator.where(denominator > 0)
+
+
+def _pca_index(X):
+    """Variance-weighted sum of the PCA components explaining >= 80% of the standardized features."""
+    # Only needed when the tables are rebuilt, not by the dashboard
+    from sklearn.decomposition import PCA
+    from sklearn.preprocessing import StandardScaler
+
+    pca = PCA()
+    X_pca = pca.fit_transform(StandardScaler().fit_transform(X))
+    explained = np.cumsum(pca.explained_variance_ratio_)
+    k = np.argmax(explained >= 0.80) + 1
+    return X_pca[:, :k].dot(pca.explained_variance_ratio_[:k])
+
+
+def _inverted(X, lower_is_better):
+    """Mean-filled features with lower-is-better columns flipped as (max + min) - value."""
+    X = X.fillna(X.mean())
+    for metric in lower_is_better:
+        X[metric] = (X[metric].max() + X[metric].min()) - X[metric]
+    return X
+
+
+def _phase_stats(agg, rate_col, wkt_col, round_balls_per_wicket=True):
+    """season_team_phase_groupby / overall_stats ratio columns."""
+    agg[rate_col] = (agg['total_runs'] / (agg['deliveries'] / 6)).round(2)
+    balls_per_wicket = _per(agg['deliveries'], agg['wickets'])
+    agg[wkt_col] = balls_per_wicket.round(2) if round_balls_per_wicket else balls_per_wicket
+    agg['dot_ball_percentage'] = (agg['dot_balls'] / agg['deliveries'] * 100).round(2)
+    agg['boundary_percentage'] = (agg['boundaries'] / agg['deliveries'] * 100).round(2)
+    agg['Six_Rate'] = (agg['sixes'] / agg['deliveries'] * 100).round(2)
+    return agg
+
+
+PHASE_STAT_COUNTS = ['deliveries', 'total_runs', 'wickets', 'boundaries', 'fours', 'sixes', 'dot_balls']
+
+
+def _phase_counts(teams, keys):
+    counts = teams.groupby(level=keys, sort=True).sum()
+    return counts.drop(columns='boundaries').rename(columns={'boundaries_4_plus': 'boundaries'})[PHASE_STAT_COUNTS]
+
+
+def overall_phase_stats(teams):
+    # The notebook wrote this table without its phase index (rows: Death, Middle, Powerplay)
+    return _phase_stats(_phase_counts(teams, ['phase']), 'run_rate', 'balls_per_wicket').reset_index(drop=True)
+
+
+def season_phase_stats(teams):
+    return _phase_stats(_phase_counts(teams, ['season', 'phase']), 'run_rate', 'balls_per_wicket',
+                        round_balls_per_wicket=False).reset_index()
+
+
+TEAM_ROLES = {
+    "batting": {"team": "cleaned_team_batting", "rate": "run_rate", "per_wicket": "balls_played_per_wkt",
+                "features": ['run_rate', 'dot_ball_pct', 'boundary_pct', 'dismissal_rate'],
+                "lower_is_better": ['dot_ball_pct', 'dismissal_rate']},
+    "bowling": {"team": "cleaned_team_bowling", "rate": "economy_rate", "per_wicket": "balls_bowled_per_wkt",
+                "features": ['economy_rate', 'balls_bowled_per_wkt', 'dot_ball_pct', 'boundary_pct',
+                             'dismissal_rate'],
+                "lower_is_better": ['economy_rate', 'boundary_pct']},
+}
+
+
+def season_team_phase(teams, role):
+    """season_team_batting_phase.csv / season_team_bowling_phase.csv."""
+    config = TEAM_ROLES[role]
+    agg = _phase_counts(teams, ['season', config["team"], 'phase'])
+    return _phase_stats(agg, config["rate"], config["per_wicket"]).reset_index()
+
+
+def recent_team_phase(teams, role, since=RECENT_SINCE):
+    """team_batting_20_25.csv / team_bowling_20_25.csv: team x phase since `since`, with PCA index."""
+    config = TEAM_ROLES[role]
+    recent = teams[teams.index.get_level_values('season') >= since]
+    agg = recent.groupby(level=[config["team"], 'phase'], sort=True).sum()
+    agg = agg.rename(columns={'deliveries': 'balls'})[
+        ['total_runs', 'balls', 'wickets', 'dot_balls', 'boundaries', 'fours', 'sixes']].reset_index()
+
+    agg[config["rate"]] = (agg['total_runs'] / (agg['balls'] / 6)).round(2)
+    agg[config["per_wicket"]] = _per(agg['balls'], agg['wickets']).round(2)
+    agg['dot_ball_pct'] = (agg['dot_balls'] / agg['balls']).round(2)
+    agg['boundary_pct'] = (agg['boundaries'] / agg['balls']).round(2)
+    agg['dismissal_rate'] = (agg['wickets'] / agg['balls']).round(2)
+    agg['six_pct'] = (agg['sixes'] / agg['balls'] * 100).round(2)
+    agg['team_performance_index'] = _pca_index(_inverted(agg[config["features"]], config["lower_is_better"]))
+    return agg
+
+
+def _qualified(agg, balls, min_balls):
+    if isinstance(min_balls, dict):
+        return agg[agg[balls] >= agg['phase'].map(min_balls).fillna(0)]
+    return agg[agg[balls] >= min_balls]
+
+
+def batting_phase(counts, min_balls=BATTING_MIN_BALLS):
+    """The notebook's batting_phase() from (phase, striker) counts."""
+    agg = _qualified(counts.reset_index(), 'balls_faced', min_balls).copy()
+    agg['strike_rate'] = (agg['runs'] / agg['balls_faced'] * 100).round(2)
+    agg['balls_per_dismissal'] = _per(agg['balls_faced'], agg['lost_wicket']).round(2)
+    agg['batting_avg'] = _per(agg['runs'], agg['lost_wicket']).round(2)
+    agg['dot_ball_pct'] = (agg['dot_balls'] / agg['balls_faced']).round(2)
+    agg['boundary_pct'] = (agg['boundaries'] / agg['balls_faced']).round(2)
+    agg['six_pct'] = (agg['sixes'] / agg['balls_faced'] * 100).round(2)
+    agg['dismissal_rate'] = (agg['lost_wicket'] / agg['balls_faced']).round(2)
+    features = ['strike_rate', 'batting_avg', 'boundaries', 'sixes', 'six_pct', 'boundary_pct']
+    agg['performance_index'] = _pca_index(agg[features].fillna(0))
+    return agg
+
+
+def bowling_phase(counts, min_balls=BOWLING_MIN_BALLS):
+    """The notebook's bowling_phase() from (phase, bowler) counts."""
+    agg = _qualified(counts.reset_index(), 'balls_bowled', min_balls).copy()
+    agg['economy_rate'] = (agg['runs_conceded'] / (agg['balls_bowled'] / 6)).round(2)
+    agg['balls_per_wicket'] = _per(agg['balls_bowled'], agg['wickets']).round(2)
+    agg['bowling_avg'] = _per(agg['runs_conceded'], agg['wickets']).round(2)
+    agg['dot_ball_pct'] = (agg['dot_balls'] / agg['balls_bowled']).round(2)
+    agg['boundary_pct'] = (agg['boundaries'] / agg['balls_bowled']).round(2)
+    agg['six_pct'] = (agg['sixes'] / agg['balls_bowled']).round(2)
+    features = ['dot_ball_pct', 'boundary_pct', 'six_pct', 'economy_rate']
+    agg['performance_index'] = _pca_index(_inverted(agg[features], ['economy_rate', 'six_pct', 'boundary_pct']))
+    return agg
+
+
+PLAYER_TABLES = {"batting": (batting_phase, BATTING_MIN_BALLS), "bowling": (bowling_phase, BOWLING_MIN_BALLS)}
+
+
+def _player_counts(cube, kind):
+    # Notebook column order: player, phase
+    return cube.reorder_levels(['season', PLAYER_KINDS[kind]["player"], 'phase']).sort_index()
+
+
+def recent_player_phase(cube, kind, since=RECENT_SINCE):
+    """player_batting_20_25.csv / player_bowling_20_25.csv."""
+    build, min_balls = PLAYER_TABLES[kind]
+    counts = _player_counts(cube, kind)
+    counts = counts[counts.index.get_level_values('season') >= since]
+    return build(counts.groupby(level=[1, 2], sort=True).sum(), min_balls)
+
+
+def season_player_phase(cube, kind):
+    """season_phase_batting_df.csv / season_phase_bowling_df.csv: one row per season x player x phase.
+
+    The performance index is fitted over all seasons together, so it is comparable across seasons.
+    """
+    build, _ = PLAYER_TABLES[kind]
+    return build(_player_counts(cube, kind), SEASON_MIN_BALLS)
+
+
+# ---- Outputs ----
+def derive_tables(cubes):
+    """Every derived CSV, keyed by file name."""
+    teams = cubes["teams"]
+    return {
+        "overall_phase_stats.csv": overall_phase_stats(teams),
+        "season_phase_stats.csv": season_phase_stats(teams),
+        "team_batting_20_25.csv": recent_team_phase(teams, "batting"),
+        "team_bowling_20_25.csv": recent_team_phase(teams, "bowling"),
+        "season_team_batting_phase.csv": season_team_phase(teams, "batting"),
+        "season_team_bowling_phase.csv": season_team_phase(teams, "bowling"),
+        "player_batting_20_25.csv": recent_player_phase(cubes["batting"], "batting"),
+        "player_bowling_20_25.csv": recent_player_phase(cubes["bowling"], "bowling"),
+        "season_phase_batting_df.csv": season_player_phase(cubes["batting"], "batting"),
+        "season_phase_bowling_df.csv": season_player_phase(cubes["bowling"], "bowling"),
+    }
+
+
+def compare_tables(tables, reference_dir=SHIPPED_DIR, rtol=1e-9):
+    """{file name: what differs} for every table that differs from its shipped CSV.
+
+    Names, counts and row order must match exactly; floats to `rtol`, which
+    absorbs summation-order noise in the PCA indices.
+    """
+    differences = {}
+    for name, table in tables.items():
+        path = os.path.join(reference_dir, name)
+        if not os.path.exists(path):
+            differences[name] = "not shipped"
+            continue
+        # Parsed back from CSV text, like the shipped copy, so dtypes compare equal
+        derived = pd.read_csv(io.StringIO(table.to_csv(index=False)))
+        try:
+            pd.testing.assert_frame_equal(derived, pd.read_csv(path), check_exact=False, rtol=rtol, atol=0)
+        except AssertionError as exc:
+            # Drop pandas' generic first line ("DataFrame are different")
+            differences[name] = " ".join(str(exc).split()[3:])
+    return differences
+
+
+def write_tables(tables, output_dir=OUTPUT_DIR):
+    """Write each table as CSV, skipping files whose content is unchanged; returns the written paths."""
+    os.makedirs(output_dir, exist_ok=True)
+    written = []
+    for name, table in tables.items():
+        path = os.path.join(output_dir, name)
+        text = table.to_csv(index=False)
+        if os.path.exists(path):
+            with open(path, newline="") as fh:
+                if fh.read() == text:
+                    continue
+        with open(path + ".tmp", "w", newline="") as fh:
+            fh.write(text)
+        os.replace(path + ".tmp", path)
+        written.append(path)
+    return written
+
+
+def refresh(output_dir=OUTPUT_DIR, store_dir=STORE_DIR, cube_dir=CUBE_DIR, rebuild=False):
+    """Bring the cubes up to date and rewrite any derived CSV that changed.
+
+    Returns (re-aggregated seasons, written paths, differences from the
+    shipped CSVs). Raises ValueError, without writing, if `output_dir` is
+    the shipped directory and any table differs from the shipped copy.
+    """
+    cubes, changed = update_cubes(ensure_store(store_dir), cube_dir, rebuild)
+    tables = derive_tables(cubes)
+    differences = compare_tables(tables)
+    if differences and os.path.abspath(output_dir) == os.path.abspath(SHIPPED_DIR):
+        raise ValueError(f"derived tables differ from the shipped CSVs, not overwriting them: {sorted(differences)}")
+    return changed, write_tables(tables, output_dir), differences
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    parser.add_argument("--rebuild", action="store_true", help="re-aggregate every season")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    changed, written, differences = refresh(args.output_dir, rebuild=args.rebuild)
+    print(f"Seasons re-aggregated: {changed or 'none'}")
+    print(f"✅ {len(written)} file(s) updated in {time.perf_counter() - start:.1f}s")
+    for path in written:
+        print(f"  {os.path.relpath(path)}")
+    if differences:
+        print(f"❌ {len(differences)} table(s) differ from the shipped CSVs:")
+        for name, reason in sorted(differences.items()):
+            print(f"  {name}: {reason}")
+        raise SystemExit(1)
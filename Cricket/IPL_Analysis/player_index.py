@@ -0,0 +1,41 @@
+"""Player-partitioned index over the season x phase player tables.
+
+`season_phase_batting_df.csv` / `season_phase_bowling_df.csv` are sorted once
+by (player, season), so each player's rows form one contiguous block.
+A player view is then a dict lookup plus a positional slice, not a full-table
+comparison. The sorted name lists behind the player dropdowns are
+precomputed per season window.
+"""
+
+import numpy as np
+
+# Player dropdowns list players active after this season
+RECENT_SINCE = 2020
+SEASON_WINDOWS = (None, RECENT_SINCE)
+
+
+def build_player_index(df, player_col, season_windows=SEASON_WINDOWS):
+    """Sort `df` into per-player blocks and record each block's [start, stop) rows."""
+    # Stable sort keeps each player's rows in their original within-season order
+    frame = df.sort_values([player_col, 'season'], kind='stable').reset_index(drop=True)
+    players = frame[player_col].to_numpy()
+
+    starts = np.flatnonzero(np.r_[True, players[1:] != players[:-1]])
+    stops = np.r_[starts[1:], len(frame)]
+    blocks = dict(zip(players[starts], zip(starts.tolist(), stops.tolist())))
+
+    last_season = frame.groupby(player_col, sort=True)['season'].max()
+    names = {since: list(last_season.index if since is None else last_season.index[last_season > since])
+             for since in season_windows}
+    return {'frame': frame, 'player_col': player_col, 'blocks': blocks, 'names': names}
+
+
+def player_rows(index, player):
+    """All rows for `player`, ordered by season (empty if the player is unknown)."""
+    start, stop = index['blocks'].get(player, (0, 0))
+    return index['frame'].iloc[start:stop]
+
+
+def player_names(index, since=RECENT_SINCE):
+    """Sorted names of players with a season after `since` (None: every player)."""
+    return index['names'][since]
@@ -0,0 +1,138 @@
+"""Phase x metric leaderboards for the Top Batters / Top Bowlers views.
+
+Rows of `player_batting_20_25.csv` / `player_bowling_20_25.csv` are reduced to
+one row per (player, phase) by summing the additive counts only. Rates
+(strike rate, economy, averages, percentages) are then recomputed from those
+sums, so a player spread over several rows gets runs / balls rather than a
+sum of per-row rates. Players below the minimum-ball qualifier are dropped,
+and every (phase, metric) leaderboard is selected with a partial top-k
+(`nlargest` / `nsmallest`) in one pass. The UI then only slices.
+"""
+
+import os
+
+import pandas as pd
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+SOURCES = {
+    "batting": os.path.join(CURRENT_DIR, "player_batting_20_25.csv"),
+    "bowling": os.path.join(CURRENT_DIR, "player_bowling_20_25.csv"),
+}
+
+PHASES = ['Powerplay', 'Middle', 'Death']
+# Leaderboard depth kept per (phase, metric)
+TOP_K = 50
+
+BATTING_COUNTS = ['runs', 'balls_faced', 'lost_wicket', 'dot_balls', 'boundaries', 'fours', 'sixes']
+BOWLING_COUNTS = ['runs_conceded', 'balls_bowled', 'wickets', 'dot_balls', 'boundaries', 'fours', 'sixes']
+
+RANKINGS = {
+    "batting": {
+        "player": "striker",
+        "balls": "balls_faced",
+        "counts": BATTING_COUNTS,
+        # metric -> rank ascending?
+        "metrics": {'strike_rate': False, 'runs': False, 'sixes': False, 'fours': False,
+                    'boundaries': False, 'performance_index': False},
+        # Same qualifiers the notebook used to build player_batting_20_25.csv
+        "min_balls": {'Powerplay': 200, 'Middle': 200, 'Death': 50},
+    },
+    "bowling": {
+        "player": "bowler",
+        "balls": "balls_bowled",
+        "counts": BOWLING_COUNTS,
+        # Fewer runs/boundaries conceded ranks higher
+        "metrics": {'economy_rate': True, 'runs_conceded': True, 'sixes': True, 'fours': True,
+                    'boundaries': True, 'performance_index': False},
+        "min_balls": 120,
+    },
+}
+
+
+def _per_ball(numerator, balls, scale=1):
+    return (numerator / balls * scale).round(2)
+
+
+def _per_wicket(numerator, wickets):
+    return (numerator / wickets.where(wickets > 0)).round(2)
+
+
+def _batting_rates(agg):
+    agg['strike_rate'] = _per_ball(agg['runs'], agg['balls_faced'], 100)
+    agg['balls_per_dismissal'] = _per_wicket(agg['balls_faced'], agg['lost_wicket'])
+    agg['batting_avg'] = _per_wicket(agg['runs'], agg['lost_wicket'])
+    agg['dot_ball_pct'] = _per_ball(agg['dot_balls'], agg['balls_faced'])
+    agg['boundary_pct'] = _per_ball(agg['boundaries'], agg['balls_faced'])
+    agg['six_pct'] = _per_ball(agg['sixes'], agg['balls_faced'], 100)
+    agg['dismissal_rate'] = _per_ball(agg['lost_wicket'], agg['balls_faced'])
+    return agg
+
+
+def _bowling_rates(agg):
+    agg['economy_rate'] = _per_ball(agg['runs_conceded'], agg['balls_bowled'], 6)
+    agg['balls_per_wicket'] = _per_wicket(agg['balls_bowled'], agg['wickets'])
+    agg['bowling_avg'] = _per_wicket(agg['runs_conceded'], agg['wickets'])
+    agg['dot_ball_pct'] = _per_ball(agg['dot_balls'], agg['balls_bowled'])
+    agg['boundary_pct'] = _per_ball(agg['boundaries'], agg['balls_bowled'])
+    agg['six_pct'] = _per_ball(agg['sixes'], agg['balls_bowled'])
+    return agg
+
+
+RATES = {"batting": _batting_rates, "bowling": _bowling_rates}
+
+
+def aggregate(df, kind):
+    """One row per (player, phase): summed counts, rates recomputed from the sums."""
+    config = RANKINGS[kind]
+    keys = [config["player"], 'phase']
+    balls = df[config["balls"]]
+    agg = df.groupby(keys, sort=False)[config["counts"]].sum()
+    # performance_index is a per-row PCA score, not a count: carry it as a ball-weighted mean
+    weighted = (df['performance_index'] * balls).groupby([df[k] for k in keys], sort=False).sum()
+    agg['performance_index'] = weighted / agg[config["balls"]]
+    return RATES[kind](agg.reset_index())
+
+
+def qualified(agg, kind, min_balls=None):
+    """Rows meeting the minimum-ball qualifier (an int, or a per-phase dict)."""
+    config = RANKINGS[kind]
+    if min_balls is None:
+        min_balls = config["min_balls"]
+    if isinstance(min_balls, dict):
+        threshold = agg['phase'].map(min_balls).fillna(0)
+    else:
+        threshold = min_balls
+    return agg[agg[config["balls"]] >= threshold]
+
+
+def rank(stats, kind, k=TOP_K, metrics=None):
+    """Top-k table for every (phase, metric) of per-(player, phase) `stats`, keyed by (phase, metric)."""
+    config = RANKINGS[kind]
+    player, balls = config["player"], config["balls"]
+    metrics = config["metrics"] if metrics is None else metrics
+
+    boards = {}
+    for phase, phase_stats in stats.groupby('phase', sort=False):
+        for metric, ascending in metrics.items():
+            ranked = phase_stats.dropna(subset=[metric])
+            select = ranked.nsmallest if ascending else ranked.nlargest
+            boards[(phase, metric)] = select(k, metric)[[player, balls, metric]].reset_index(drop=True)
+    return boards
+
+
+def build_leaderboards(df, kind, k=TOP_K, min_balls=None):
+    """Top-k table for every (phase, metric) of `kind`, keyed by (phase, metric)."""
+    return rank(qualified(aggregate(df, kind), kind, min_balls), kind, k)
+
+
+def leaderboard(boards, phase, metric, n=10):
+    """Top `n` rows of a precomputed board (empty if the phase has no qualifiers)."""
+    board = boards.get((phase, metric))
+    if board is None:
+        return pd.DataFrame()
+    return board.head(n)
+
+
+def load_leaderboards(kind, k=TOP_K, min_balls=None):
+    """`build_leaderboards()` over the shipped 2020-25 table for `kind`."""
+    return build_leaderboards(pd.read_csv(SOURCES[kind]), kind, k, min_balls)
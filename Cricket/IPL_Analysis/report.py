@@ -0,0 +1,215 @@
+"""Headless report pack for the IPL dashboard, without Streamlit.
+
+Builds every table the dashboard shows and writes them out:
+
+- Orange/Purple Cap top-N for each season
+- Top Batters/Bowlers for every phase x metric, by 2020-25 totals and by current form
+- the season x phase trend data behind every team and player chart
+- batter-vs-bowler matchups, per season and phase and in total
+
+The same aggregation modules as `app.py` are used. Tables are written as
+CSV and/or Parquet by a pool of worker processes. Trend charts can also be
+rendered as PNG (every team, plus any requested players); that needs the
+optional `kaleido` package, and without it only the charts are skipped.
+
+    python Cricket/IPL_Analysis/report.py --output-dir weekly_report --workers 8
+    python Cricket/IPL_Analysis/report.py --formats csv --players Kohli Bumrah
+"""
+
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+
+import pandas as pd
+
+import figures
+import form
+import leaderboards
+import matchups
+import rankings
+from ipl_store import STORE_DIR, available_seasons, ensure_store
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+OUTPUT_DIR = os.path.join(CURRENT_DIR, "report")
+
+TABLE_FORMATS = ("csv", "parquet")
+FORMATS = TABLE_FORMATS + ("png",)
+TOP_N = 10
+
+# table name -> (cube kind, ranking column)
+CAPS = {"orange_cap": ("batting", "runs"), "purple_cap": ("bowling", "wickets")}
+TOP_PLAYERS = {"top_batters": "batting", "top_bowlers": "bowling"}
+
+
+# ---- Tables ----
+def cap_tables(store_dir=STORE_DIR, n=TOP_N):
+    """Orange/Purple Cap top `n` for every season in the store, one table per cap."""
+    seasons = available_seasons(store_dir)
+    tables = {}
+    for name, (kind, sort_by) in CAPS.items():
+        cube = leaderboards.update_cube(kind, store_dir=store_dir)
+        frames = []
+        for season in seasons:
+            top = leaderboards.top_n(cube, kind, season, sort_by, n)
+            top.insert(0, 'season', season)
+            top.insert(1, 'rank', range(1, len(top) + 1))
+            frames.append(top)
+        tables[name] = pd.concat(frames, ignore_index=True)
+    return tables
+
+
+def _board_table(boards, n):
+    """`rankings`-style {(phase, metric): board} as one long table of the top `n` per board."""
+    frames = []
+    for (phase, metric), board in boards.items():
+        top = board.head(n).rename(columns={metric: 'value'})
+        top.insert(0, 'phase', phase)
+        top.insert(1, 'metric', metric)
+        top.insert(2, 'rank', range(1, len(top) + 1))
+        frames.append(top)
+    return pd.concat(frames, ignore_index=True)
+
+
+def top_player_tables(n=TOP_N):
+    """Top Batters/Bowlers: top `n` per (phase, metric), one long table per kind."""
+    return {name: _board_table(rankings.load_leaderboards(kind), n) for name, kind in TOP_PLAYERS.items()}
+
+
+def form_tables(store_dir=STORE_DIR, n=TOP_N):
+    """Top Batters/Bowlers by current form: top `n` per (phase, metric), one long table per kind."""
+    return {f"form_{name}": _board_table(form.load_form_leaderboards(kind, store_dir=store_dir), n)
+            for name, kind in TOP_PLAYERS.items()}
+
+
+def matchup_tables(store_dir=STORE_DIR):
+    """Every batter-vs-bowler pair: per (phase, season), and summed over all phases and seasons."""
+    cube = matchups.update_cube(store_dir=store_dir)
+    return {
+        "matchups_by_season": matchups.matchup_table(cube),
+        "matchups": matchups.matchup_table(cube, ["striker", "bowler"]),
+    }
+
+
+def trend_tables():
+    """The season x phase rows behind every team and player trend chart, one table per view."""
+    tables = {}
+    for view, config in figures.TREND_VIEWS.items():
+        source = _trend_source(view)
+        columns = [config["entity"], 'season', 'phase'] + config["metrics"]
+        tables[f"{view}_trends"] = (source[columns].dropna(subset=[config["entity"]])
+                                    .sort_values([config["entity"], 'season'], kind='stable')
+                                    .reset_index(drop=True))
+    return tables
+
+
+# ---- Charts ----
+@lru_cache(maxsize=None)
+def _trend_source(view):
+    # Read once per worker process
+    return pd.read_csv(figures.TREND_SOURCES[view])
+
+
+def trend_jobs(players=()):
+    """(view, entity, metric) of every team chart, and of each requested player's charts."""
+    jobs = []
+    for view, config in figures.TREND_VIEWS.items():
+        entities = _trend_source(view)[config["entity"]].dropna().unique()
+        if view.startswith("player_"):
+            entities = [p for p in players if p in set(entities)]
+        for entity in sorted(entities):
+            jobs.extend((view, entity, metric) for metric in config["metrics"])
+    return jobs
+
+
+def png_available():
+    try:
+        import kaleido  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _slug(name):
+    return re.sub(r"[^A-Za-z0-9]+", "_", str(name)).strip("_")
+
+
+# ---- Writers (run in worker processes) ----
+def _write_table(name, table, output_dir, formats):
+    paths = []
+    for fmt in formats:
+        path = os.path.join(output_dir, f"{name}.{fmt}")
+        if fmt == "csv":
+            table.to_csv(path, index=False)
+        else:
+            table.to_parquet(path, index=False)
+        paths.append(path)
+    return paths
+
+
+def _write_trend(view, entity, metric, output_dir):
+    fig = figures.trend_figure(_trend_source(view), view, entity, metric)
+    path = os.path.join(output_dir, "trends", view, f"{_slug(entity)}-{metric}.png")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fig.write_image(path)
+    return [path]
+
+
+def build_report(output_dir=OUTPUT_DIR, formats=FORMATS, players=(), workers=None, top_n=TOP_N,
+                 store_dir=STORE_DIR):
+    """Compute every analysis and write the report pack; returns the written paths."""
+    store_dir = ensure_store(store_dir)
+    tables = {**cap_tables(store_dir, top_n), **top_player_tables(top_n), **form_tables(store_dir, top_n),
+              **matchup_tables(store_dir), **trend_tables()}
+    table_formats = [f for f in formats if f in TABLE_FORMATS]
+
+    os.makedirs(output_dir, exist_ok=True)
+    written, failed = [], []
+
+    charts = []
+    if "png" in formats:
+        if png_available():
+            charts = trend_jobs(players)
+        else:
+            print("kaleido is not installed; skipping PNG charts, trend tables are still written "
+                  "(pip install kaleido)")
+    if charts:
+        # Render one chart up front so a broken kaleido/Chrome setup fails once, not per chart
+        try:
+            written.extend(_write_trend(*charts[0], output_dir))
+            charts = charts[1:]
+        except Exception as e:
+            print(f"PNG export unavailable, skipping charts: {e}")
+            charts = []
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(_write_table, name, table, output_dir, table_formats): name
+                   for name, table in tables.items() if table_formats}
+        futures.update({pool.submit(_write_trend, *job, output_dir): job for job in charts})
+        for future in as_completed(futures):
+            try:
+                written.extend(future.result())
+            except Exception as e:
+                failed.append((futures[future], e))
+    for job, error in failed[:5]:
+        print(f"Failed {job}: {error}")
+    if failed:
+        print(f"{len(failed)} outputs failed")
+    return written
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=list(FORMATS))
+    parser.add_argument("--players", nargs="*", default=[], help="Also render these players' trend charts as PNG")
+    parser.add_argument("--top-n", type=int, default=TOP_N)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    written = build_report(args.output_dir, args.formats, args.players, args.workers, args.top_n)
+    print(f"✅ Wrote {len(written)} files to {args.output_dir} in {time.perf_counter() - start:.1f}s")
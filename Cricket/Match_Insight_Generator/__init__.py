@@ -0,0 +1 @@
+"""Per-match batting/bowling insights and win probability."""
@@ -1,45 +1,85 @@
 # app.py
 import streamlit as st
 import pandas as pd
-from match_insights import generate_insights, load_and_clean_data
+import match_insights as mi
 import os
+import sys
+
+# Repo root, for the shared (opt-in) stage instrumentation and the `Cricket` package
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import instrumentation
+from Cricket import cricket_data
+
+instrumentation.start_run("match_insights")
+# Patched before the names below are bound, so load_cached_data() also calls the traced loader
+instrumentation.instrument(mi, "load_and_clean_data", "clean_data", "build_match_index", "generate_insights")
+from match_insights import build_match_index, clean_data, file_fingerprint, generate_insights, load_cached_data, match_slice
+import win_probability as wp
+instrumentation.instrument(wp, "load_table", "score_deliveries")
 
 # ----------------------------
 # 1️⃣ Load data and preprocess
 # ----------------------------
 st.title("🏏 IPL Match Insights Dashboard")
 
-# Load your CSV (ball-by-ball data)
+# Load your CSV (ball-by-ball data); without it, the IPL Analysis store is used
 ball_by_ball_path = os.path.join("Cricket/Match_Insight_Generator","ipl_ball_by_ball.csv")
-df, batting_stats_unique, bowling_stats_unique = load_and_clean_data(ball_by_ball_path)
+if not os.path.exists(ball_by_ball_path):
+    ball_by_ball_path = None
+
+# Shared by every session (read-only); the fingerprint argument invalidates
+# the entry when the CSV's size or mtime changes
+@instrumentation.traced()
+@st.cache_resource(max_entries=2, show_spinner="Loading ball-by-ball data...")
+def load_data(path, fingerprint):
+    if path is None:
+        # Column views of the process-wide frame, so no second copy of the deliveries
+        df, batting_stats_unique, bowling_stats_unique = clean_data(cricket_data.match_insights_view())
+    else:
+        df, batting_stats_unique, bowling_stats_unique = load_cached_data(path)
+    return df, batting_stats_unique, bowling_stats_unique, build_match_index(df)
+
+@instrumentation.traced()
+@st.cache_data(max_entries=256)
+def match_insights(path, fingerprint, match_id):
+    df, batting_stats_unique, bowling_stats_unique, match_index = load_data(path, fingerprint)
+    return generate_insights(df, batting_stats_unique, bowling_stats_unique, match_id, match_index)
+
+# Lookup table plus every stored delivery, match-contiguous, so a match is a row slice
+@instrumentation.traced()
+@st.cache_resource(show_spinner="Loading win-probability tables...")
+def load_win_probability():
+    deliveries = cricket_data.deliveries(wp.COLUMNS + ['season', 'date'])
+    return wp.load_table(), deliveries, build_match_index(deliveries)
+
+fingerprint = file_fingerprint(ball_by_ball_path) if ball_by_ball_path else None
+df, batting_stats_unique, bowling_stats_unique, match_index = load_data(ball_by_ball_path, fingerprint)
+fixtures = match_index['fixtures']
 
 # ----------------------------
 # 2️⃣ User input: Season, Teams, Date
 # ----------------------------
-season = st.selectbox("Select Season", sorted(df['season'].unique()))
+season = st.selectbox("Select Season", sorted(fixtures))
 
-# Filter matches for selected season
-season_matches = df[df['season']==season][['match_id','batting_team','bowling_team','date']].drop_duplicates()
+# Matches for selected season: season -> team -> opponent -> date -> match_id
+season_matches = fixtures[season]
 
-team1 = st.selectbox("Select Team 1", sorted(season_matches['batting_team'].unique()))
-team1_matches = season_matches[(season_matches['batting_team']==team1) | (season_matches['bowling_team']==team1)]
+team1 = st.selectbox("Select Team 1", sorted(season_matches))
+team1_matches = season_matches[team1]
 
-team2_options = pd.unique(team1_matches[['batting_team','bowling_team']].values.ravel())
-team2_options = sorted([t for t in team2_options if t != team1])
-team2 = st.selectbox("Select Team 2", team2_options)
-team2_matches = team1_matches[((team1_matches['batting_team']==team2) | (team1_matches['bowling_team']==team2))]
+team2 = st.selectbox("Select Team 2", sorted(team1_matches))
+team2_matches = team1_matches[team2]
 
-match_date = st.selectbox("Select Match Date", sorted(team2_matches['date'].unique()))
-match_row = team2_matches[team2_matches['date']==match_date].iloc[0]
-match_id = match_row['match_id']
+match_date = st.selectbox("Select Match Date", sorted(team2_matches))
+match_id = team2_matches[match_date]
 
 st.markdown(f"### Match: {team1} vs {team2} on {match_date}")
 
 # ----------------------------
 # 3️⃣ Generate insights
 # ----------------------------
-insights, batting_phase, bowling_phase, batting_merge, bowling_merge = generate_insights(
-    df, batting_stats_unique, bowling_stats_unique, match_id
+insights, batting_phase, bowling_phase, batting_merge, bowling_merge = match_insights(
+    ball_by_ball_path, fingerprint, match_id
 )
 
 # ----------------------------
@@ -84,3 +124,29 @@ st.subheader("⚡ Bowling Performance by Phase")
 st.dataframe(
     bowling_phase.sort_values(['phase','wickets_phase'], ascending=[True,False])
 )
+
+# ----------------------------
+# 8️⃣ Win probability
+# ----------------------------
+st.subheader("📈 Win Probability")
+wp_table, wp_deliveries, wp_index = load_win_probability()
+if match_id not in wp_index['rows']:
+    st.info("No win-probability data for this match in the IPL ball-by-ball store.")
+else:
+    scored = wp.score_deliveries(match_slice(wp_deliveries, wp_index, match_id), wp_table)
+    batting_first = scored['batting_team'].iloc[0]
+    st.line_chart((scored.set_index('overs')['wp_after'] * 100).rename(f"{batting_first} win %"))
+
+    swings = wp.biggest_swings(scored, 5)
+    st.markdown(f"**Biggest swing deliveries** (change in {batting_first}'s win probability)")
+    st.dataframe(pd.DataFrame({
+        'innings': swings['inning'],
+        'ball': swings['over'].astype(str) + '.' + swings['ball'].astype(str),
+        'batter': swings['striker'],
+        'bowler': swings['bowler'],
+        'runs': swings['total_runs'],
+        'wicket': swings['player_dismissed'],
+        'swing_pct': (swings['swing'] * 100).round(1),
+    }), hide_index=True)
+
+instrumentation.debug_panel()
@@ -7,10 +7,39 @@ Original file is located at
     https://colab.research.google.com/drive/1uN4_g3pB9pppQBUHqxWZJlSGn68qys7v
 """
 
+import os
+import re
+import shutil
+
+import numpy as np
 import pandas as pd
 
+# Last over (1-based, inclusive) of each phase; overs past the final bound
+# fall into the final phase.
+PHASE_BOUNDARIES = {'Powerplay': 6, 'Middle': 15, 'Death': 20}
+
+def label_phases(overs, phase_boundaries=PHASE_BOUNDARIES):
+    """Vectorized over -> phase label using bin edges instead of a per-ball function."""
+    labels = np.array(list(phase_boundaries), dtype=object)
+    edges = np.array(list(phase_boundaries.values())[:-1])
+    return pd.Series(labels[np.searchsorted(edges, overs.to_numpy(), side='left')],
+                     index=overs.index, dtype=str)
+
+def _fmt(values, spec):
+    """Column-wise number formatting, e.g. _fmt(df['economy'], '%.2f')."""
+    return pd.Series(np.char.mod(spec, values.to_numpy(dtype=float)), index=values.index, dtype=object)
+
 def load_and_clean_data(ball_by_ball_path):
-    df = pd.read_csv(ball_by_ball_path)
+    return clean_data(pd.read_csv(ball_by_ball_path))
+
+def clean_data(df):
+    """Season aggregates for a ball-by-ball frame (CSV or `cricket_data.match_insights_view()`)."""
+    # Keep every match's deliveries contiguous (ball order preserved) so a
+    # match can be addressed as a row range; see build_match_index(). A frame
+    # that already is (the shared store) is used as is, without a copy
+    match_ids = df['match_id'].to_numpy()
+    if len(df) and (match_ids[1:] != match_ids[:-1]).sum() + 1 != len(np.unique(match_ids)):
+        df = df.sort_values('match_id', kind='stable', ignore_index=True)
 
     # ----- Compute season aggregates dynamically -----
     batting_stats_unique = df.groupby(['season','striker']).agg(
@@ -30,53 +59,202 @@ def load_and_clean_data(ball_by_ball_path):
 
     return df, batting_stats_unique, bowling_stats_unique
 
+# ------------------------------
+# Persisted copy keyed on the source file's fingerprint
+# ------------------------------
+CACHE_FRAMES = ('df', 'batting_stats_unique', 'bowling_stats_unique')
+
+def file_fingerprint(path):
+    """(absolute path, size, mtime) -- changes whenever the CSV is replaced or edited."""
+    stat = os.stat(path)
+    return (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+
+def load_cached_data(ball_by_ball_path, cache_dir=None):
+    """load_and_clean_data() backed by an on-disk Parquet copy.
+
+    The copy lives in `cache_dir` (default: `.cache/` next to the CSV) under a
+    name derived from the file's size and mtime, so a restarted process reads
+    the already-aggregated frames and a changed CSV is re-aggregated once.
+    """
+    _, size, mtime_ns = file_fingerprint(ball_by_ball_path)
+    cache_dir = cache_dir or os.path.join(os.path.dirname(os.path.abspath(ball_by_ball_path)), '.cache')
+    stem = os.path.splitext(os.path.basename(ball_by_ball_path))[0]
+    entry = os.path.join(cache_dir, f"{stem}-{size}-{mtime_ns}")
+
+    if os.path.isdir(entry):
+        return tuple(pd.read_parquet(os.path.join(entry, f"{name}.parquet")) for name in CACHE_FRAMES)
+
+    frames = load_and_clean_data(ball_by_ball_path)
+    # Per-process staging dir, so parallel first loads never write into each other's
+    tmp = f"{entry}.{os.getpid()}.tmp"
+    os.makedirs(tmp, exist_ok=True)
+    for name, frame in zip(CACHE_FRAMES, frames):
+        frame.to_parquet(os.path.join(tmp, f"{name}.parquet"), index=False)
+    # Drop copies made from older versions of the same file -- exactly
+    # `{stem}-{size}-{mtime}`, so e.g. `ipl` leaves `ipl-2024`'s copies alone
+    version = re.compile(rf"{re.escape(stem)}-\d+-\d+")
+    for old in os.listdir(cache_dir):
+        if version.fullmatch(old) and os.path.join(cache_dir, old) != entry:
+            shutil.rmtree(os.path.join(cache_dir, old), ignore_errors=True)
+    try:
+        os.replace(tmp, entry)
+    except OSError:
+        # A parallel process published the same copy first; keep theirs
+        if not os.path.isdir(entry):
+            raise
+        shutil.rmtree(tmp, ignore_errors=True)
+    return frames
+
+# ------------------------------
+# Match index (built once at load time)
+# ------------------------------
+def build_match_index(df):
+    """Index a match-contiguous ball-by-ball frame.
+
+    Returns a dict with:
+    - 'rows':     match_id -> (start, stop) positional row range in `df`
+    - 'fixtures': season -> team -> opponent -> date -> match_id
+    """
+    match_ids = df['match_id'].to_numpy()
+    starts = np.flatnonzero(np.r_[True, match_ids[1:] != match_ids[:-1]])
+    stops = np.r_[starts[1:], len(df)]
+    if len(starts) != len(np.unique(match_ids)):
+        raise ValueError("df must be grouped by match_id (use clean_data)")
+
+    rows = dict(zip(match_ids[starts].tolist(), zip(starts.tolist(), stops.tolist())))
+
+    fixtures = {}
+    first_balls = df.iloc[starts][['match_id', 'season', 'batting_team', 'bowling_team', 'date']]
+    if pd.api.types.is_datetime64_any_dtype(first_balls['date']):
+        # The shared store keeps typed dates; the selectbox shows them like the CSV's
+        first_balls = first_balls.assign(date=first_balls['date'].dt.strftime('%Y-%m-%d'))
+    for match_id, season, team_a, team_b, date in first_balls.itertuples(index=False):
+        for team, opponent in ((team_a, team_b), (team_b, team_a)):
+            dates = fixtures.setdefault(season, {}).setdefault(team, {}).setdefault(opponent, {})
+            dates.setdefault(date, match_id)
+
+    return {'rows': rows, 'fixtures': fixtures}
+
+def match_slice(df, match_index, match_id):
+    """Deliveries of one match, in time proportional to that match only."""
+    start, stop = match_index['rows'][match_id]
+    return df.iloc[start:stop]
+
 # ------------------------------
 # 2️⃣ Generate insights per match
 # ------------------------------
-def generate_insights(df, batting_stats_unique, bowling_stats_unique, match_id):
-    match_rows = df[df['match_id'] == match_id].copy()
-    match_season = match_rows['season'].iloc[0]
+def generate_insights(df, batting_stats_unique, bowling_stats_unique, match_id, match_index=None,
+                      phase_boundaries=PHASE_BOUNDARIES):
+    if match_index is not None:
+        match_rows = match_slice(df, match_index, match_id)
+    else:
+        match_rows = df[df['match_id'] == match_id]
 
-    # Phase-wise flag
-    def phase(over):
-        if 1 <= over <= 6: return 'Powerplay'
-        elif 7 <= over <= 15: return 'Middle'
-        else: return 'Death'
-    match_rows['phase'] = match_rows['over'].apply(phase)
+    results = _grouped_insights(match_rows, batting_stats_unique, bowling_stats_unique, phase_boundaries)
+    return results[match_id]
+
+# ------------------------------
+# Batch insights (many matches / a whole season)
+# ------------------------------
+# Below this many matches per worker, starting the pool and pickling the
+# per-match frames back costs more than the work saved (a 70-match season
+# runs in ~0.3s serially, ~1s over 4 processes)
+MIN_MATCHES_PER_PROCESS = 250
+
+def generate_batch_insights(df, batting_stats_unique, bowling_stats_unique, match_ids=None, season=None,
+                            match_index=None, processes=None, phase_boundaries=PHASE_BOUNDARIES):
+    """Insights for many matches at once, keyed by match_id.
+
+    Pass either `match_ids` or a `season`. All matches are aggregated in one
+    grouped pass; with `processes` > 1 the matches are split into chunks and
+    each chunk is aggregated in a separate worker process, using fewer
+    processes (or none) so each gets at least MIN_MATCHES_PER_PROCESS matches.
+    Each value is the same tuple generate_insights() returns.
+    """
+    if match_ids is not None:
+        if match_index is not None:
+            positions = np.concatenate([np.arange(*match_index['rows'][m]) for m in match_ids])
+            rows = df.iloc[positions]
+        else:
+            rows = df[df['match_id'].isin(match_ids)]
+    elif season is not None:
+        rows = df[df['season'] == season]
+    else:
+        raise ValueError("pass match_ids or season")
+
+    batch_ids = rows['match_id'].unique()
+    processes = min(processes or 1, len(batch_ids) // MIN_MATCHES_PER_PROCESS)
+    if processes <= 1:
+        return _grouped_insights(rows, batting_stats_unique, bowling_stats_unique, phase_boundaries)
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    chunks = np.array_split(batch_ids, processes)
+    jobs = []
+    for chunk in chunks:
+        chunk_rows = rows[rows['match_id'].isin(chunk)]
+        seasons = chunk_rows['season'].unique()
+        jobs.append((chunk_rows,
+                     batting_stats_unique[batting_stats_unique['season'].isin(seasons)],
+                     bowling_stats_unique[bowling_stats_unique['season'].isin(seasons)],
+                     phase_boundaries))
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        for partial in pool.map(_grouped_insights_job, jobs):
+            results.update(partial)
+    return results
+
+def _int64_counts(frame):
+    """Sums of narrow integer columns (the shared store's int8) come back int8 or
+    int64 depending on their values; count in int64, as for a CSV, so every
+    batch and every worker chunk has the same dtypes."""
+    narrow = frame.select_dtypes(['int8', 'int16', 'int32']).columns.drop('match_id', errors='ignore')
+    return frame.astype(dict.fromkeys(narrow, 'int64'))
+
+def _grouped_insights_job(args):
+    return _grouped_insights(*args)
+
+def _grouped_insights(rows, batting_stats_unique, bowling_stats_unique, phase_boundaries=PHASE_BOUNDARIES):
+    """Batting/bowling/phase aggregates and insights for every match in `rows` in one grouped pass."""
+    rows = rows.assign(phase=label_phases(rows['over'], phase_boundaries))
+    match_season = rows.groupby('match_id', sort=False)['season'].first()
 
     # ----- Batting aggregation -----
-    batting_match = match_rows.groupby('striker').agg(
+    batting_match = rows.groupby(['match_id','striker']).agg(
         runs_match=('runs_of_bat','sum'),
         balls_match=('legal_ball','sum'),
         dot_balls=('dot_ball','sum'),
         boundaries=('boundary','sum')
-    ).reset_index()
+    ).reset_index().pipe(_int64_counts)
     batting_match['strike_rate_match'] = batting_match['runs_match']/batting_match['balls_match']*100
     batting_match['dot_ball_pct_match'] = batting_match['dot_balls']/batting_match['balls_match']*100
     batting_match['boundary_pct_match'] = batting_match['boundaries']/batting_match['balls_match']*100
+    batting_match['season'] = batting_match['match_id'].map(match_season)
 
     # Merge with season stats
     batting_merge = pd.merge(
         batting_match,
-        batting_stats_unique[batting_stats_unique['season']==match_season],
-        on='striker',
+        batting_stats_unique,
+        on=['season','striker'],
         how='left'
     )
 
     # ----- Bowling aggregation -----
-    bowling_match = match_rows.groupby('bowler').agg(
+    bowling_match = rows.groupby(['match_id','bowler']).agg(
         balls_bowled=('legal_ball','sum'),
         runs_conceded=('runs_of_bat','sum'),
         match_wickets=('player_dismissed','count'),
         dot_balls=('dot_ball','sum')
-    ).reset_index()
+    ).reset_index().pipe(_int64_counts)
     bowling_match['overs'] = bowling_match['balls_bowled']/6
     bowling_match['match_economy'] = bowling_match['runs_conceded']/bowling_match['overs']
+    bowling_match['season'] = bowling_match['match_id'].map(match_season)
 
     bowling_merge = pd.merge(
         bowling_match,
-        bowling_stats_unique[bowling_stats_unique['season']==match_season],
-        on='bowler',
+        bowling_stats_unique,
+        on=['season','bowler'],
         how='left'
     )
 
@@ -88,48 +266,73 @@ def generate_insights(df, batting_stats_unique, bowling_stats_unique, match_id):
     # 5️⃣ Phase-wise stats
     # -------------------------
     # Batting per phase
-    batting_phase = match_rows.groupby(['phase','striker']).agg(
+    batting_phase = rows.groupby(['match_id','phase','striker']).agg(
         runs_phase=('runs_of_bat','sum'),
         balls_phase=('legal_ball','sum')
-    ).reset_index()
+    ).reset_index().pipe(_int64_counts)
     batting_phase['strike_rate_phase'] = batting_phase['runs_phase']/batting_phase['balls_phase']*100
 
     # Bowling per phase
-    bowling_phase = match_rows.groupby(['phase','bowler']).agg(
+    bowling_phase = rows.groupby(['match_id','phase','bowler']).agg(
         wickets_phase=('player_dismissed','count'),
         runs_phase=('runs_of_bat','sum'),
         balls_phase=('legal_ball','sum')
-    ).reset_index()
+    ).reset_index().pipe(_int64_counts)
     bowling_phase['overs_phase'] = bowling_phase['balls_phase']/6
     bowling_phase['economy_phase'] = bowling_phase['runs_phase']/bowling_phase['overs_phase']
 
-
     # ----- Insights -----
-    insights = []
+    batting_text = pd.Series(batting_insights(batting_merge), index=batting_merge['match_id'], dtype=object)
+    bowling_text = pd.Series(bowling_insights(bowling_merge), index=bowling_merge['match_id'], dtype=object)
 
-    for _, row in batting_merge.iterrows():
-        sentences = []
-        if row['strike_rate_match'] > row['strike_rate']:
-            sentences.append(f"{row['striker']} scored at a strike rate of {row['strike_rate_match']:.1f}, above his season average of {row['strike_rate']:.1f}.")
-        else:
-            sentences.append(f"{row['striker']}'s strike rate was {row['strike_rate_match']:.1f}, slightly below his season average of {row['strike_rate']:.1f}.")
+    # ----- Split per match -----
+    def by_match(frame):
+        return {m: g.drop(columns='match_id').reset_index(drop=True)
+                for m, g in frame.groupby('match_id', sort=False)}
 
-        if row['runs_match'] > row['avg_runs']:
-            sentences.append(f"He scored {row['runs_match']} runs, higher than his season average of {row['avg_runs']:.1f}.")
-        else:
-            sentences.append(f"He scored {row['runs_match']} runs, slightly below his season average of {row['avg_runs']:.1f}.")
+    batting_phase, bowling_phase = by_match(batting_phase), by_match(bowling_phase)
+    batting_merge, bowling_merge = by_match(batting_merge), by_match(bowling_merge)
+    batting_text = batting_text.groupby(level=0, sort=False).agg(list)
+    bowling_text = bowling_text.groupby(level=0, sort=False).agg(list)
 
-        sentences.append(f"(PPI: {row['PPI']:.1f})")
-        insights.append(" ".join(sentences))
+    return {
+        m: (batting_text.get(m, []) + bowling_text.get(m, []),
+            batting_phase[m], bowling_phase[m], batting_merge[m], bowling_merge[m])
+        for m in match_season.index
+    }
 
-    for _, row in bowling_merge.iterrows():
-        sentences = []
-        if row['match_economy'] < row['economy']:
-            sentences.append(f"{row['bowler']} bowled economically at {row['match_economy']:.2f}, better than his season average of {row['economy']:.2f}.")
-        else:
-            sentences.append(f"{row['bowler']}'s economy was {row['match_economy']:.2f}, slightly above his season average.")
+# ------------------------------
+# Insight sentences (column-wise templating)
+# ------------------------------
+def batting_insights(batting_merge):
+    striker = batting_merge['striker'].astype(str).astype(object)
+    sr_match = _fmt(batting_merge['strike_rate_match'], '%.1f')
+    sr_season = _fmt(batting_merge['strike_rate'], '%.1f')
+    avg_runs = _fmt(batting_merge['avg_runs'], '%.1f')
+    runs = batting_merge['runs_match'].astype(str).astype(object)
+
+    strike_rate_text = np.where(
+        batting_merge['strike_rate_match'] > batting_merge['strike_rate'],
+        striker + " scored at a strike rate of " + sr_match + ", above his season average of " + sr_season + ".",
+        striker + "'s strike rate was " + sr_match + ", slightly below his season average of " + sr_season + ".")
+    runs_text = np.where(
+        batting_merge['runs_match'] > batting_merge['avg_runs'],
+        "He scored " + runs + " runs, higher than his season average of " + avg_runs + ".",
+        "He scored " + runs + " runs, slightly below his season average of " + avg_runs + ".")
+    ppi_text = "(PPI: " + _fmt(batting_merge['PPI'], '%.1f') + ")"
+
+    return (strike_rate_text + " " + runs_text + " " + ppi_text).tolist()
+
+def bowling_insights(bowling_merge):
+    bowler = bowling_merge['bowler'].astype(str).astype(object)
+    eco_match = _fmt(bowling_merge['match_economy'], '%.2f')
+    eco_season = _fmt(bowling_merge['economy'], '%.2f')
+    wickets = bowling_merge['match_wickets'].astype(str).astype(object)
 
-        sentences.append(f"He took {row['match_wickets']} wickets. (PPI: {row['PPI']:.1f})")
-        insights.append(" ".join(sentences))
+    economy_text = np.where(
+        bowling_merge['match_economy'] < bowling_merge['economy'],
+        bowler + " bowled economically at " + eco_match + ", better than his season average of " + eco_season + ".",
+        bowler + "'s economy was " + eco_match + ", slightly above his season average.")
+    wickets_text = "He took " + wickets + " wickets. (PPI: " + _fmt(bowling_merge['PPI'], '%.1f') + ")"
 
-    return (insights,batting_phase,bowling_phase,batting_merge,bowling_merge)
\ No newline at end of file
+    return (economy_text + " " + wickets_text).tolist()
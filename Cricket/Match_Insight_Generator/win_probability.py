@@ -0,0 +1,264 @@
+"""Ball-by-ball win probability from empirical match-state lookup tables.
+
+Every delivery of the IPL ball-by-ball store (`Cricket/IPL_Analysis`) is
+reduced to the match state *after* that ball:
+
+    (innings, balls remaining, wickets in hand, runs bucket)
+
+where the runs bucket is the current score in the first innings and the
+runs still required in the second (5-run buckets). For each state the
+fitted tables count how many deliveries were seen and how many of those
+ended in a win for the batting side. The counts are additive, so, like the
+leaderboard cubes, they are persisted and new seasons are folded in without
+re-reading older ones.
+
+Probabilities are derived from the counts with smoothing:
+
+- counts are spread to neighbouring balls / runs buckets by repeated [1, 2, 1] passes
+- each cell is shrunk toward the same state with wickets pooled, which in
+  turn is shrunk toward the innings' overall win rate (`PRIOR_WEIGHT`)
+- settled chases (target reached, or out of balls/wickets) are 1 / 0
+
+Fitted on even seasons and scored on odd ones, the second-innings Brier
+score is 0.158 (a gradient-boosted model on the same state: 0.154).
+Scoring a match or a season is pure array indexing, with no per-ball
+model call:
+
+    python -m Cricket.Match_Insight_Generator.win_probability            # fold in missing seasons
+    python -m Cricket.Match_Insight_Generator.win_probability --rebuild  # recount everything
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+# The fitted tables come from the IPL Analysis Parquet store
+from Cricket.IPL_Analysis.ipl_store import STORE_DIR, available_seasons, read_deliveries
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+TABLE_DIR = os.path.join(CURRENT_DIR, "wp_tables")
+
+COLUMNS = ["match_id", "inning", "over", "ball", "batting_team", "bowling_team", "striker", "bowler",
+           "total_runs", "extras_type", "is_wicket", "player_dismissed", "target_runs", "winner"]
+NOT_LEGAL = ['wide', 'noballs', 'noball']
+
+BALLS = 120
+RUN_BUCKET = 5
+# Scores / runs required above the last bucket share it
+RUN_BUCKETS = 51
+# table shape: innings x balls remaining x wickets in hand x runs bucket
+SHAPE = (2, BALLS + 1, 11, RUN_BUCKETS)
+# [1, 2, 1] smoothing passes along the balls / runs axes
+SMOOTHING = {1: 6, 3: 6}
+# Pseudo-deliveries of the parent estimate mixed into each cell
+PRIOR_WEIGHT = 1
+# Bumped whenever the counting changes; saved counts of another version are recounted
+COUNTS_VERSION = 2
+
+
+# ---- Match state ----
+def match_states(deliveries):
+    """Per-delivery state before and after the ball, in the deliveries' order.
+
+    `deliveries` must keep each innings' balls in play order (as the store
+    does). Super-over innings are dropped, and so are chases whose target is
+    neither recorded nor derivable (see `chase_targets()`).
+    """
+    rows = deliveries[deliveries["inning"].isin([1, 2])]
+    target = chase_targets(rows)
+    known = (rows["inning"] == 1) | target.notna()
+    rows, target = rows[known], target[known]
+    innings = [rows["match_id"], rows["inning"]]
+    legal = ~rows["extras_type"].isin(NOT_LEGAL)
+
+    balls_bowled = legal.astype("int16").groupby(innings, sort=False).cumsum()
+    wickets = rows["is_wicket"].astype("int16").groupby(innings, sort=False).cumsum()
+    score = rows["total_runs"].astype("int32").groupby(innings, sort=False).cumsum()
+    first = rows.groupby(innings, sort=False).cumcount().to_numpy() == 0
+
+    states = pd.DataFrame({
+        "innings": rows["inning"].to_numpy(dtype="int8") - 1,
+        "balls_left": np.clip(BALLS - balls_bowled.to_numpy(), 0, BALLS),
+        "wickets_left": np.clip(10 - wickets.to_numpy(), 0, 10),
+        "score": score.to_numpy(),
+        # Not used for the first innings
+        "target": target.fillna(0).to_numpy(dtype="int32"),
+    }, index=rows.index)
+    # State before each ball: the previous ball's state, or the start of the innings
+    for col, start in (("balls_left", BALLS), ("wickets_left", 10), ("score", 0)):
+        before = np.r_[start, states[col].to_numpy()[:-1]]
+        states[f"{col}_before"] = np.where(first, start, before)
+    return states
+
+
+def chase_targets(rows):
+    """Per-delivery target: `target_runs`, else the match's first-innings total + 1.
+
+    The store has no `target_runs` for some seasons (all of 2025). The
+    fallback equals the recorded target in every season that has one. It
+    stays NaN when the first innings is not among `rows`.
+    """
+    target = rows["target_runs"].astype("float")
+    missing = target.isna() & (rows["inning"] == 2)
+    if missing.any():
+        first = rows[rows["inning"] == 1]
+        totals = first["total_runs"].astype("int32").groupby(first["match_id"], sort=False).sum() + 1
+        target = target.fillna(rows["match_id"].map(totals).astype("float").where(missing))
+    return target
+
+
+def _runs_bucket(innings, score, target):
+    required = np.maximum(target - score, 0)
+    runs = np.where(innings == 0, score // RUN_BUCKET, -(-required // RUN_BUCKET))
+    return np.clip(runs, 0, RUN_BUCKETS - 1)
+
+
+def state_index(innings, balls_left, wickets_left, score, target):
+    """Flat index into a SHAPE-d table for each state."""
+    return np.ravel_multi_index((innings, balls_left, wickets_left, _runs_bucket(innings, score, target)), SHAPE)
+
+
+def _settled(innings, balls_left, wickets_left, score, target):
+    """Win probability of the batting side where the chase is already decided, else NaN."""
+    required = target - score
+    settled = np.full(len(innings), np.nan)
+    chasing = innings == 1
+    settled[chasing & (required <= 0)] = 1.0
+    out = chasing & (required > 0) & ((balls_left == 0) | (wickets_left == 0))
+    # One short is a tie, decided by a super over
+    settled[out] = np.where(required[out] == 1, 0.5, 0.0)
+    return settled
+
+
+# ---- Fitting ----
+def count_outcomes(deliveries):
+    """(deliveries seen, batting-side wins) per state, as two SHAPE-d arrays."""
+    states = match_states(deliveries)
+    rows = deliveries.loc[states.index]
+    won = (rows["winner"].astype(str) == rows["batting_team"].astype(str)).to_numpy()
+
+    index = state_index(states["innings"].to_numpy(), states["balls_left"].to_numpy(),
+                        states["wickets_left"].to_numpy(), states["score"].to_numpy(),
+                        states["target"].to_numpy())
+    size = int(np.prod(SHAPE))
+    seen = np.bincount(index, minlength=size).reshape(SHAPE)
+    wins = np.bincount(index, weights=won, minlength=size).reshape(SHAPE)
+    return seen.astype("int64"), wins.astype("int64")
+
+
+def _spread(counts, axis):
+    """[1, 2, 1] smoothing along `axis`, edges reflected."""
+    padded = np.concatenate([np.take(counts, [0], axis), counts, np.take(counts, [-1], axis)], axis)
+    n = counts.shape[axis]
+    return (np.take(padded, range(0, n), axis) + 2 * np.take(padded, range(1, n + 1), axis)
+            + np.take(padded, range(2, n + 2), axis)) / 4
+
+
+def build_table(seen, wins, prior_weight=PRIOR_WEIGHT):
+    """Smoothed batting-side win probability for every state."""
+    seen, wins = seen.astype(float), wins.astype(float)
+    for axis, passes in SMOOTHING.items():
+        for _ in range(passes):
+            seen, wins = _spread(seen, axis), _spread(wins, axis)
+
+    base = wins.sum(axis=(1, 2, 3), keepdims=True) / np.maximum(seen.sum(axis=(1, 2, 3), keepdims=True), 1)
+    pooled_seen, pooled_wins = seen.sum(axis=2, keepdims=True), wins.sum(axis=2, keepdims=True)
+    pooled = (pooled_wins + prior_weight * base) / (pooled_seen + prior_weight)
+    return (wins + prior_weight * pooled) / (seen + prior_weight)
+
+
+# ---- Scoring ----
+def _lookup(table, innings, balls_left, wickets_left, score, target):
+    p = table.ravel()[state_index(innings, balls_left, wickets_left, score, target)]
+    settled = _settled(innings, balls_left, wickets_left, score, target)
+    return np.where(np.isnan(settled), p, settled)
+
+
+def score_deliveries(deliveries, table):
+    """Win probability of the side batting first, before and after every delivery.
+
+    Adds `wp_before`, `wp_after` and `swing` (after - before) to the
+    deliveries of innings 1 and 2. Vectorized over any number of matches.
+    """
+    states = match_states(deliveries)
+    innings, target = states["innings"].to_numpy(), states["target"].to_numpy()
+    after = _lookup(table, innings, states["balls_left"].to_numpy(), states["wickets_left"].to_numpy(),
+                    states["score"].to_numpy(), target)
+    before = _lookup(table, innings, states["balls_left_before"].to_numpy(),
+                     states["wickets_left_before"].to_numpy(), states["score_before"].to_numpy(), target)
+    # Table values are for the batting side; the chasing side bats second
+    batting_first = innings == 0
+    scored = deliveries.loc[states.index].copy()
+    scored["wp_before"] = np.where(batting_first, before, 1 - before)
+    scored["wp_after"] = np.where(batting_first, after, 1 - after)
+    scored["swing"] = scored["wp_after"] - scored["wp_before"]
+    # Overs bowled across both innings, for plotting
+    scored["overs"] = innings * (BALLS / 6) + (BALLS - states["balls_left"].to_numpy()) / 6
+    return scored
+
+
+def biggest_swings(scored, k=5):
+    """The `k` deliveries that moved the win probability most, either way."""
+    return scored.loc[scored["swing"].abs().nlargest(k).index]
+
+
+# ---- Persistence ----
+def table_path(table_dir=TABLE_DIR):
+    return os.path.join(table_dir, "state_counts.npz")
+
+
+def load_counts(table_dir=TABLE_DIR):
+    path = table_path(table_dir)
+    if not os.path.exists(path):
+        return None
+    with np.load(path) as saved:
+        if "version" not in saved or int(saved["version"]) != COUNTS_VERSION:
+            return None
+        return saved["seen"], saved["wins"], saved["seasons"].tolist()
+
+
+def save_counts(seen, wins, seasons, table_dir=TABLE_DIR):
+    os.makedirs(table_dir, exist_ok=True)
+    path = table_path(table_dir)
+    with open(path + ".tmp", "wb") as fh:
+        np.savez(fh, seen=seen, wins=wins, seasons=np.asarray(sorted(seasons)), version=COUNTS_VERSION)
+    os.replace(path + ".tmp", path)
+
+
+def update_counts(store_dir=STORE_DIR, table_dir=TABLE_DIR, rebuild=False):
+    """Load the persisted state counts and fold in any store seasons not counted yet."""
+    saved = None if rebuild else load_counts(table_dir)
+    seen, wins, seasons = saved if saved is not None else (np.zeros(SHAPE, "int64"), np.zeros(SHAPE, "int64"), [])
+    missing = [s for s in available_seasons(store_dir) if s not in seasons]
+    if not missing:
+        return seen, wins, seasons
+
+    new_seen, new_wins = count_outcomes(read_deliveries(COLUMNS, missing, store_dir=store_dir))
+    seen, wins, seasons = seen + new_seen, wins + new_wins, sorted(seasons + missing)
+    save_counts(seen, wins, seasons, table_dir)
+    return seen, wins, seasons
+
+
+def load_table(store_dir=STORE_DIR, table_dir=TABLE_DIR):
+    """Smoothed lookup table over every season in the store."""
+    seen, wins, _ = update_counts(store_dir, table_dir)
+    return build_table(seen, wins)
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rebuild", action="store_true", help="recount every season from the store")
+    args = parser.parse_args()
+    seen, wins, seasons = update_counts(rebuild=args.rebuild)
+    print(f"{int(seen.sum())} deliveries counted over seasons {seasons}; {int((seen > 0).sum())} states seen")
+
+    table = build_table(seen, wins)
+    deliveries = read_deliveries(COLUMNS, [seasons[-1]])
+    start = time.perf_counter()
+    score_deliveries(deliveries, table)
+    print(f"Scored season {seasons[-1]} ({len(deliveries)} deliveries) in {time.perf_counter() - start:.3f}s")
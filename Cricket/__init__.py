@@ -0,0 +1 @@
+"""Cricket analytics: the IPL phase dashboard, the Match Insight Generator and their shared data layer."""
@@ -0,0 +1,143 @@
+"""Shared, read-only IPL ball-by-ball data for the cricket apps and batch jobs.
+
+Both cricket projects read the same deliveries under different names. The
+canonical schema is the typed IPL Parquet store (`IPL_Analysis/ipl_store.py`):
+int8/int16 counters, categorical names, boolean flags. The Match Insight
+Generator's names map onto it through `MATCH_INSIGHTS_COLUMNS`:
+
+    runs_of_bat -> batsman_runs     dot_ball -> is_dot_ball     boundary -> is_boundary
+    legal_ball  <- not a wide / no-ball                        over     <- over + 1 (1-based)
+
+The full frame is loaded once per process, on first use, and shared by
+every session, app module and batch job in that process. Callers never get
+the frame itself, only projections from `deliveries()` /
+`match_insights_view()`. Under pandas' copy-on-write a column selection, a
+rename and a contiguous season slice all share memory with the shared
+frame. A view costs no copy until its holder writes to it, and such writes
+never reach the shared frame. Copy-on-write is always on only from pandas
+3, so older versions are refused at import.
+
+Import it from the repository root as a package:
+
+    from Cricket import cricket_data
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from Cricket.IPL_Analysis.ipl_store import (BOOL_COLUMNS, CATEGORY_COLUMNS, DATE_COLUMNS, INT_COLUMNS, STORE_DIR,
+                                            ensure_store, read_deliveries)
+
+# Without copy-on-write a write to a season slice would land in the process-wide frame
+if int(pd.__version__.split(".")[0]) < 3:
+    raise ImportError(f"cricket_data needs pandas >= 3 (always-on copy-on-write), found {pd.__version__}")
+
+# ---- Canonical schema ----
+SCHEMA = {
+    **INT_COLUMNS,
+    **{col: "datetime64[us]" for col in DATE_COLUMNS},
+    **{col: "category" for col in CATEGORY_COLUMNS},
+    **{col: "bool" for col in BOOL_COLUMNS},
+}
+NOT_LEGAL = ['wide', 'noballs', 'noball']
+
+
+def _legal_ball(frame):
+    return (~frame['extras_type'].isin(NOT_LEGAL)).astype('int8')
+
+
+def _one_based_over(frame):
+    return (frame['over'] + 1).astype('int8')
+
+
+# Match Insight Generator column -> canonical column, or a function deriving it
+MATCH_INSIGHTS_COLUMNS = {
+    'match_id': 'match_id',
+    'season': 'season',
+    'date': 'date',
+    'batting_team': 'batting_team',
+    'bowling_team': 'bowling_team',
+    'over': _one_based_over,
+    'striker': 'striker',
+    'bowler': 'bowler',
+    'runs_of_bat': 'batsman_runs',
+    'legal_ball': _legal_ball,
+    'dot_ball': 'is_dot_ball',
+    'boundary': 'is_boundary',
+    'player_dismissed': 'player_dismissed',
+}
+
+# ---- Process-wide frame ----
+_lock = threading.Lock()
+# store_dir -> {'frame': canonical frame, 'derived': {name: column}}
+_shared = {}
+
+
+def _load(store_dir):
+    with _lock:
+        if store_dir not in _shared:
+            frame = read_deliveries(store_dir=ensure_store(store_dir))
+            mismatched = {col: str(frame[col].dtype) for col, dtype in SCHEMA.items() if str(frame[col].dtype) != dtype}
+            if mismatched:
+                raise ValueError(f"store does not match the canonical schema (rebuild it): {mismatched}")
+            # Season partitions come back in season order; keep it so a season range is one slice
+            if not frame['season'].is_monotonic_increasing:
+                frame = frame.sort_values('season', kind='stable', ignore_index=True)
+            _shared[store_dir] = {'frame': frame, 'derived': {}}
+        return _shared[store_dir]
+
+
+def _season_rows(frame, seasons):
+    """Positional slice (a view) for a contiguous run of seasons, else a row mask."""
+    season = frame['season'].to_numpy()
+    wanted = np.isin(season, list(seasons))
+    positions = np.flatnonzero(wanted)
+    if not len(positions):
+        return slice(0, 0)
+    if positions[-1] - positions[0] + 1 == len(positions):
+        return slice(positions[0], positions[-1] + 1)
+    return wanted
+
+
+def _project(frame, columns, seasons):
+    view = frame[list(frame.columns) if columns is None else list(dict.fromkeys(columns))]
+    if seasons is None:
+        return view
+    rows = _season_rows(frame, seasons)
+    return view.iloc[rows] if isinstance(rows, slice) else view[rows]
+
+
+def deliveries(columns=None, seasons=None, store_dir=STORE_DIR):
+    """Canonical-schema projection of the shared frame (all columns / seasons by default)."""
+    return _project(_load(store_dir)['frame'], columns, seasons)
+
+
+def match_insights_view(seasons=None, store_dir=STORE_DIR):
+    """The shared frame in the Match Insight Generator's column names.
+
+    Renamed columns are views; the two derived ones are computed once per
+    process and shared like the rest.
+    """
+    shared = _load(store_dir)
+    frame, derived = shared['frame'], shared['derived']
+    columns = {}
+    for name, source in MATCH_INSIGHTS_COLUMNS.items():
+        if callable(source):
+            with _lock:
+                if name not in derived:
+                    derived[name] = source(frame)
+            columns[name] = derived[name]
+        else:
+            columns[name] = frame[source]
+    return _project(pd.DataFrame(columns, copy=False), None, seasons)
+
+
+def shared_memory_mb(store_dir=STORE_DIR):
+    """Size of the process-wide frame plus derived columns (0 if not loaded yet)."""
+    shared = _shared.get(store_dir)
+    if shared is None:
+        return 0.0
+    derived = sum(col.memory_usage(deep=True) for col in shared['derived'].values())
+    return (shared['frame'].memory_usage(deep=True).sum() + derived) / 1e6
@@ -2,13 +2,27 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
-from sklearn.preprocessing import MinMaxScaler
-from sklearn.metrics.pairwise import euclidean_distances
-import plotly.express as px
+from plotly.colors import qualitative
+from artifacts import dataset_version
+import similarity
+import clustering
+import positions
+import os
+import sys
+
+# Repo root, for the shared (opt-in) stage instrumentation
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import instrumentation
+
+instrumentation.start_run("football")
+instrumentation.instrument(positions, "build_position_index", "players_in_position")
+instrumentation.instrument(similarity, "load_or_build_index", "similar_players")
+instrumentation.instrument(clustering, "load_or_fit_clusters", "assign_clusters")
 
 # ----------------------------
 # Load preprocessed data
 # ----------------------------
+@instrumentation.traced()
 @st.cache_data
 def load_data():
     lineups_df = pd.read_csv("Football/Football_Player_Scouting_Dashboard/processed_data/lineups_clean.csv")
@@ -16,26 +30,37 @@ def load_data():
     player_clusters = pd.read_csv("Football/Football_Player_Scouting_Dashboard/processed_data/player_clusters.csv")
     return lineups_df, season_stats, player_clusters
 
+@st.cache_data
+def load_dataset_version():
+    return dataset_version()
+
+@instrumentation.traced()
+@st.cache_resource
+def load_position_index():
+    return positions.build_position_index(load_data()[0])
+
 lineups_df, season_stats, player_clusters = load_data()
+data_version = load_dataset_version()
 
 # ----------------------------
 # Sidebar - Filters
 # ----------------------------
 st.sidebar.title("Player Scouting Dashboard")
 
-# Get unique positions from lineups_df
-all_positions = lineups_df['position'].explode().dropna().unique().tolist()
-position_filter = st.sidebar.selectbox("Select Position", ["All"] + all_positions)
+# Position (and position group) -> player_ids, weighted by minutes in position
+position_index = load_position_index()
+position_filter = st.sidebar.selectbox("Select Position", ["All"] + positions.position_options(position_index))
 
 # Filter players by position
 if position_filter != "All":
-    filtered_players = lineups_df[
-        lineups_df['position'].astype(str).str.contains(position_filter)
-    ]
-    filtered_ids = filtered_players['player_id'].unique()
+    filtered_ids = positions.players_in_position(position_index, position_filter)
     filtered_stats = season_stats[season_stats['player_id'].isin(filtered_ids)]
 else:
-    filtered_stats = season_stats.copy()
+    filtered_stats = season_stats
+
+if filtered_stats.empty:
+    st.warning(f"No players with season stats for position: {position_filter}")
+    st.stop()
 
 # Player selection
 player_names = filtered_stats['player_name'].unique().tolist()
@@ -53,6 +78,7 @@ radar_stats = [
 # ----------------------------
 # Helper functions
 # ----------------------------
+@instrumentation.traced()
 def plot_radar_players(players_df, stats_columns, title="Radar Chart"):
     """Interactive radar chart for multiple players with different colors."""
     # Ensure DataFrame
@@ -62,7 +88,7 @@ def plot_radar_players(players_df, stats_columns, title="Radar Chart"):
     fig = go.Figure()
     
     # Generate unique colors
-    colors = px.colors.qualitative.Plotly
+    colors = qualitative.Plotly
     num_colors = len(colors)
     
     for i, (_, row) in enumerate(players_df.iterrows()):
@@ -85,17 +111,22 @@ def plot_radar_players(players_df, stats_columns, title="Radar Chart"):
     )
     return fig
 
-def find_similar_players(df, player_name, stats_columns, top_n=5):
-    """Find top N similar players using Euclidean distance."""
-    df_numeric = df[['player_id','player_name'] + stats_columns].set_index('player_id')
-    scaler = MinMaxScaler()
-    df_scaled = scaler.fit_transform(df_numeric[stats_columns])
-    
-    player_idx = df_numeric.index[df_numeric['player_name'] == player_name][0]
-    distances = euclidean_distances(df_scaled, [df_scaled[df_numeric.index.get_loc(player_idx)]])
-    df_numeric['distance'] = distances
-    similar = df_numeric.sort_values('distance').iloc[1:top_n+1].reset_index()
-    return similar[['player_name'] + stats_columns + ['distance']]
+@instrumentation.traced()
+@st.cache_resource(max_entries=64)
+def load_similarity_index(position, version, _stats_df):
+    """Prebuilt nearest-neighbour index for the current position filter."""
+    return similarity.load_or_build_index(_stats_df, radar_stats, position, version)
+
+@instrumentation.traced()
+@st.cache_resource(max_entries=64)
+def load_cluster_model(position, version, _stats_df):
+    """Persisted KMeans centroids for the current position filter."""
+    return clustering.load_or_fit_clusters(_stats_df, radar_stats, position, version)
+
+@instrumentation.traced()
+def find_similar_players(index, player_names, top_n=5):
+    """Find top N players similar to one player (or to any of several)."""
+    return similarity.similar_players(index, player_names, top_n=top_n)
 
 # ----------------------------
 # Main Dashboard
@@ -110,11 +141,13 @@ if isinstance(player_row, pd.Series):
 # Radar chart
 st.subheader("Player Radar Chart")
 radar_fig = plot_radar_players(player_row, radar_stats)
-st.plotly_chart(radar_fig, use_container_width=True)
+with instrumentation.stage("render radar chart"):
+    st.plotly_chart(radar_fig, use_container_width=True)
 
 # Similar players
 st.subheader(f"Top 5 Similar Players to {selected_player}")
-similar_players = find_similar_players(filtered_stats, selected_player, radar_stats, top_n=5)
+similarity_index = load_similarity_index(position_filter, data_version, filtered_stats)
+similar_players = find_similar_players(similarity_index, selected_player, top_n=5)
 st.dataframe(similar_players)
 
 # ----------------------------
@@ -122,27 +155,30 @@ st.dataframe(similar_players)
 # ----------------------------
 st.subheader(f"Radar Chart: {selected_player} vs Top 5 Similar Players")
 
-# Get top 5 similar players
-similar_players_df = find_similar_players(filtered_stats, selected_player, radar_stats, top_n=5)
-
-# Combine selected player + similar players
-players_to_plot = pd.concat([player_row, similar_players_df], ignore_index=True)
+# Combine selected player + top 5 similar players (computed above)
+players_to_plot = pd.concat([player_row, similar_players], ignore_index=True)
 
 # Plot combined radar chart
 combined_radar_fig = plot_radar_players(players_to_plot, radar_stats,
                                         title=f"{selected_player} and Similar Players")
-st.plotly_chart(combined_radar_fig, use_container_width=True)
+with instrumentation.stage("render combined radar chart"):
+    st.plotly_chart(combined_radar_fig, use_container_width=True)
 
 # ----------------------------
 # Cluster visualization
 # ----------------------------
 st.subheader("Player Clusters (KMeans example)")
-from sklearn.cluster import KMeans
 
-X = filtered_stats[radar_stats].fillna(0)
-kmeans = KMeans(n_clusters=4, random_state=42).fit(X)
-filtered_stats['cluster'] = kmeans.labels_
+# Centroids are fitted offline once per dataset version and position filter;
+# here players are only assigned to the nearest stored centroid
+if len(filtered_stats) >= clustering.N_CLUSTERS:
+    cluster_model = load_cluster_model(position_filter, data_version, filtered_stats)
+    clustered_stats = filtered_stats.assign(cluster=clustering.assign_clusters(cluster_model, filtered_stats))
 
-st.write("Players colored by cluster:")
+    st.write("Players colored by cluster:")
+
+    st.dataframe(clustered_stats[['player_name','cluster'] + radar_stats])
+else:
+    st.info(f"Not enough players in {position_filter} to form {clustering.N_CLUSTERS} clusters.")
 
-st.dataframe(filtered_stats[['player_name','cluster'] + radar_stats])
+instrumentation.debug_panel()
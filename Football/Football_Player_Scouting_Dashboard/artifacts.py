@@ -0,0 +1,56 @@
+"""Versioned on-disk artifacts (similarity indexes, cluster models) for the scouting dashboard.
+
+Artifacts are fitted once per dataset version and position filter and stored
+under `processed_data/artifacts/<kind>/`. The dataset version is a hash of
+the processed CSVs, so regenerating them invalidates every artifact. Each
+file name also carries a hash of the inputs the artifact was fitted on (the
+filtered player_ids and the stats columns). A change to the position-filter
+rules or to the features then fits a new artifact instead of loading one
+built for a different set of players.
+"""
+
+import hashlib
+import json
+import os
+import re
+
+import joblib
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(CURRENT_DIR, "processed_data")
+ARTIFACT_DIR = os.path.join(DATA_DIR, "artifacts")
+SOURCE_FILES = ("lineups_clean.csv", "season_stats_clean.csv")
+
+
+def dataset_version(data_dir=DATA_DIR, files=SOURCE_FILES):
+    """Short content hash of the processed CSVs."""
+    digest = hashlib.md5()
+    for name in files:
+        with open(os.path.join(data_dir, name), "rb") as fh:
+            for chunk in iter(lambda: fh.read(1 << 20), b""):
+                digest.update(chunk)
+    return digest.hexdigest()[:12]
+
+
+def inputs_key(player_ids, stats_columns):
+    """Short hash of the (order-independent) player_ids and the ordered stats columns."""
+    ids = sorted(str(player_id) for player_id in player_ids)
+    return hashlib.md5(json.dumps([ids, list(stats_columns)]).encode()).hexdigest()[:12]
+
+
+def artifact_path(kind, position, version, inputs, artifact_dir=ARTIFACT_DIR):
+    slug = re.sub(r"[^a-z0-9]+", "-", str(position).lower()).strip("-") or "all"
+    return os.path.join(artifact_dir, kind, f"{slug}-{version}-{inputs}.joblib")
+
+
+def load_or_build(kind, position, version, build, player_ids, stats_columns, artifact_dir=ARTIFACT_DIR):
+    """Load the artifact for (kind, position, version, fitted inputs), fitting it with `build()` if missing."""
+    path = artifact_path(kind, position, version, inputs_key(player_ids, stats_columns), artifact_dir)
+    if os.path.exists(path):
+        return joblib.load(path)
+
+    artifact = build()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    joblib.dump(artifact, path + ".tmp")
+    os.replace(path + ".tmp", path)
+    return artifact
@@ -0,0 +1,99 @@
+"""Offline KMeans stage for the player-cluster view.
+
+Clusters are fitted once per dataset version and position filter; the
+centroids and fitted labels are persisted with the other artifacts. At
+serve time players are assigned to the nearest stored centroid, so a page
+interaction never pays for a model fit. Large player pools are fitted
+with MiniBatchKMeans.
+
+Fit every position filter ahead of time:
+
+    python Football/Football_Player_Scouting_Dashboard/clustering.py
+"""
+
+import numpy as np
+import pandas as pd
+
+import artifacts
+
+N_CLUSTERS = 4
+# Same per-90 features as the dashboard's radar charts
+CLUSTER_STATS = [
+    'pass_total_per90',
+    'carry_total_per90',
+    'ball_recovery_total_per90',
+    'under_pressure_per90',
+    'shot_total_per90'
+]
+RANDOM_STATE = 42
+# Player pools above this size are fitted with MiniBatchKMeans
+MINIBATCH_THRESHOLD = 10_000
+
+
+def fit_clusters(stats_df, stats_columns, n_clusters=N_CLUSTERS, random_state=RANDOM_STATE,
+                 minibatch=None, batch_size=1024):
+    """Fit KMeans (or MiniBatchKMeans) and keep only what serving needs."""
+    # Imported here: serving only needs the stored centroids, not scikit-learn
+    from sklearn.cluster import KMeans, MiniBatchKMeans
+
+    stats_columns = list(stats_columns)
+    X = stats_df[stats_columns].fillna(0).to_numpy()
+    if minibatch is None:
+        minibatch = len(X) > MINIBATCH_THRESHOLD
+
+    if minibatch:
+        model = MiniBatchKMeans(n_clusters=n_clusters, random_state=random_state,
+                                batch_size=batch_size, n_init=3)
+    else:
+        model = KMeans(n_clusters=n_clusters, random_state=random_state)
+    model.fit(X)
+
+    return {
+        'stats_columns': stats_columns,
+        'centroids': model.cluster_centers_,
+        'labels': pd.Series(model.labels_, index=stats_df['player_id'].to_numpy(), name='cluster'),
+        'minibatch': minibatch,
+    }
+
+
+def load_or_fit_clusters(stats_df, stats_columns, position, version, **fit_kwargs):
+    """Persisted cluster model for `position`; fitted on first use for this dataset version and player set."""
+    # Fit parameters are part of the name too, so e.g. a new N_CLUSTERS refits instead of loading old centroids
+    params = {'n_clusters': N_CLUSTERS, **fit_kwargs}
+    label = "-".join([str(position)] + [f"{name}{value}" for name, value in sorted(params.items())])
+    return artifacts.load_or_build(
+        "clusters", label, version,
+        lambda: fit_clusters(stats_df, stats_columns, **fit_kwargs),
+        stats_df['player_id'], stats_columns)
+
+
+def assign_clusters(model, stats_df):
+    """Nearest-centroid cluster label for every row of `stats_df`."""
+    X = stats_df[model['stats_columns']].fillna(0).to_numpy()
+    centroids = model['centroids']
+    # ||x - c||^2 = ||x||^2 - 2 x.c + ||c||^2; ||x||^2 is constant per row
+    distances = (centroids ** 2).sum(axis=1) - 2 * X @ centroids.T
+    return pd.Series(np.argmin(distances, axis=1), index=stats_df.index, name='cluster')
+
+
+if __name__ == "__main__":
+    import os
+
+    import positions
+
+    lineups_df = pd.read_csv(os.path.join(artifacts.DATA_DIR, "lineups_clean.csv"))
+    season_stats = pd.read_csv(os.path.join(artifacts.DATA_DIR, "season_stats_clean.csv"))
+    version = artifacts.dataset_version()
+
+    position_index = positions.build_position_index(lineups_df)
+
+    for position in ["All"] + positions.position_options(position_index):
+        if position == "All":
+            stats = season_stats
+        else:
+            ids = positions.players_in_position(position_index, position)
+            stats = season_stats[season_stats['player_id'].isin(ids)]
+        if len(stats) < N_CLUSTERS:
+            continue
+        load_or_fit_clusters(stats, CLUSTER_STATS, position, version)
+        print(f"{position}: {len(stats)} players")
@@ -0,0 +1,269 @@
+"""Parallel, incremental StatsBomb ingestion for the scouting dashboard's processed_data.
+
+Script version of `01_Data_Ingestion.ipynb`. Each match's events and lineups
+JSON are parsed in a worker process and reduced to small per-match partials
+(per-player event counts and minutes, flattened lineup spells). The partials
+are written to an on-disk store as soon as they arrive. Matches already in
+the store are skipped, so adding a competition only parses its own matches.
+`season_stats_clean.csv` and `lineups_clean.csv` are then derived from the
+partials alone, into `ingestion_out/` by default. The copies the dashboard
+reads in processed_data/ are only replaced with `--overwrite-shipped`.
+
+The derived season_stats_clean.csv keeps only the columns the dashboard
+reads: player_id, player_name, minutes_played, the event counts and their
+per-90 rates. The notebook's export also summed every numeric event field
+(index, period, minute, second, possession, duration, counterpress, out,
+off_camera, match_id). It carried a `cluster` column from its own KMeans
+run too. Those columns are not written; clustering.py fits the dashboard's
+clusters, and player_clusters.csv is left as shipped. minutes_played also
+differs: the notebook summed spell minutes once per event row.
+
+    python Football/Football_Player_Scouting_Dashboard/ingestion.py \\
+        --data-path open-data/data --competition 9 281 --competition 7 235 --workers 8
+"""
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from positions import spell_minutes
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(CURRENT_DIR, "processed_data")
+STORE_DIR = os.path.join(DATA_DIR, "ingest_store")
+# The dashboard reads DATA_DIR; derived CSVs go next to it unless asked otherwise
+SHIPPED_DIR = DATA_DIR
+OUTPUT_DIR = os.path.join(CURRENT_DIR, "ingestion_out")
+
+# StatsBomb event type -> counted column
+EVENT_COUNTS = {
+    "Pass": "pass_total",
+    "Carry": "carry_total",
+    "Ball Recovery": "ball_recovery_total",
+    "Shot": "shot_total",
+}
+COUNT_COLUMNS = list(EVENT_COUNTS.values()) + ["under_pressure"]
+PER90_METRICS = ['pass_total', 'carry_total', 'ball_recovery_total', 'under_pressure', 'shot_total']
+MIN_MINUTES = 300
+
+LINEUP_COLUMNS = [
+    'match_id', 'team_id', 'team_name', 'player_id', 'player_name', 'player_nickname',
+    'jersey_number', 'country_id', 'country_name', 'cards', 'minutes_played', 'position_id',
+    'position', 'from', 'to', 'from_period', 'to_period', 'start_reason', 'end_reason',
+    'from_min', 'to_min',
+]
+
+
+def time_to_minutes(time_str):
+    if pd.isna(time_str):
+        return np.nan
+    minutes, seconds = map(int, time_str.split(':'))
+    return minutes + seconds / 60
+
+
+def load_matches(data_path, competitions):
+    """match_ids for a list of (competition_id, season_id) pairs."""
+    match_ids = []
+    for competition_id, season_id in competitions:
+        matches_file = Path(data_path) / "matches" / str(competition_id) / f"{season_id}.json"
+        if not matches_file.exists():
+            print(f"No match file found for competition {competition_id}, season {season_id}")
+            continue
+        with open(matches_file, encoding='utf-8') as fh:
+            match_ids.extend(m['match_id'] for m in json.load(fh))
+    return match_ids
+
+
+# ---- Per-match work (runs in a worker process) ----
+def _lineup_rows(match_id, lineup_json):
+    rows = []
+    for team in lineup_json:
+        for player in team['lineup']:
+            country = player.get('country') or {}
+            base = {
+                'match_id': match_id,
+                'team_id': team['team_id'],
+                'team_name': team['team_name'],
+                'player_id': player.get('player_id'),
+                'player_name': player.get('player_name'),
+                'player_nickname': player.get('player_nickname'),
+                'jersey_number': player.get('jersey_number'),
+                'country_id': country.get('id'),
+                'country_name': country.get('name'),
+                'cards': json.dumps(player.get('cards', [])),
+            }
+            # One row per position spell; unused substitutes keep a single empty row
+            for spell in player.get('positions') or [{}]:
+                row = dict(base)
+                row.update({
+                    'position_id': spell.get('position_id'),
+                    'position': spell.get('position'),
+                    'from': spell.get('from'),
+                    'to': spell.get('to'),
+                    'from_period': spell.get('from_period'),
+                    'to_period': spell.get('to_period'),
+                    'start_reason': spell.get('start_reason'),
+                    'end_reason': spell.get('end_reason'),
+                })
+                rows.append(row)
+
+    lineups = pd.DataFrame(rows)
+    lineups['from_min'] = lineups['from'].map(time_to_minutes)
+    lineups['to_min'] = lineups['to'].map(time_to_minutes)
+    lineups['minutes_played'] = lineups['to_min'] - lineups['from_min']
+    return lineups[LINEUP_COLUMNS]
+
+
+def ingest_match(data_path, match_id):
+    """Parse one match into (player partials, lineup spells)."""
+    data_path = Path(data_path)
+    with open(data_path / "events" / f"{match_id}.json", encoding='utf-8') as fh:
+        events = json.load(fh)
+    with open(data_path / "lineups" / f"{match_id}.json", encoding='utf-8') as fh:
+        lineups = _lineup_rows(match_id, json.load(fh))
+
+    counts = {}
+    event_names = {}
+    match_end = 0.0
+    for event in events:
+        match_end = max(match_end, event.get('minute', 0) + event.get('second', 0) / 60)
+        player = event.get('player')
+        if not player:
+            continue
+        event_names.setdefault(player['id'], player.get('name'))
+        player_counts = counts.setdefault(player['id'], dict.fromkeys(COUNT_COLUMNS, 0))
+        column = EVENT_COUNTS.get(event['type']['name'])
+        if column:
+            player_counts[column] += 1
+        if event.get('under_pressure'):
+            player_counts['under_pressure'] += 1
+
+    # Spells still open at the final whistle end at the last event. Stored in
+    # the lineups too, so the dashboard's position index counts the same minutes
+    has_spell = lineups['position'].notna()
+    lineups.loc[has_spell, 'minutes_played'] = spell_minutes(lineups[has_spell], match_end)
+    spells = lineups[has_spell]
+    minutes = spells['minutes_played'].groupby(spells['player_id']).sum()
+    # Players with events but no lineup row keep the name the events give them
+    names = lineups.drop_duplicates('player_id').set_index('player_id')['player_name']
+    names = names.dropna().combine_first(pd.Series(event_names, dtype=object))
+
+    partials = pd.DataFrame.from_dict(counts, orient='index', columns=COUNT_COLUMNS)
+    partials = partials.reindex(partials.index.union(minutes.index), fill_value=0)
+    partials.index.name = 'player_id'
+    partials = partials.reset_index()
+    partials.insert(0, 'match_id', match_id)
+    partials.insert(2, 'player_name', partials['player_id'].map(names))
+    partials.insert(3, 'minutes_played', partials['player_id'].map(minutes).fillna(0.0))
+    return partials, lineups
+
+
+def _ingest_job(args):
+    return ingest_match(*args)
+
+
+# ---- Store ----
+def ingested_matches(store_dir=STORE_DIR):
+    partial_dir = os.path.join(store_dir, "partials")
+    if not os.path.isdir(partial_dir):
+        return set()
+    return {int(name.split('.')[0]) for name in os.listdir(partial_dir) if name.endswith('.parquet')}
+
+
+def _write_match(store_dir, match_id, partials, lineups):
+    for kind, frame in (("lineups", lineups), ("partials", partials)):
+        os.makedirs(os.path.join(store_dir, kind), exist_ok=True)
+        path = os.path.join(store_dir, kind, f"{match_id}.parquet")
+        frame.to_parquet(path + ".tmp", index=False)
+        os.replace(path + ".tmp", path)
+
+
+def ingest(data_path, match_ids, store_dir=STORE_DIR, workers=None):
+    """Ingest every match not yet in the store; returns the newly ingested match_ids."""
+    done = ingested_matches(store_dir)
+    pending = [m for m in dict.fromkeys(match_ids) if m not in done]
+    ingested = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(_ingest_job, (str(data_path), m)): m for m in pending}
+        for future in as_completed(futures):
+            match_id = futures[future]
+            try:
+                partials, lineups = future.result()
+            except Exception as e:
+                print(f"Skipping match {match_id} due to error: {e}")
+                continue
+            # Partials are written last: their presence marks the match as ingested
+            _write_match(store_dir, match_id, partials, lineups)
+            ingested.append(match_id)
+    return ingested
+
+
+def _read_store(store_dir, kind):
+    kind_dir = os.path.join(store_dir, kind)
+    files = sorted(os.listdir(kind_dir)) if os.path.isdir(kind_dir) else []
+    frames = [pd.read_parquet(os.path.join(kind_dir, f)) for f in files if f.endswith('.parquet')]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+# ---- Derived CSVs ----
+def build_season_stats(partials, min_minutes=MIN_MINUTES):
+    unnamed = partials.loc[partials['player_name'].isna(), 'player_id'].unique()
+    if len(unnamed):
+        print(f"Dropping {len(unnamed)} players without a name: {sorted(unnamed)}")
+    season_stats = partials.groupby(['player_id', 'player_name'], as_index=False)[
+        ['minutes_played'] + COUNT_COLUMNS].sum()
+    for metric in PER90_METRICS:
+        season_stats[f'{metric}_per90'] = season_stats[metric] / season_stats['minutes_played'] * 90
+    season_stats = season_stats[season_stats['minutes_played'] >= min_minutes]
+    return season_stats.replace([np.inf, -np.inf], np.nan).fillna(0).reset_index(drop=True)
+
+
+def write_outputs(store_dir=STORE_DIR, output_dir=OUTPUT_DIR, min_minutes=MIN_MINUTES, overwrite_shipped=False):
+    """Derive season_stats_clean.csv and lineups_clean.csv from the stored partials.
+
+    Raises ValueError, without writing, if `output_dir` is the dashboard's
+    processed_data/ and `overwrite_shipped` is not set: the derived files
+    have a different schema from the shipped ones (see the module docstring).
+    """
+    if os.path.abspath(output_dir) == os.path.abspath(SHIPPED_DIR) and not overwrite_shipped:
+        raise ValueError(f"not overwriting the dashboard's CSVs in {SHIPPED_DIR}; "
+                         "pass overwrite_shipped=True (--overwrite-shipped) to replace them")
+    partials = _read_store(store_dir, "partials")
+    if partials.empty:
+        raise ValueError(f"No ingested matches in {store_dir}")
+    season_stats = build_season_stats(partials, min_minutes)
+    lineups = _read_store(store_dir, "lineups")
+    os.makedirs(output_dir, exist_ok=True)
+    season_stats.to_csv(os.path.join(output_dir, "season_stats_clean.csv"), index=False)
+    lineups.to_csv(os.path.join(output_dir, "lineups_clean.csv"), index=False)
+    return season_stats, lineups
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data-path", default="open-data/data", help="StatsBomb open-data 'data' directory")
+    parser.add_argument("--competition", nargs=2, type=int, action="append", required=True,
+                        metavar=("COMPETITION_ID", "SEASON_ID"))
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--store-dir", default=STORE_DIR)
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    parser.add_argument("--overwrite-shipped", action="store_true",
+                        help=f"allow --output-dir {SHIPPED_DIR} (replaces the CSVs the dashboard reads)")
+    parser.add_argument("--min-minutes", type=int, default=MIN_MINUTES)
+    args = parser.parse_args()
+
+    match_ids = load_matches(args.data_path, args.competition)
+    new = ingest(args.data_path, match_ids, args.store_dir, args.workers)
+    print(f"Ingested {len(new)} new matches ({len(match_ids) - len(new)} already in store or skipped)")
+    try:
+        season_stats, lineups = write_outputs(args.store_dir, args.output_dir, args.min_minutes,
+                                              args.overwrite_shipped)
+    except ValueError as e:
+        raise SystemExit(f"❌ {e}")
+    print(f"✅ Wrote {len(season_stats)} players and {len(lineups)} lineup rows to {args.output_dir}")
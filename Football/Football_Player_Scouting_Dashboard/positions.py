@@ -0,0 +1,74 @@
+"""Position -> player inverted index for the dashboard's position filter.
+
+Built once from the lineups table. Each exact StatsBomb position and each
+position group ("All Midfielders", ...) maps to the players who played
+there, weighted by minutes in that position. Filtering is an exact key
+lookup: "Center Back" no longer matches "Left Center Back", and
+"Left Wing" no longer matches "Left Wing Back".
+"""
+
+import pandas as pd
+
+# Spells that run to the final whistle have no `to` time in the lineups; without
+# the match's events they are closed at regulation time
+REGULATION_MINUTES = 90
+
+POSITION_GROUPS = {
+    "All Goalkeepers": ["Goalkeeper"],
+    "All Defenders": [
+        "Right Back", "Right Center Back", "Center Back", "Left Center Back", "Left Back",
+        "Right Wing Back", "Left Wing Back",
+    ],
+    "All Midfielders": [
+        "Right Defensive Midfield", "Center Defensive Midfield", "Left Defensive Midfield",
+        "Right Midfield", "Right Center Midfield", "Center Midfield", "Left Center Midfield",
+        "Left Midfield", "Right Attacking Midfield", "Center Attacking Midfield",
+        "Left Attacking Midfield",
+    ],
+    "All Forwards": [
+        "Right Wing", "Left Wing", "Right Center Forward", "Center Forward",
+        "Left Center Forward", "Secondary Striker",
+    ],
+}
+
+
+def spell_minutes(lineups_df, match_end=REGULATION_MINUTES):
+    """Minutes of each lineup spell, closing open spells at the final whistle.
+
+    `match_end` is the final whistle in minutes: a scalar, or one value per
+    spell (ingestion.py passes each match's last event).
+    """
+    open_spell = (match_end - lineups_df['from_min']).clip(lower=0)
+    return lineups_df['minutes_played'].fillna(open_spell).fillna(0)
+
+
+def build_position_index(lineups_df, groups=POSITION_GROUPS):
+    """Map each position and position group to a player_id -> minutes Series."""
+    spells = pd.DataFrame({
+        'position': lineups_df['position'],
+        'player_id': lineups_df['player_id'],
+        'minutes': spell_minutes(lineups_df),
+    }).dropna(subset=['position'])
+
+    minutes = spells.groupby(['position', 'player_id'], sort=False)['minutes'].sum()
+    index = {position: minutes.xs(position).sort_values(ascending=False)
+             for position in minutes.index.unique(level='position')}
+
+    for group, members in groups.items():
+        member_minutes = [index[p] for p in members if p in index]
+        if member_minutes:
+            index[group] = pd.concat(member_minutes).groupby(level=0).sum().sort_values(ascending=False)
+    return index
+
+
+def position_options(index, groups=POSITION_GROUPS):
+    """Selectbox options: groups first, then the exact positions seen in the data, sorted."""
+    return [g for g in groups if g in index] + sorted(p for p in index if p not in groups)
+
+
+def players_in_position(index, position, min_minutes=0):
+    """Set of player_ids who played at least `min_minutes` in `position`."""
+    minutes = index.get(position)
+    if minutes is None:
+        return set()
+    return set(minutes.index[minutes >= min_minutes])
@@ -0,0 +1,68 @@
+"""Nearest-neighbour index over scaled per-90 stats for the "similar players" views.
+
+The index (MinMaxScaler + KD-tree) is fitted once per position filter and
+dataset version and persisted with the other artifacts; a query is then a
+tree lookup instead of a rescale, full distance matrix and sort.
+"""
+
+import numpy as np
+import pandas as pd
+
+import artifacts
+
+# algorithm -> sklearn.neighbors class, resolved when an index is fitted
+TREES = {"kd_tree": "KDTree", "ball_tree": "BallTree"}
+
+
+def build_similarity_index(stats_df, stats_columns, algorithm="kd_tree"):
+    """Fit the scaler and neighbour tree for one (already position-filtered) table."""
+    # Imported here: loading a persisted index does not need the fitting code up front
+    from sklearn import neighbors
+    from sklearn.preprocessing import MinMaxScaler
+
+    stats_columns = list(stats_columns)
+    players = stats_df[['player_id', 'player_name'] + stats_columns].reset_index(drop=True)
+    scaler = MinMaxScaler().fit(players[stats_columns])
+    scaled = scaler.transform(players[stats_columns])
+    return {
+        'players': players,
+        'stats_columns': stats_columns,
+        'scaler': scaler,
+        'scaled': scaled,
+        'tree': getattr(neighbors, TREES[algorithm])(scaled),
+    }
+
+
+def load_or_build_index(stats_df, stats_columns, position, version, algorithm="kd_tree"):
+    """Persisted index for `position`; fitted on first use for this dataset version and player set."""
+    return artifacts.load_or_build(
+        "similarity", f"{position}-{algorithm}", version,
+        lambda: build_similarity_index(stats_df, stats_columns, algorithm),
+        stats_df['player_id'], stats_columns)
+
+
+def similar_players(index, player_names, top_n=5):
+    """Top-N players closest to any of `player_names` (a name or a list of names).
+
+    Each candidate is ranked by its distance to the nearest query player, and
+    the query players themselves are excluded.
+    """
+    if isinstance(player_names, str):
+        player_names = [player_names]
+    players = index['players']
+    stats_columns = index['stats_columns']
+
+    query_rows = np.flatnonzero(players['player_name'].isin(player_names))
+    if len(query_rows) == 0:
+        return pd.DataFrame(columns=['player_name'] + stats_columns + ['distance'])
+
+    # Each query's neighbour list may contain every query player, so ask for
+    # that many extra neighbours to still have top_n candidates left
+    k = min(top_n + len(query_rows), len(players))
+    distances, rows = index['tree'].query(index['scaled'][query_rows], k=k)
+    candidates = pd.DataFrame({'row': rows.ravel(), 'distance': distances.ravel()})
+    candidates = candidates[~candidates['row'].isin(query_rows)]
+    best = candidates.groupby('row')['distance'].min().nsmallest(top_n)
+
+    similar = players.iloc[best.index].assign(distance=best.to_numpy())
+    return similar[['player_name'] + stats_columns + ['distance']].reset_index(drop=True)
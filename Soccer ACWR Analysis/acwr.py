@@ -0,0 +1,358 @@
+"""Squad-wide ACWR (acute:chronic workload ratio) from wearable session data.
+
+Module version of the per-player loop in
+`Player_Workload_Analysis_in_Soccer_Using_ACWR.ipynb`. Every player's
+sessions are resampled to a continuous daily timeline and the acute and
+chronic loads are computed for the whole squad in one grouped pass.
+
+Two load models are supported:
+
+- ``"rolling"``: 7-day and 28-day rolling averages, as in the notebook.
+- ``"ewma"``: exponentially weighted moving averages with
+  ``lambda = 2 / (N + 1)`` (N = 7 and 28 days), which weight recent days more
+  and have no hard window edge.
+
+New days can also be folded into a persisted per-player state (the last
+28 daily loads, or the two EWMA accumulators), so a day's sessions update
+every player's ACWR without recomputing the season:
+
+    python "Soccer ACWR Analysis/acwr.py" Soccer.csv --exclude 98 62 --model ewma
+    python "Soccer ACWR Analysis/acwr.py" today.csv --state acwr_state.pkl
+
+Raw exports are streamed with `read_sessions()`: only the columns ACWR needs
+are read, chunk by chunk, and each chunk is reduced to per-player daily rows
+before the next one is read.
+"""
+
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+
+PLAYER = 'Player.Name'
+LOAD = 'Total.Player.Load'
+SESSION_PERIOD = "Session"
+META_COLUMNS = ['Player.Name', 'Position.Name', 'Period.Name']
+
+# Per-day aggregation of a player's sessions (missing days become 0)
+DAILY_AGG = {
+    'Total.Player.Load': 'sum',
+    'Player.Load.Per.Minute': 'mean',
+    'Session.Duration': 'sum',
+    'Maximum.Heart.Rate': 'max',
+    'Minimum.Heart.Rate': 'min',
+    'Avg.Heart.Rate': 'mean'
+}
+
+# Columns read from raw exports; everything else (GPS channels, drill names, ...) is skipped
+READ_COLUMNS = ['Player.Name', 'Period.Name', 'Position.Name', 'Date', 'Total.Player.Load',
+                'Player.Load.Per.Minute', 'Maximum.Heart.Rate', 'Minimum.Heart.Rate', 'Avg.Heart.Rate']
+READ_DTYPES = {
+    'Period.Name': 'string',
+    'Position.Name': 'string',
+    'Date': 'string',
+    'Total.Player.Load': 'float64',
+    'Player.Load.Per.Minute': 'float64',
+    'Maximum.Heart.Rate': 'float64',
+    'Minimum.Heart.Rate': 'float64',
+    'Avg.Heart.Rate': 'float64',
+}
+# Rows per chunk; with READ_COLUMNS this keeps a chunk to a few tens of MB
+CHUNK_ROWS = 200_000
+
+ACUTE_DAYS = 7
+CHRONIC_DAYS = 28
+MODELS = ("rolling", "ewma")
+
+# ACWR above OVER_TRAINING is "Over training", at or below UNDER_TRAINING "Under training"
+OVER_TRAINING = 1.5
+UNDER_TRAINING = 0.3
+
+
+def session_rows(df, exclude=()):
+    """Keep "Session" rows, parse dates and derive Session.Duration (minutes)."""
+    sessions = df.loc[df['Period.Name'] == SESSION_PERIOD].copy()
+    sessions['Date'] = pd.to_datetime(sessions['Date']).dt.normalize()
+    sessions['Session.Duration'] = sessions['Total.Player.Load'] / sessions['Player.Load.Per.Minute']
+    if len(exclude):
+        sessions = sessions[~sessions[PLAYER].isin(exclude)]
+    return sessions
+
+
+def _partial_aggs():
+    """Named aggregations for one chunk: means are carried as (sum, count) so chunks can be merged."""
+    aggs = {}
+    for column, how in DAILY_AGG.items():
+        if how == 'mean':
+            aggs[f'{column}:sum'] = (column, 'sum')
+            aggs[f'{column}:count'] = (column, 'count')
+        else:
+            aggs[column] = (column, how)
+    for column in ['Position.Name', 'Period.Name', 'row']:
+        aggs[column] = (column, 'last')
+    return aggs
+
+
+def read_sessions(path, exclude=(), chunksize=CHUNK_ROWS):
+    """Stream a raw export into one row per player per session day.
+
+    Equivalent to `session_rows(pd.read_csv(path))` followed by the daily
+    aggregation: the result can be passed to `daily_loads()`, `squad_acwr()`
+    or `update_state()`. Only one chunk plus the running per-day partials
+    are held in memory.
+    """
+    aggs = _partial_aggs()
+    merge = {name: ('sum' if how in ('sum', 'count') else how) for name, (_, how) in aggs.items()}
+    partials = None
+    reader = pd.read_csv(path, usecols=READ_COLUMNS, dtype=READ_DTYPES, chunksize=chunksize)
+    for chunk in reader:
+        chunk = session_rows(chunk, exclude).assign(row=lambda d: d.index)
+        if chunk.empty:
+            continue
+        chunk_partials = chunk.groupby([PLAYER, 'Date'], sort=False).agg(**aggs)
+        if partials is not None:
+            chunk_partials = pd.concat([partials, chunk_partials]).groupby(level=[0, 1], sort=False).agg(merge)
+        partials = chunk_partials
+
+    if partials is None:
+        return session_rows(pd.DataFrame(columns=READ_COLUMNS))
+
+    for column, how in DAILY_AGG.items():
+        if how == 'mean':
+            partials[column] = partials.pop(f'{column}:sum') / partials.pop(f'{column}:count')
+    # Keep file order of each day's last session, so "latest" metadata matches a full read
+    sessions = partials.sort_values('row').drop(columns='row').reset_index()
+    return sessions[READ_COLUMNS + ['Session.Duration']]
+
+
+def daily_loads(sessions):
+    """Daily per-player totals on a continuous timeline from each player's first to last session.
+
+    Indexed by (Player.Name, Date); players keep their order of first appearance.
+    """
+    daily = sessions.groupby([PLAYER, 'Date'])[list(DAILY_AGG)].agg(DAILY_AGG)
+
+    # Build every player's full date range at once instead of resampling per player
+    dates = pd.Series(daily.index.get_level_values('Date'))
+    bounds = dates.groupby(daily.index.get_level_values(PLAYER)).agg(['min', 'max'])
+    bounds = bounds.reindex(pd.unique(sessions[PLAYER]))
+    lengths = ((bounds['max'] - bounds['min']).dt.days + 1).to_numpy()
+    starts = np.cumsum(lengths) - lengths
+    offsets = np.arange(lengths.sum()) - np.repeat(starts, lengths)
+    full_index = pd.MultiIndex.from_arrays(
+        [np.repeat(bounds.index.to_numpy(), lengths),
+         np.repeat(bounds['min'].to_numpy(), lengths) + offsets.astype('timedelta64[D]')],
+        names=[PLAYER, 'Date'])
+    return daily.reindex(full_index).fillna(0)
+
+
+def _smoothed_load(loads, days, model):
+    """Grouped rolling or EWMA average of a (Player.Name, Date)-indexed daily load Series."""
+    grouped = loads.groupby(level=PLAYER, sort=False)
+    if model == "rolling":
+        smoothed = grouped.rolling(days, min_periods=days).sum() / days
+    elif model == "ewma":
+        smoothed = grouped.ewm(span=days, adjust=False, min_periods=days).mean()
+    else:
+        raise ValueError(f"Unknown ACWR model {model!r}; expected one of {MODELS}")
+    return smoothed.droplevel(0)
+
+
+def risk_flags(acwr, over=OVER_TRAINING, under=UNDER_TRAINING):
+    """Risk flag per ACWR value; days without a ratio yet fall through to "Under training" as in the notebook."""
+    acwr = np.asarray(acwr, dtype=float)
+    return np.select([acwr > over, acwr > under], ['Over training', 'Optimum'], default='Under training')
+
+
+def add_acwr(daily, model="rolling", acute_days=ACUTE_DAYS, chronic_days=CHRONIC_DAYS):
+    """Add Acute_stats, Chronic_stats, ACWR and Risk_Flag columns to `daily_loads()` output."""
+    daily = daily.copy()
+    daily['Acute_stats'] = _smoothed_load(daily[LOAD], acute_days, model)
+    daily['Chronic_stats'] = _smoothed_load(daily[LOAD], chronic_days, model)
+    daily['ACWR'] = daily['Acute_stats'] / daily['Chronic_stats']
+    daily['Risk_Flag'] = risk_flags(daily['ACWR'])
+    return daily
+
+
+def squad_acwr(sessions, model="rolling", acute_days=ACUTE_DAYS, chronic_days=CHRONIC_DAYS):
+    """Player-wise ACWR summary for the whole squad.
+
+    Same layout as the notebook's `playerwise_acwr_summary.csv`: one row per
+    player per day, tagged with the player's latest position and period.
+    """
+    acwr = add_acwr(daily_loads(sessions), model, acute_days, chronic_days)
+    latest_meta = sessions.groupby(PLAYER, sort=False)[META_COLUMNS[1:]].last()
+    acwr = acwr.join(latest_meta, on=PLAYER)
+    return acwr.reset_index(level=PLAYER).reset_index()[
+        ['Date'] + list(DAILY_AGG) + ['Acute_stats', 'Chronic_stats', 'ACWR', 'Risk_Flag'] + META_COLUMNS]
+
+
+def latest_flags(acwr):
+    """Most recent ACWR and risk flag per player from `squad_acwr()` output."""
+    latest = acwr.loc[acwr.groupby(PLAYER, sort=False)['Date'].idxmax()]
+    return latest[[PLAYER, 'Position.Name', 'Date', 'ACWR', 'Risk_Flag']].reset_index(drop=True)
+
+
+# ---- Incremental updates ----
+def empty_state(model="rolling", acute_days=ACUTE_DAYS, chronic_days=CHRONIC_DAYS):
+    """State with no players yet; fill it with `update_state()`."""
+    if model not in MODELS:
+        raise ValueError(f"Unknown ACWR model {model!r}; expected one of {MODELS}")
+    players = pd.DataFrame({
+        'Position.Name': pd.Series(dtype=object),
+        'Period.Name': pd.Series(dtype=object),
+        'Date': pd.Series(dtype='datetime64[ns]'),
+        'days': pd.Series(dtype='int64'),
+        'acute_ewma': pd.Series(dtype=float),
+        'chronic_ewma': pd.Series(dtype=float),
+        'Acute_stats': pd.Series(dtype=float),
+        'Chronic_stats': pd.Series(dtype=float),
+        'ACWR': pd.Series(dtype=float),
+        'Risk_Flag': pd.Series(dtype=object),
+    }, index=pd.Index([], name=PLAYER))
+    return {
+        'model': model,
+        'acute_days': acute_days,
+        'chronic_days': chronic_days,
+        'players': players,
+        # Rolling model: each player's last `chronic_days` daily loads, most recent last
+        'window': np.zeros((0, chronic_days if model == "rolling" else 0)),
+    }
+
+
+def _ewma_step(previous, load, gap, seen, span):
+    """EWMA after `gap - 1` zero-load rest days and today's load (seeded with the first load)."""
+    alpha = 2 / (span + 1)
+    decayed = previous * (1 - alpha) ** (gap - 1)
+    return np.where(seen == 0, load, alpha * load + (1 - alpha) * decayed)
+
+
+def _advance_day(state, date, day):
+    """Fold one date's per-player load and metadata into `state`; O(players) work."""
+    players = state['players']
+    new_players = day.index.difference(players.index, sort=False)
+    if len(new_players):
+        # A new player's timeline starts today: zero history, "last seen" yesterday
+        added = pd.DataFrame({'Date': date - pd.Timedelta(days=1), 'days': 0}, index=new_players)
+        players = pd.concat([players, added])
+        state['window'] = np.vstack([state['window'], np.zeros((len(new_players), state['window'].shape[1]))])
+
+    pos = players.index.get_indexer(day.index)
+    gap = (date - pd.DatetimeIndex(players['Date'].iloc[pos])).days.to_numpy()
+    if (gap < 1).any():
+        stale = list(day.index[gap < 1])
+        raise ValueError(f"Sessions on {date:%Y-%m-%d} are not newer than the stored state for players "
+                         f"{stale}; recompute the season with squad_acwr()")
+
+    seen = players['days'].to_numpy()[pos]
+    days = seen + gap
+    load = day[LOAD].to_numpy(dtype=float)
+    acute_days, chronic_days = state['acute_days'], state['chronic_days']
+
+    if state['model'] == "rolling":
+        # Shift each player's window left by their gap (rest days are zero load), then append today
+        window = state['window'][pos]
+        shifted_index = np.arange(chronic_days) + gap[:, None]
+        window = np.where(shifted_index < chronic_days,
+                          np.take_along_axis(window, np.minimum(shifted_index, chronic_days - 1), axis=1), 0.0)
+        window[:, -1] = load
+        state['window'][pos] = window
+        acute = window[:, -acute_days:].sum(axis=1) / acute_days
+        chronic = window.sum(axis=1) / chronic_days
+    else:
+        acute = _ewma_step(players['acute_ewma'].to_numpy()[pos], load, gap, seen, acute_days)
+        chronic = _ewma_step(players['chronic_ewma'].to_numpy()[pos], load, gap, seen, chronic_days)
+        players.loc[day.index, 'acute_ewma'] = acute
+        players.loc[day.index, 'chronic_ewma'] = chronic
+
+    acute = np.where(days >= acute_days, acute, np.nan)
+    chronic = np.where(days >= chronic_days, chronic, np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = acute / chronic
+
+    players.loc[day.index, 'Date'] = date
+    players.loc[day.index, 'days'] = days
+    players.loc[day.index, META_COLUMNS[1:]] = day[META_COLUMNS[1:]].to_numpy()
+    players.loc[day.index, 'Acute_stats'] = acute
+    players.loc[day.index, 'Chronic_stats'] = chronic
+    players.loc[day.index, 'ACWR'] = ratio
+    players.loc[day.index, 'Risk_Flag'] = risk_flags(ratio)
+    state['players'] = players
+
+    return pd.DataFrame({
+        'Date': date,
+        PLAYER: day.index,
+        LOAD: load,
+        'Acute_stats': acute,
+        'Chronic_stats': chronic,
+        'ACWR': ratio,
+        'Risk_Flag': risk_flags(ratio),
+        'Position.Name': day['Position.Name'].to_numpy(),
+    })
+
+
+def update_state(state, sessions):
+    """Fold new sessions (output of `session_rows()`) into `state`, one day at a time.
+
+    Every date must be later than each player's last stored date. Updates
+    `state` in place and returns one row per player per new session day with
+    the updated loads, ACWR and risk flag.
+    """
+    days = sessions.groupby(['Date', PLAYER], sort=True).agg(
+        {LOAD: 'sum', 'Position.Name': 'last', 'Period.Name': 'last'})
+    updates = [_advance_day(state, date, day.droplevel('Date'))
+               for date, day in days.groupby(level='Date', sort=True)]
+    if not updates:
+        return pd.DataFrame(columns=['Date', PLAYER, LOAD, 'Acute_stats', 'Chronic_stats', 'ACWR',
+                                     'Risk_Flag', 'Position.Name'])
+    return pd.concat(updates, ignore_index=True)
+
+
+def current_flags(state):
+    """Latest ACWR and risk flag per player held in `state`."""
+    players = state['players'].reset_index()
+    return players[[PLAYER, 'Position.Name', 'Date', 'Acute_stats', 'Chronic_stats', 'ACWR', 'Risk_Flag']]
+
+
+def save_state(state, path):
+    with open(path + ".tmp", "wb") as fh:
+        pickle.dump(state, fh, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(path + ".tmp", path)
+
+
+def load_state(path, model="rolling", acute_days=ACUTE_DAYS, chronic_days=CHRONIC_DAYS):
+    """Stored state at `path`, or an empty one for `model` if the file does not exist yet."""
+    if not os.path.exists(path):
+        return empty_state(model, acute_days, chronic_days)
+    with open(path, "rb") as fh:
+        return pickle.load(fh)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("csv", help="Raw wearable export, e.g. Soccer.csv")
+    parser.add_argument("--model", choices=MODELS, default="rolling")
+    parser.add_argument("--exclude", nargs="*", type=int, default=[],
+                        help="Player.Name values to drop (e.g. players with too few sessions)")
+    parser.add_argument("--output", "-o", default="playerwise_acwr_summary.csv")
+    parser.add_argument("--state", default=None,
+                        help="Fold the CSV's new days into this state file instead of recomputing the season")
+    parser.add_argument("--chunksize", type=int, default=CHUNK_ROWS, help="Rows read per chunk")
+    args = parser.parse_args()
+
+    sessions = read_sessions(args.csv, exclude=args.exclude, chunksize=args.chunksize)
+    if args.state:
+        state = load_state(args.state, model=args.model)
+        updates = update_state(state, sessions)
+        save_state(state, args.state)
+        print(f"✅ Folded {updates['Date'].nunique()} day(s) into {args.state} ({state['model']} model)")
+        print(current_flags(state).to_string(index=False))
+        raise SystemExit
+
+    summary = squad_acwr(sessions, model=args.model)
+    summary.to_csv(args.output, index=False)
+    print(f"✅ Wrote {len(summary)} player-days for {summary[PLAYER].nunique()} players to {args.output}")
+    print(latest_flags(summary)['Risk_Flag'].value_counts().to_string())
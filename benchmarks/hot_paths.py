@@ -0,0 +1,372 @@
+"""Benchmarks for the aggregation hot paths, on bundled and synthetically scaled data.
+
+Each benchmark runs one hot path at several data scales and records:
+
+- seconds:      best wall time over `--repeat` runs, after one warm-up run
+- peak_mb:      peak Python/NumPy allocation of one extra run (tracemalloc)
+- rows_per_sec: input rows / seconds
+
+Scale 1 is the bundled data. Larger scales add synthetic copies of it:
+extra IPL seasons (every delivery replayed in later seasons, new match ids)
+and extra football leagues (new player ids, jittered per-90 stats). The ACWR
+source (`Soccer.csv`) is not bundled, so its base is a generated 30-player,
+one-year squad and scaling adds squads.
+
+    python benchmarks/hot_paths.py                           # every benchmark, default scales
+    python benchmarks/hot_paths.py cap_cube acwr_rolling --scales 1 10 100
+    python benchmarks/hot_paths.py --json results.json --baseline baseline.json
+    python benchmarks/hot_paths.py --save-baseline baseline.json
+
+With `--baseline`, a benchmark slower than the baseline by more than
+`--tolerance` is reported as a regression and the exit status is 1.
+"""
+
+import atexit
+import gc
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_DIRS = [
+    "Cricket/IPL_Analysis",
+    "Cricket/Match_Insight_Generator",
+    "Football/Football_Player_Scouting_Dashboard",
+    "Soccer ACWR Analysis",
+]
+for _project in PROJECT_DIRS:
+    sys.path.insert(0, os.path.join(REPO_ROOT, _project))
+# ... and the root, for the `Cricket` package
+sys.path.insert(0, REPO_ROOT)
+
+import acwr  # noqa: E402
+import clustering  # noqa: E402
+from Cricket import cricket_data  # noqa: E402
+import leaderboards  # noqa: E402
+import match_insights  # noqa: E402
+import similarity  # noqa: E402
+import win_probability  # noqa: E402
+from ipl_store import ensure_store, read_deliveries  # noqa: E402
+
+SEED = 42
+REPEAT = 3
+# Slower than baseline by more than this fraction counts as a regression
+TOLERANCE = 0.20
+# Single-match insight calls timed per run
+INSIGHT_MATCHES = 20
+SIMILARITY_QUERIES = 100
+FOOTBALL_STATS = clustering.CLUSTER_STATS
+ACWR_PLAYERS = 30
+ACWR_DAYS = 365
+
+
+# ---- Data (built once per scale, outside the timed region) ----
+@lru_cache(maxsize=None)
+def ipl_deliveries(scale):
+    """Store deliveries, plus `scale - 1` copies replayed as later seasons."""
+    base = read_deliveries(store_dir=ensure_store())
+    seasons = int(base['season'].max() - base['season'].min() + 1)
+    match_offset = int(base['match_id'].max()) + 1
+    copies = []
+    for k in range(scale):
+        copy = base.copy()
+        copy['season'] = (copy['season'] + k * seasons).astype(base['season'].dtype)
+        copy['match_id'] = copy['match_id'] + k * match_offset
+        copies.append(copy)
+    return pd.concat(copies, ignore_index=True)
+
+
+@lru_cache(maxsize=None)
+def mig_deliveries(scale):
+    """`ipl_deliveries()` in the Match Insight Generator's ball-by-ball schema."""
+    d = ipl_deliveries(scale)
+    runs = d['batsman_runs']
+    return pd.DataFrame({
+        'match_id': d['match_id'],
+        'season': d['season'],
+        'date': d['date'].dt.strftime('%Y-%m-%d'),
+        'batting_team': d['batting_team'].astype(str),
+        'bowling_team': d['bowling_team'].astype(str),
+        'over': d['over'] + 1,
+        'striker': d['striker'].astype(str),
+        'bowler': d['bowler'].astype(str),
+        'runs_of_bat': runs,
+        'legal_ball': (~d['extras_type'].isin(['wide', 'noballs', 'noball'])).astype('int8'),
+        'dot_ball': d['is_dot_ball'].astype('int8'),
+        'boundary': d['is_boundary'].astype('int8'),
+        'player_dismissed': d['player_dismissed'],
+    })
+
+
+@lru_cache(maxsize=None)
+def mig_csv(scale):
+    """`mig_deliveries()` written to a temporary CSV (removed at exit)."""
+    path = os.path.join(_tmp_dir(), f"ipl_ball_by_ball-x{scale}.csv")
+    mig_deliveries(scale).to_csv(path, index=False)
+    return path
+
+
+@lru_cache(maxsize=None)
+def mig_frames(scale):
+    """load_and_clean_data() output and match index for `mig_csv(scale)`."""
+    frames = match_insights.load_and_clean_data(mig_csv(scale))
+    return frames, match_insights.build_match_index(frames[0])
+
+
+@lru_cache(maxsize=None)
+def football_stats(scale):
+    """Bundled season stats plus `scale - 1` synthetic leagues of the same players."""
+    path = os.path.join(REPO_ROOT, "Football/Football_Player_Scouting_Dashboard/processed_data",
+                        "season_stats_clean.csv")
+    base = pd.read_csv(path)[['player_id', 'player_name'] + FOOTBALL_STATS].dropna(subset=['player_id'])
+    rng = np.random.default_rng(SEED)
+    id_offset = int(base['player_id'].max()) + 1
+    leagues = [base]
+    for k in range(1, scale):
+        league = base.copy()
+        league['player_id'] = league['player_id'] + k * id_offset
+        league['player_name'] = league['player_name'] + f" (L{k})"
+        league[FOOTBALL_STATS] = league[FOOTBALL_STATS] * rng.uniform(0.8, 1.2, size=(len(base), len(FOOTBALL_STATS)))
+        leagues.append(league)
+    return pd.concat(leagues, ignore_index=True)
+
+
+@lru_cache(maxsize=None)
+def acwr_sessions(scale):
+    """A generated raw export (five sessions a week per player) run through `session_rows()`."""
+    rng = np.random.default_rng(SEED)
+    players = ACWR_PLAYERS * scale
+    dates = pd.date_range("2024-01-01", periods=ACWR_DAYS, freq="D")
+    dates = dates[dates.dayofweek < 5]
+    n = players * len(dates)
+    load_per_minute = rng.uniform(5, 10, n)
+    max_hr = rng.uniform(170, 200, n)
+    raw = pd.DataFrame({
+        'Player.Name': np.repeat(np.arange(players), len(dates)),
+        'Period.Name': acwr.SESSION_PERIOD,
+        'Position.Name': np.repeat(rng.choice(['Defender', 'Midfielder', 'Forward'], players), len(dates)),
+        'Date': np.tile(dates.strftime('%Y-%m-%d'), players),
+        'Total.Player.Load': load_per_minute * rng.uniform(45, 100, n),
+        'Player.Load.Per.Minute': load_per_minute,
+        'Maximum.Heart.Rate': max_hr,
+        'Minimum.Heart.Rate': max_hr - rng.uniform(80, 110, n),
+        'Avg.Heart.Rate': max_hr - rng.uniform(30, 50, n),
+    })
+    return acwr.session_rows(raw)
+
+
+@lru_cache(maxsize=None)
+def _tmp_dir():
+    path = tempfile.mkdtemp(prefix="hot_paths-")
+    atexit.register(shutil.rmtree, path, ignore_errors=True)
+    return path
+
+
+# ---- Benchmarks: name -> (setup(scale) -> (callable, input rows), default scales) ----
+def _load_and_clean_data(scale):
+    path = mig_csv(scale)
+    return lambda: match_insights.load_and_clean_data(path), len(mig_deliveries(scale))
+
+
+def _generate_insights(scale):
+    (df, batting, bowling), index = mig_frames(scale)
+    match_ids = list(index['rows'])[-INSIGHT_MATCHES:]
+    rows = sum(stop - start for start, stop in (index['rows'][m] for m in match_ids))
+
+    def run():
+        for match_id in match_ids:
+            match_insights.generate_insights(df, batting, bowling, match_id, match_index=index)
+    return run, rows
+
+
+def _batch_insights(scale):
+    (df, batting, bowling), index = mig_frames(scale)
+    match_ids = list(index['rows'])
+    return (lambda: match_insights.generate_batch_insights(df, batting, bowling, match_ids=match_ids,
+                                                           match_index=index)), len(df)
+
+
+def _cap_cube(scale):
+    deliveries = ipl_deliveries(scale)
+    seasons = deliveries['season'].unique()
+
+    def run():
+        for kind, sort_by in (("batting", "runs"), ("bowling", "wickets")):
+            cube = leaderboards.build_cube(kind, deliveries)
+            for season in seasons:
+                leaderboards.top_n(cube, kind, season, sort_by)
+    return run, len(deliveries)
+
+
+def _win_probability(scale):
+    deliveries = ipl_deliveries(scale)
+    table = win_probability.build_table(*win_probability.count_outcomes(deliveries))
+    return lambda: win_probability.score_deliveries(deliveries, table), len(deliveries)
+
+
+def _shared_view(scale):
+    # The shared frame is loaded once, outside the timed region; the views themselves copy nothing
+    rows = len(cricket_data.deliveries(["match_id"]))
+    cricket_data.match_insights_view()
+    return lambda: match_insights.clean_data(cricket_data.match_insights_view()), rows
+
+
+def _similar_players(scale):
+    stats = football_stats(scale)
+    queries = stats['player_name'].iloc[::max(1, len(stats) // SIMILARITY_QUERIES)].tolist()
+
+    def run():
+        index = similarity.build_similarity_index(stats, FOOTBALL_STATS)
+        for name in queries:
+            similarity.similar_players(index, name, top_n=5)
+    return run, len(stats)
+
+
+def _kmeans(scale):
+    stats = football_stats(scale)
+
+    def run():
+        model = clustering.fit_clusters(stats, FOOTBALL_STATS)
+        clustering.assign_clusters(model, stats)
+    return run, len(stats)
+
+
+def _acwr_rolling(scale):
+    sessions = acwr_sessions(scale)
+    return lambda: acwr.squad_acwr(sessions, model="rolling"), len(sessions)
+
+
+BENCHMARKS = {
+    "load_and_clean_data": (_load_and_clean_data, (1, 10)),
+    "generate_insights": (_generate_insights, (1, 10)),
+    # One grouped pass over every match; ~10 s at 1x, so larger scales are opt-in
+    "batch_insights": (_batch_insights, (1,)),
+    "cap_cube": (_cap_cube, (1, 10)),
+    "win_probability": (_win_probability, (1, 10)),
+    # The real store only: the process-wide frame is not scaled synthetically
+    "shared_view": (_shared_view, (1,)),
+    "similar_players": (_similar_players, (1, 10, 100)),
+    "kmeans": (_kmeans, (1, 10, 100)),
+    "acwr_rolling": (_acwr_rolling, (1, 10, 100)),
+}
+
+
+# ---- Measurement ----
+def measure(fn, repeat=REPEAT):
+    """(best wall seconds over `repeat` runs, peak MB of one traced run)."""
+    # Warm-up: lazy imports and first-call setup stay out of both numbers
+    fn()
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+
+    # Separate run: tracing allocations slows the code down
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return min(times), peak / 1e6
+
+
+def run(names, scales=None, repeat=REPEAT):
+    """Result rows for every (benchmark, scale)."""
+    results = []
+    for name in names:
+        setup, default_scales = BENCHMARKS[name]
+        for scale in scales or default_scales:
+            fn, rows = setup(scale)
+            seconds, peak_mb = measure(fn, repeat)
+            results.append({"name": name, "scale": scale, "rows": rows, "seconds": seconds,
+                            "peak_mb": peak_mb, "rows_per_sec": rows / seconds})
+            print(f"{name:<22}{scale:>5}x{rows:>12,}{seconds:>10.3f}s{peak_mb:>10.1f} MB"
+                  f"{rows / seconds:>14,.0f} rows/s", flush=True)
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "machine": platform.platform(),
+            "cpus": os.cpu_count(),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(report, baseline, tolerance=TOLERANCE):
+    """Results slower than the baseline entry for the same (name, scale) by more than `tolerance`."""
+    previous = {(r["name"], r["scale"]): r for r in baseline["results"]}
+    regressions = []
+    for result in report["results"]:
+        before = previous.get((result["name"], result["scale"]))
+        if before is None:
+            continue
+        ratio = result["seconds"] / before["seconds"]
+        result["baseline_seconds"] = before["seconds"]
+        result["ratio"] = ratio
+        if ratio > 1 + tolerance:
+            regressions.append(result)
+    return regressions
+
+
+def print_comparison(report, regressions):
+    print(f"\n{'benchmark':<22}{'scale':>6}{'baseline':>11}{'now':>10}{'ratio':>8}")
+    for r in report["results"]:
+        if "ratio" not in r:
+            continue
+        flag = "  REGRESSION" if r in regressions else ""
+        print(f"{r['name']:<22}{r['scale']:>5}x{r['baseline_seconds']:>10.3f}s{r['seconds']:>9.3f}s"
+              f"{r['ratio']:>8.2f}{flag}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("benchmarks", nargs="*", help=f"Benchmarks to run (default: all of {', '.join(BENCHMARKS)})")
+    parser.add_argument("--scales", nargs="+", type=int, default=None,
+                        help="Data scales to run (default: per benchmark, up to 100x)")
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--json", help="Write the results to this file")
+    parser.add_argument("--baseline", help="Compare against results saved earlier with --json/--save-baseline")
+    parser.add_argument("--save-baseline", help="Write the results to this file as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help="Allowed slowdown vs the baseline, as a fraction (default: %(default)s)")
+    args = parser.parse_args()
+
+    unknown = set(args.benchmarks) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(sorted(unknown))}")
+
+    print(f"{'benchmark':<22}{'scale':>6}{'rows':>12}{'time':>11}{'peak':>13}{'throughput':>21}")
+    report = run(args.benchmarks or list(BENCHMARKS), args.scales, args.repeat)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as fh:
+            regressions = compare(report, json.load(fh), args.tolerance)
+        print_comparison(report, regressions)
+    for path in (args.json, args.save_baseline):
+        if path:
+            with open(path, "w") as fh:
+                json.dump(report, fh, indent=2)
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) slower than the baseline by more than {args.tolerance:.0%}")
+        raise SystemExit(1)
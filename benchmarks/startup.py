@@ -0,0 +1,116 @@
+"""Cold-start and first-paint timing for the repo's Streamlit apps.
+
+Each app is run headless through Streamlit's `AppTest`. Every repeat uses a
+fresh interpreter, so no module, `st.cache_*` entry or OS-level import cache
+is shared with an earlier repeat. Per app the harness records:
+
+- cold_start:  process launch -> end of the first script run (what a new
+               server process costs before the first page is on screen)
+- imports:     interpreter + Streamlit import, before the app script runs
+- first_paint: the first script run itself (app imports, data loads, render)
+- rerun:       a second run of the same page with warm caches
+- heavy:       heavyweight modules imported by the first page (sklearn, plotly.express, ...)
+
+Run from anywhere; apps are executed with the repo root as working directory:
+
+    python benchmarks/startup.py                   # all apps, 3 repeats, median
+    python benchmarks/startup.py ipl --repeat 5 --json startup.json
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APPS = {
+    "ipl": "Cricket/IPL_Analysis/app.py",
+    "match_insights": "Cricket/Match_Insight_Generator/app.py",
+    "football": "Football/Football_Player_Scouting_Dashboard/app.py",
+}
+HEAVY_MODULES = ["plotly.express", "sklearn", "sklearn.cluster", "sklearn.neighbors", "scipy", "joblib",
+                 "matplotlib", "pyarrow"]
+APP_TIMEOUT = 300
+
+
+def _child(app):
+    """Runs inside the fresh interpreter: time the first and second script runs."""
+    import_start = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    imports = time.perf_counter() - import_start
+
+    at = AppTest.from_file(os.path.join(REPO_ROOT, APPS[app]), default_timeout=APP_TIMEOUT)
+    start = time.perf_counter()
+    at.run()
+    first_paint = time.perf_counter() - start
+    heavy = [m for m in HEAVY_MODULES if m in sys.modules]
+
+    start = time.perf_counter()
+    at.run()
+    rerun = time.perf_counter() - start
+
+    errors = [str(e.value) for e in at.exception]
+    print(json.dumps({"imports": imports, "first_paint": first_paint, "rerun": rerun,
+                      "heavy": heavy, "errors": errors}))
+
+
+def measure(app):
+    """One cold run of `app` in a new interpreter."""
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", app],
+                          cwd=REPO_ROOT, capture_output=True, text=True, timeout=APP_TIMEOUT)
+    cold_start = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(f"{app} failed:\n{proc.stderr[-2000:]}")
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["cold_start"] = cold_start
+    # Interpreter start-up is the part of cold_start not covered by the in-process timers
+    result["imports"] += cold_start - result["imports"] - result["first_paint"] - result["rerun"]
+    return result
+
+
+def run(apps, repeat=3):
+    """Median timings per app over `repeat` cold runs."""
+    report = {}
+    for app in apps:
+        runs = [measure(app) for _ in range(repeat)]
+        report[app] = {key: statistics.median(r[key] for r in runs)
+                       for key in ("cold_start", "imports", "first_paint", "rerun")}
+        report[app]["heavy"] = runs[-1]["heavy"]
+        report[app]["errors"] = runs[-1]["errors"]
+    return report
+
+
+def print_report(report):
+    print(f"{'app':<16}{'cold_start':>12}{'imports':>10}{'first_paint':>13}{'rerun':>9}  heavy modules")
+    for app, r in report.items():
+        print(f"{app:<16}{r['cold_start']:>11.2f}s{r['imports']:>9.2f}s{r['first_paint']:>12.2f}s"
+              f"{r['rerun']:>8.2f}s  {', '.join(r['heavy']) or '-'}")
+        for error in r["errors"]:
+            print(f"    ! {error}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("apps", nargs="*", help=f"Apps to time (default: all of {', '.join(APPS)})")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="Also write the timings to this file")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(args.child)
+        raise SystemExit
+
+    unknown = set(args.apps) - set(APPS)
+    if unknown:
+        parser.error(f"unknown app(s): {', '.join(sorted(unknown))}")
+    report = run(args.apps or list(APPS), args.repeat)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(report, fh, indent=2)
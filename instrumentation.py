@@ -0,0 +1,206 @@
+"""Opt-in per-stage timing and memory instrumentation for the Streamlit dashboards.
+
+Off by default; every hook below is then a no-op that returns the function
+(or a null context) unchanged. Enable it with environment variables:
+
+    DASHBOARD_PROFILE=1         record stages to the log file
+    DASHBOARD_PROFILE_PANEL=1   also show the current rerun's stages in the sidebar
+    DASHBOARD_PROFILE_LOG=path  log file (default: dashboard_profile.jsonl in the working directory)
+
+    DASHBOARD_PROFILE=1 streamlit run Cricket/IPL_Analysis/app.py
+
+Each stage is one JSON line: app, rerun id, stage name, nesting depth,
+wall seconds, input/output rows and resident memory (plus its change over
+the stage). Stages come from three hooks:
+
+- `@traced()` on app loaders and builders (put it above `@st.cache_*`, so
+  cache hits are recorded too)
+- `instrument(module, *names)` for library functions such as
+  `match_insights.load_and_clean_data`
+- `with stage("name"):` around inline blocks, e.g. a Plotly render
+"""
+
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager, nullcontext
+
+PANEL = os.environ.get("DASHBOARD_PROFILE_PANEL", "") not in ("", "0")
+ENABLED = PANEL or os.environ.get("DASHBOARD_PROFILE", "") not in ("", "0")
+LOG_PATH = os.environ.get("DASHBOARD_PROFILE_LOG", "dashboard_profile.jsonl")
+
+# Streamlit runs each session's script in its own thread
+_local = threading.local()
+_log_lock = threading.Lock()
+
+
+# ---- Measurements ----
+def _rss_mb():
+    """Resident set size of this process in MB (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # ru_maxrss is KB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1e6 if sys.platform == "darwin" else peak / 1e3
+
+
+def _rows(value):
+    """Row count of a frame, array, figure (plotted points) or the first such item of a tuple."""
+    if hasattr(value, "shape") and getattr(value, "ndim", 0) >= 1:
+        return int(value.shape[0])
+    if hasattr(value, "to_plotly_json"):
+        return sum(len(_trace_values(trace)) for trace in value.data)
+    if isinstance(value, (tuple, list)):
+        for item in value:
+            rows = _rows(item)
+            if rows is not None:
+                return rows
+    return None
+
+
+def _trace_values(trace):
+    for attr in ("x", "r", "values"):
+        values = getattr(trace, attr, None)
+        if values is not None:
+            return values
+    return ()
+
+
+def _input_rows(args, kwargs):
+    for value in list(args) + list(kwargs.values()):
+        if hasattr(value, "shape") and getattr(value, "ndim", 0) >= 1:
+            return int(value.shape[0])
+    return None
+
+
+# ---- Run bookkeeping ----
+def start_run(app):
+    """Mark the start of a script run; call once at the top of the app."""
+    if not ENABLED:
+        return
+    _local.app = app
+    _local.run = uuid.uuid4().hex[:8]
+    _local.run_start = time.perf_counter()
+    _local.records = []
+    _local.depth = 0
+
+
+def run_records():
+    """Stages recorded so far in this thread's current run."""
+    return list(getattr(_local, "records", []))
+
+
+def _write(record):
+    line = json.dumps(record, default=str)
+    with _log_lock, open(LOG_PATH, "a") as fh:
+        fh.write(line + "\n")
+
+
+@contextmanager
+def _measure(name, rows_in=None, rows=None):
+    depth = getattr(_local, "depth", 0)
+    _local.depth = depth + 1
+    rss_before = _rss_mb()
+    start = time.perf_counter()
+    outcome = {"rows_out": None, "result": None}
+    error = None
+    try:
+        yield outcome
+    except BaseException as e:
+        # Streamlit's st.stop()/rerun also arrive here; they are logged, not swallowed
+        error = type(e).__name__
+        raise
+    finally:
+        seconds = time.perf_counter() - start
+        rss_after = _rss_mb()
+        _local.depth = depth
+        rows_out = outcome["rows_out"]
+        if rows_out is None and outcome["result"] is not None:
+            rows_out = rows(outcome["result"]) if rows else _rows(outcome["result"])
+        record = {
+            "ts": time.time(),
+            "app": getattr(_local, "app", None),
+            "run": getattr(_local, "run", None),
+            "stage": name,
+            "depth": depth,
+            # Start of the stage, in seconds from the start of the run
+            "offset": round(start - getattr(_local, "run_start", start), 6),
+            "seconds": round(seconds, 6),
+            "rows_in": rows_in,
+            "rows_out": rows_out,
+            "rss_mb": None if rss_after is None else round(rss_after, 1),
+            "rss_delta_mb": None if rss_before is None else round(rss_after - rss_before, 1),
+        }
+        if error:
+            record["error"] = error
+        getattr(_local, "records", []).append(record)
+        _write(record)
+
+
+# ---- Hooks ----
+def traced(name=None, rows=None):
+    """Decorator recording each call as a stage; `rows(result)` overrides the output row count."""
+    def decorate(fn):
+        if not ENABLED or getattr(fn, "_traced", False):
+            return fn
+        stage_name = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with _measure(stage_name, _input_rows(args, kwargs), rows) as outcome:
+                outcome["result"] = fn(*args, **kwargs)
+            return outcome["result"]
+        wrapper._traced = True
+        return wrapper
+    return decorate
+
+
+def instrument(module, *names):
+    """Replace `module.<name>` with a traced version (once per process, however often the app reruns).
+
+    Callers that bound the function with `from module import name` before
+    this call keep the untraced original.
+    """
+    if not ENABLED:
+        return
+    for attr in names:
+        fn = getattr(module, attr)
+        setattr(module, attr, traced(f"{module.__name__}.{attr}")(fn))
+
+
+def stage(name, rows=None):
+    """Context manager recording an inline block; `rows` is its row count if known."""
+    if not ENABLED:
+        return nullcontext({})
+    return _measure(name, rows_in=rows)
+
+
+def debug_panel():
+    """Sidebar table of this rerun's stages; shown only with DASHBOARD_PROFILE_PANEL set."""
+    if not PANEL:
+        return
+    import pandas as pd
+    import streamlit as st
+
+    finished = run_records()
+    # Parents are recorded after their children finish; list stages in start order
+    records = sorted(finished, key=lambda r: r["offset"])
+    with st.sidebar.expander(f"⏱️ Profile ({sum(r['seconds'] for r in records if r['depth'] == 0):.3f}s)"):
+        if not records:
+            st.write("No stages recorded in this run.")
+            return
+        table = pd.DataFrame(records)[["stage", "depth", "seconds", "rows_in", "rows_out", "rss_delta_mb"]]
+        table["stage"] = ["  " * d + s for d, s in zip(table["depth"], table["stage"])]
+        st.dataframe(table.drop(columns="depth"), hide_index=True)
+        st.caption(f"run {finished[-1]['run']} · RSS {finished[-1]['rss_mb']} MB · log: {LOG_PATH}")
@@ -0,0 +1,16 @@
+"""Shared setup: the projects are flat script directories, imported as `benchmarks/hot_paths.py` does."""
+
+import os
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_DIRS = [
+    "Cricket/IPL_Analysis",
+    "Cricket/Match_Insight_Generator",
+    "Football/Football_Player_Scouting_Dashboard",
+    "Soccer ACWR Analysis",
+]
+for _project in PROJECT_DIRS:
+    sys.path.insert(0, os.path.join(REPO_ROOT, _project))
+# ... and the root, for the `Cricket` package
+sys.path.insert(0, REPO_ROOT)
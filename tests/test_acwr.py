@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import acwr
+
+SEASON_DAYS = 90
+
+
+@pytest.fixture(scope="module")
+def raw():
+    """A synthetic wearable export: 5 players with rest days, double sessions and non-Session rows."""
+    rng = np.random.default_rng(7)
+    rows = []
+    for player, position in zip([12, 7, 63, 98, 30], ["CM", "CB", "ST", "GK", "RW"]):
+        first = rng.integers(0, 20)
+        for day in range(first, SEASON_DAYS):
+            if rng.random() < 0.35:
+                continue
+            for period in ["Session"] * rng.integers(1, 3) + ["Warm Up"]:
+                load = rng.uniform(50, 900)
+                rows.append({
+                    "Player.Name": player, "Period.Name": period, "Position.Name": position,
+                    "Date": (pd.Timestamp("2024-07-01") + pd.Timedelta(days=int(day))).strftime("%m/%d/%Y"),
+                    "Total.Player.Load": load, "Player.Load.Per.Minute": rng.uniform(3, 12),
+                    "Maximum.Heart.Rate": rng.uniform(170, 200), "Minimum.Heart.Rate": rng.uniform(50, 80),
+                    "Avg.Heart.Rate": rng.uniform(120, 160),
+                })
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture(scope="module")
+def sessions(raw):
+    return acwr.session_rows(raw, exclude=[98])
+
+
+def notebook_summary(session_rows):
+    """The notebook's per-player resample loop (`playerwise_acwr_summary.csv`)."""
+    session_df = session_rows.set_index("Date")
+    numerics = list(acwr.DAILY_AGG)
+    frames = []
+    for player in session_df["Player.Name"].unique():
+        player_df = session_df[session_df["Player.Name"] == player]
+        latest_meta = player_df[acwr.META_COLUMNS].iloc[-1].to_dict()
+        daily_df = player_df[numerics].resample("D").agg(acwr.DAILY_AGG).fillna(0)
+        daily_df["Acute_stats"] = daily_df["Total.Player.Load"].rolling("7D", 7).sum() / 7
+        daily_df["Chronic_stats"] = daily_df["Total.Player.Load"].rolling("28D", 28).sum() / 28
+        daily_df["ACWR"] = daily_df["Acute_stats"] / daily_df["Chronic_stats"]
+        daily_df["Risk_Flag"] = daily_df["ACWR"].apply(
+            lambda x: "Over training" if x > 1.5 else "Optimum" if x > 0.3 else "Under training")
+        for col, val in latest_meta.items():
+            daily_df[col] = val
+        frames.append(daily_df.reset_index())
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_rolling_model_matches_the_notebook_loop(sessions):
+    expected = notebook_summary(sessions)
+    actual = acwr.squad_acwr(sessions, model="rolling")
+    pd.testing.assert_frame_equal(actual, expected[list(actual.columns)], check_dtype=False)
+
+
+def test_ewma_model_matches_per_player_ewm(sessions):
+    actual = acwr.squad_acwr(sessions, model="ewma")
+    for player, rows in actual.groupby(acwr.PLAYER, sort=False):
+        loads = rows[acwr.LOAD].reset_index(drop=True)
+        for column, days in (("Acute_stats", acwr.ACUTE_DAYS), ("Chronic_stats", acwr.CHRONIC_DAYS)):
+            expected = loads.ewm(span=days, adjust=False, min_periods=days).mean()
+            np.testing.assert_allclose(rows[column], expected, rtol=1e-12, err_msg=f"{player} {column}")
+
+
+def test_excluded_players_and_other_periods_are_dropped(sessions):
+    summary = acwr.squad_acwr(sessions)
+    assert 98 not in set(summary[acwr.PLAYER])
+    assert (sessions["Period.Name"] == acwr.SESSION_PERIOD).all()
+    assert len(summary) == sum(
+        (rows["Date"].max() - rows["Date"].min()).days + 1 for _, rows in sessions.groupby(acwr.PLAYER))
+
+
+@pytest.mark.parametrize("model", acwr.MODELS)
+def test_incremental_updates_match_the_batch_season(sessions, tmp_path, model):
+    batch = acwr.squad_acwr(sessions, model=model).set_index(["Date", acwr.PLAYER])
+    path = str(tmp_path / "state.pkl")
+    cut = sessions["Date"].min() + pd.Timedelta(days=40)
+    updates = []
+    # Days 0-40 in one file, then a day at a time, persisting the state in between
+    for day_sessions in [sessions[sessions["Date"] <= cut]] + [
+            rows for _, rows in sessions[sessions["Date"] > cut].groupby("Date")]:
+        state = acwr.load_state(path, model=model)
+        updates.append(acwr.update_state(state, day_sessions))
+        acwr.save_state(state, path)
+
+    updates = pd.concat(updates, ignore_index=True).set_index(["Date", acwr.PLAYER])
+    expected = batch.loc[updates.index]
+    for column in ["Acute_stats", "Chronic_stats", "ACWR"]:
+        np.testing.assert_allclose(updates[column], expected[column], rtol=1e-9, err_msg=column)
+    assert (updates["Risk_Flag"] == expected["Risk_Flag"]).all()
+
+    latest = acwr.latest_flags(acwr.squad_acwr(sessions, model=model)).set_index(acwr.PLAYER)
+    current = acwr.current_flags(acwr.load_state(path)).set_index(acwr.PLAYER).loc[latest.index]
+    pd.testing.assert_series_equal(current["ACWR"], latest["ACWR"], check_dtype=False, rtol=1e-9)
+
+
+def test_update_rejects_days_already_in_the_state(sessions):
+    state = acwr.empty_state()
+    acwr.update_state(state, sessions)
+    with pytest.raises(ValueError, match="not newer"):
+        acwr.update_state(state, sessions[sessions["Date"] == sessions["Date"].max()])
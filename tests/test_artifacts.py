@@ -0,0 +1,80 @@
+import functools
+import os
+
+import pandas as pd
+import pytest
+
+import artifacts
+import clustering
+import similarity
+
+STATS = clustering.CLUSTER_STATS
+
+
+@pytest.fixture(scope="module")
+def season_stats():
+    return pd.read_csv(os.path.join(artifacts.DATA_DIR, "season_stats_clean.csv"))
+
+
+def _load_index(stats, tmp_path, stats_columns=STATS):
+    return artifacts.load_or_build(
+        "similarity", "Center Back-kd_tree", "v1",
+        lambda: similarity.build_similarity_index(stats, stats_columns),
+        stats['player_id'], stats_columns, artifact_dir=tmp_path)
+
+
+def test_inputs_key_ignores_player_order_only():
+    assert artifacts.inputs_key([3, 1, 2], STATS) == artifacts.inputs_key([1, 2, 3], STATS)
+    assert artifacts.inputs_key([1, 2], STATS) != artifacts.inputs_key([1, 2, 3], STATS)
+    assert artifacts.inputs_key([1, 2], STATS) != artifacts.inputs_key([1, 2], STATS[::-1])
+
+
+def test_changed_player_filter_refits_the_index(season_stats, tmp_path):
+    # Same position label and dataset version, but the filter rules now admit one more player
+    narrow = season_stats.iloc[1:50]
+    wide = season_stats.iloc[:50]
+    _load_index(narrow, tmp_path)
+
+    index = _load_index(wide, tmp_path)
+    assert len(index['players']) == len(wide)
+    assert len(similarity.similar_players(index, wide['player_name'].iloc[0], top_n=5)) == 5
+    assert len(os.listdir(tmp_path / "similarity")) == 2
+
+
+def test_same_inputs_load_the_saved_index(season_stats, tmp_path):
+    stats = season_stats.iloc[:50]
+    first = _load_index(stats, tmp_path)
+    again = artifacts.load_or_build("similarity", "Center Back-kd_tree", "v1", lambda: pytest.fail("refitted"),
+                                    stats['player_id'].sample(frac=1, random_state=0), STATS, artifact_dir=tmp_path)
+    pd.testing.assert_frame_equal(again['players'], first['players'])
+
+
+def test_changed_stats_columns_refit_the_index(season_stats, tmp_path):
+    stats = season_stats.iloc[:50]
+    _load_index(stats, tmp_path)
+    index = _load_index(stats, tmp_path, STATS[:3])
+    assert index['stats_columns'] == STATS[:3]
+
+
+@pytest.fixture
+def tmp_artifacts(monkeypatch, tmp_path):
+    monkeypatch.setattr(artifacts, "load_or_build", functools.partial(artifacts.load_or_build, artifact_dir=tmp_path))
+    return tmp_path
+
+
+def test_changed_player_filter_refits_the_clusters(season_stats, tmp_artifacts):
+    narrow = season_stats.iloc[1:200]
+    wide = season_stats.iloc[:200]
+    clustering.load_or_fit_clusters(narrow, STATS, "Center Back", "v1")
+
+    model = clustering.load_or_fit_clusters(wide, STATS, "Center Back", "v1")
+    assert set(model['labels'].index) == set(wide['player_id'])
+
+
+def test_changed_cluster_count_refits_the_clusters(season_stats, tmp_artifacts):
+    stats = season_stats.iloc[:200]
+    assert len(clustering.load_or_fit_clusters(stats, STATS, "All", "v1")['centroids']) == clustering.N_CLUSTERS
+    assert len(clustering.load_or_fit_clusters(stats, STATS, "All", "v1", n_clusters=6)['centroids']) == 6
+    # The default is the same model whether or not it is passed explicitly
+    clustering.load_or_fit_clusters(stats, STATS, "All", "v1", n_clusters=clustering.N_CLUSTERS)
+    assert len(os.listdir(tmp_artifacts / "clusters")) == 2
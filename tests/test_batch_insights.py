@@ -0,0 +1,52 @@
+import concurrent.futures
+
+import pandas as pd
+import pytest
+
+import match_insights as mi
+from Cricket import cricket_data
+
+
+@pytest.fixture(scope="module")
+def frames():
+    df, batting, bowling = mi.clean_data(cricket_data.match_insights_view())
+    return df, batting, bowling, mi.build_match_index(df)
+
+
+def _assert_same(expected, actual):
+    assert set(actual) == set(expected)
+    for match_id, (text, *tables) in expected.items():
+        assert actual[match_id][0] == text
+        for table, other in zip(tables, actual[match_id][1:]):
+            pd.testing.assert_frame_equal(other, table)
+
+
+def test_worker_chunks_match_the_serial_batch(frames, monkeypatch):
+    df, batting, bowling, index = frames
+    match_ids = list(index["rows"])[:70]
+    serial = mi.generate_batch_insights(df, batting, bowling, match_ids=match_ids, match_index=index)
+    monkeypatch.setattr(mi, "MIN_MATCHES_PER_PROCESS", 10)
+    parallel = mi.generate_batch_insights(df, batting, bowling, match_ids=match_ids, match_index=index, processes=4)
+    _assert_same(serial, parallel)
+
+
+def test_counts_are_int64_whatever_their_values(frames):
+    df, batting, bowling, index = frames
+    for match_id in list(index["rows"])[:20]:
+        _, batting_phase, bowling_phase, batting_merge, bowling_merge = mi.generate_insights(
+            df, batting, bowling, match_id, match_index=index)
+        assert batting_merge[["runs_match", "balls_match"]].dtypes.eq("int64").all()
+        assert bowling_merge[["balls_bowled_x", "runs_conceded_x"]].dtypes.eq("int64").all()
+        assert batting_phase[["runs_phase", "balls_phase"]].dtypes.eq("int64").all()
+        assert bowling_phase[["runs_phase", "balls_phase"]].dtypes.eq("int64").all()
+
+
+def test_small_batches_run_serially(frames, monkeypatch):
+    df, batting, bowling, index = frames
+
+    def no_pool(*args, **kwargs):
+        raise AssertionError("started a process pool for a single season")
+
+    monkeypatch.setattr(concurrent.futures, "ProcessPoolExecutor", no_pool)
+    season = mi.generate_batch_insights(df, batting, bowling, season=2024, processes=4)
+    assert len(season) == df.loc[df["season"] == 2024, "match_id"].nunique()
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from Cricket import cricket_data
+from Cricket.Match_Insight_Generator.match_insights import build_match_index, clean_data
+
+
+@pytest.fixture(scope="module")
+def shared():
+    cricket_data.deliveries(["match_id"])
+    return cricket_data._shared[cricket_data.STORE_DIR]["frame"]
+
+
+def _values(series):
+    # Categoricals are compared by their codes; to_numpy() would materialise the names
+    return series.array.codes if isinstance(series.dtype, pd.CategoricalDtype) else series.to_numpy()
+
+
+def _shares(view, frame, column, source=None):
+    return np.shares_memory(_values(view[column]), _values(frame[source or column]))
+
+
+def test_frame_has_the_canonical_schema(shared):
+    assert {col: str(dtype) for col, dtype in shared.dtypes.items()} == cricket_data.SCHEMA
+    assert shared["season"].is_monotonic_increasing
+
+
+def test_projection_and_season_slice_are_views(shared):
+    view = cricket_data.deliveries(["striker", "batsman_runs"], [2023, 2024])
+    assert list(view.columns) == ["striker", "batsman_runs"]
+    assert sorted(cricket_data.deliveries(["season"], [2023, 2024])["season"].unique()) == [2023, 2024]
+    assert len(view) == shared["season"].isin([2023, 2024]).sum()
+    assert _shares(view, shared, "batsman_runs")
+
+
+def test_non_contiguous_seasons_select_the_right_rows(shared):
+    view = cricket_data.deliveries(["season"], [2008, 2025])
+    assert set(view["season"].unique()) == {2008, 2025}
+    assert len(view) == shared["season"].isin([2008, 2025]).sum()
+
+
+def test_writes_to_a_view_never_reach_the_shared_frame(shared):
+    before = shared["batsman_runs"].copy()
+    view = cricket_data.deliveries(["batsman_runs"], [2024])
+    view.iloc[:10, 0] = 99
+    view["batsman_runs"] += 1
+    pd.testing.assert_series_equal(shared["batsman_runs"], before)
+    assert cricket_data.deliveries(["batsman_runs"], [2024])["batsman_runs"].max() <= 6
+
+
+def test_match_insights_view_maps_the_columns(shared):
+    view = cricket_data.match_insights_view()
+    assert list(view.columns) == list(cricket_data.MATCH_INSIGHTS_COLUMNS)
+    for name, source in cricket_data.MATCH_INSIGHTS_COLUMNS.items():
+        if not callable(source):
+            assert _shares(view, shared, name, source), name
+    np.testing.assert_array_equal(view["over"], shared["over"] + 1)
+    legal = ~shared["extras_type"].isin(["wide", "noballs", "noball"])
+    np.testing.assert_array_equal(view["legal_ball"], legal.astype("int8"))
+    # Derived columns are computed once and shared by every later view
+    assert _shares(view, cricket_data.match_insights_view([2024]), "legal_ball")
+
+
+def test_match_insight_generator_uses_the_view_as_is():
+    view = cricket_data.match_insights_view()
+    df, batting, bowling = clean_data(view)
+    assert df is view
+    index = build_match_index(df)
+    assert len(index["rows"]) == df["match_id"].nunique()
+    season = next(iter(index["fixtures"]))
+    team = next(iter(index["fixtures"][season]))
+    dates = next(iter(index["fixtures"][season][team].values()))
+    assert all(len(date) == 10 for date in dates)
@@ -0,0 +1,57 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import plotly.graph_objects as go
+
+import figures
+
+
+def _build(key):
+    def build():
+        time.sleep(0.001)  # let other sessions miss on the same key meanwhile
+        return go.Figure(layout={"title": {"text": f"{key}" * 20}})
+    return build
+
+
+def _assert_consistent(cache):
+    assert cache.size == sum(len(payload) for payload in cache._entries.values())
+    assert cache.size <= cache.max_bytes
+
+
+def test_size_tracks_the_stored_payloads():
+    cache = figures.FigureCache()
+    first = cache.get_or_build("a", _build("a"))
+    assert cache.get_or_build("a", lambda: None).layout.title.text == first.layout.title.text
+    cache.get_or_build("b", _build("b"))
+    _assert_consistent(cache)
+    cache.clear()
+    assert cache.size == 0 and len(cache) == 0
+
+
+def test_lru_eviction_keeps_the_budget():
+    payload = len(_build("k0")().to_json())
+    cache = figures.FigureCache(max_bytes=3 * payload)
+    for key in ["k0", "k1", "k2", "k0", "k3"]:
+        cache.get_or_build(key, _build(key))
+    # k1 was least recently used when k3 arrived
+    assert list(cache._entries) == ["k2", "k0", "k3"]
+    _assert_consistent(cache)
+
+
+def test_shared_cache_stays_consistent_across_session_threads():
+    payload = len(_build("k0")().to_json())
+    cache = figures.FigureCache(max_bytes=5 * payload)
+    keys = [f"k{i % 8}" for i in range(400)]
+    start = threading.Barrier(8)
+
+    def session(offset):
+        start.wait()
+        for key in keys[offset::8] + keys[:offset * 10]:
+            fig = cache.get_or_build(key, _build(key))
+            assert fig.layout.title.text == key * 20
+
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(session, range(8)))
+    _assert_consistent(cache)
+    assert 0 < len(cache) <= 5
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import form
+import rankings
+from ipl_store import ensure_store, read_deliveries
+
+
+@pytest.fixture(scope="module")
+def deliveries():
+    return read_deliveries(form.COLUMNS, [2023, 2024], store_dir=ensure_store())
+
+
+@pytest.fixture(scope="module", params=form.KINDS)
+def counts(request, deliveries):
+    return request.param, form.match_counts(deliveries, request.param)
+
+
+def _assert_states_equal(actual, expected):
+    pd.testing.assert_series_equal(actual['as_of'], expected['as_of'])
+    pd.testing.assert_frame_equal(actual.drop(columns='as_of'), expected.drop(columns='as_of'),
+                                  check_exact=False, rtol=1e-9)
+
+
+def test_batch_fold_in_equals_one_match_at_a_time(counts):
+    kind, per_match = counts
+    batch = form.fold_in(None, per_match, kind)
+
+    sequential = None
+    flat = per_match.reset_index()
+    for _, match in flat.sort_values("date", kind="stable").groupby("match_id", sort=False):
+        sequential = form.fold_in(sequential, match.set_index(per_match.index.names), kind)
+    _assert_states_equal(sequential, batch)
+
+
+def test_season_by_season_equals_all_at_once(counts):
+    kind, per_match = counts
+    seasons = per_match.reset_index()["date"].dt.year
+    first = per_match[(seasons == 2023).to_numpy()]
+    second = per_match[(seasons == 2024).to_numpy()]
+    _assert_states_equal(form.fold_in(form.fold_in(None, first, kind), second, kind),
+                         form.fold_in(None, per_match, kind))
+
+
+def test_form_is_the_decayed_sum_of_every_match(counts):
+    kind, per_match = counts
+    player = rankings.RANKINGS[kind]["player"]
+    columns = rankings.RANKINGS[kind]["counts"]
+    as_of = pd.Timestamp("2025-01-01")
+    stats = form.form_stats(form.fold_in(None, per_match, kind), kind, as_of).set_index([player, "phase"])
+
+    flat = per_match.reset_index()
+    weights = 0.5 ** ((as_of - flat["date"]).dt.days / form.HALF_LIFE_DAYS)
+    expected = flat[columns].mul(weights, axis=0).groupby([flat[player], flat["phase"]]).sum()
+    # form_stats() shows the decayed counts to one decimal
+    np.testing.assert_allclose(stats.loc[expected.index, columns], expected, atol=0.05 + 1e-9)
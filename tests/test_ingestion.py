@@ -0,0 +1,66 @@
+import inspect
+import json
+import os
+
+import pytest
+
+import ingestion
+
+
+def _match(tmp_path, match_id=1):
+    lineup = [{"team_id": 1, "team_name": "Home", "lineup": [
+        {"player_id": 10, "player_name": "In Lineup", "country": None, "cards": [],
+         "positions": [{"position": "Center Back", "from": "00:00", "to": None}]},
+    ]}]
+    # Player 20 has events but is missing from the lineups file
+    events = [{"minute": minute, "second": 0, "type": {"name": "Pass"}, "player": {"id": player, "name": name}}
+              for minute, player, name in [(1, 10, "In Lineup"), (2, 20, "Events Only"), (90, 20, "Events Only")]]
+    for kind, payload in (("lineups", lineup), ("events", events)):
+        (tmp_path / kind).mkdir(exist_ok=True)
+        (tmp_path / kind / f"{match_id}.json").write_text(json.dumps(payload))
+
+
+def test_players_missing_from_the_lineups_keep_their_events(tmp_path):
+    _match(tmp_path)
+    partials, _ = ingestion.ingest_match(tmp_path, 1)
+    assert partials.set_index("player_id")["player_name"].to_dict() == {10: "In Lineup", 20: "Events Only"}
+
+    stats = ingestion.build_season_stats(partials, min_minutes=0)
+    assert stats.set_index("player_name")["pass_total"].to_dict() == {"In Lineup": 1, "Events Only": 2}
+
+
+def test_season_stats_columns(tmp_path):
+    _match(tmp_path)
+    stats = ingestion.build_season_stats(ingestion.ingest_match(tmp_path, 1)[0], min_minutes=0)
+    per90 = [f"{metric}_per90" for metric in ingestion.PER90_METRICS]
+    assert list(stats.columns) == ["player_id", "player_name", "minutes_played"] + ingestion.COUNT_COLUMNS + per90
+
+
+
+def _stored(tmp_path):
+    _match(tmp_path)
+    store = str(tmp_path / "store")
+    ingestion._write_match(store, 1, *ingestion.ingest_match(tmp_path, 1))
+    return store
+
+
+def test_outputs_default_to_a_separate_directory():
+    default = inspect.signature(ingestion.write_outputs).parameters["output_dir"].default
+    assert default == ingestion.OUTPUT_DIR
+    assert os.path.abspath(default) != os.path.abspath(ingestion.SHIPPED_DIR)
+
+
+def test_shipped_csvs_are_only_replaced_on_request(tmp_path, monkeypatch):
+    store = _stored(tmp_path)
+    shipped = tmp_path / "processed_data"
+    shipped.mkdir()
+    (shipped / "season_stats_clean.csv").write_text("cluster\n1\n")
+    monkeypatch.setattr(ingestion, "SHIPPED_DIR", str(shipped))
+
+    with pytest.raises(ValueError, match="overwrite_shipped"):
+        ingestion.write_outputs(store, str(shipped))
+    assert (shipped / "season_stats_clean.csv").read_text() == "cluster\n1\n"
+    assert sorted(os.listdir(shipped)) == ["season_stats_clean.csv"]
+
+    ingestion.write_outputs(store, str(shipped), min_minutes=0, overwrite_shipped=True)
+    assert "player_name" in (shipped / "season_stats_clean.csv").read_text()
@@ -0,0 +1,50 @@
+import zipfile
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import ipl_store
+
+
+@pytest.fixture(scope="module")
+def raw():
+    """The CSV as plain pandas parses it, in the store's season order."""
+    with zipfile.ZipFile(ipl_store.ZIP_PATH) as zf, zf.open(ipl_store.CSV_NAME) as fh:
+        df = pd.read_csv(fh, usecols=ipl_store.STORE_COLUMNS)
+    return df.sort_values("season", kind="stable", ignore_index=True)
+
+
+@pytest.fixture(scope="module")
+def store(tmp_path_factory):
+    return ipl_store.build_store(ipl_store.ZIP_PATH, str(tmp_path_factory.mktemp("store") / "ipl_phase_store"))
+
+
+def test_round_trip_keeps_every_value(raw, store):
+    stored = ipl_store.read_deliveries(store_dir=store)
+    assert len(stored) == len(raw)
+    for col in ipl_store.STORE_COLUMNS:
+        expected, actual = raw[col], stored[col]
+        if col in ipl_store.DATE_COLUMNS:
+            expected = pd.to_datetime(expected, format="%d-%m-%Y")
+        elif col in ipl_store.CATEGORY_COLUMNS:
+            actual = actual.astype(object).where(actual.notna(), np.nan)
+            expected = expected.astype(object)
+        pd.testing.assert_series_equal(actual, expected, check_dtype=False, check_exact=True, obj=col)
+
+
+def test_store_is_typed(store):
+    stored = ipl_store.read_deliveries(store_dir=store)
+    for col, dtype in ipl_store.INT_COLUMNS.items():
+        assert stored[col].dtype == dtype, col
+    assert (stored[ipl_store.CATEGORY_COLUMNS].dtypes == "category").all()
+    assert (stored[ipl_store.BOOL_COLUMNS].dtypes == "bool").all()
+
+
+def test_projection_reads_only_the_requested_seasons_and_columns(raw, store):
+    stored = ipl_store.read_deliveries(["striker", "batsman_runs"], seasons=[2008, 2024], store_dir=store)
+    assert list(stored.columns) == ["season", "striker", "batsman_runs"]
+    expected = raw[raw["season"].isin([2008, 2024])]
+    assert stored["batsman_runs"].tolist() == expected["batsman_runs"].tolist()
+    assert stored["striker"].astype(object).tolist() == expected["striker"].tolist()
+    assert ipl_store.available_seasons(store) == sorted(raw["season"].unique())
@@ -0,0 +1,105 @@
+import shutil
+import zipfile
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import ipl_store
+import leaderboards
+from ipl_store import ensure_store, read_deliveries
+
+SORT_BY = {"batting": "runs", "bowling": "wickets"}
+
+
+@pytest.fixture(scope="module")
+def raw():
+    with zipfile.ZipFile(ipl_store.ZIP_PATH) as zf, zf.open(ipl_store.CSV_NAME) as fh:
+        return pd.read_csv(fh, usecols=["season", "ball"] + sorted(
+            set(leaderboards.BATTING_COLUMNS + leaderboards.BOWLING_COLUMNS)))
+
+
+@pytest.fixture(scope="module")
+def deliveries():
+    columns = sorted(set(leaderboards.BATTING_COLUMNS + leaderboards.BOWLING_COLUMNS))
+    return read_deliveries(columns, store_dir=ensure_store())
+
+
+def baseline(df, kind):
+    """The cap tables as the dashboard computed them from the raw CSV before the cube."""
+    if kind == "batting":
+        legal = df[~df["extras_type"].isin(["wide"])]
+        agg = legal.groupby(['season', 'striker']).agg(
+            runs=('batsman_runs', 'sum'),
+            balls_faced=('ball', 'count'),
+            lost_wicket=('player_dismissed', lambda x: x.notna().sum()),
+            dot_balls=('batsman_runs', lambda x: (x == 0).sum()),
+            boundaries=('batsman_runs', lambda x: ((x == 4) | (x == 6)).sum()),
+            fours=('is_four', 'sum'),
+            sixes=('is_six', 'sum')).reset_index()
+        agg['strike_rate'] = (agg['runs'] / agg['balls_faced'] * 100).round(2)
+        agg['balls_per_dismissal'] = (agg['balls_faced'] / agg['lost_wicket'].replace(0, np.nan)).round(2)
+        agg['batting_avg'] = (agg['runs'] / agg['lost_wicket'].replace(0, np.nan)).round(2)
+        agg['dot_ball_pct'] = (agg['dot_balls'] / agg['balls_faced']).round(2)
+        agg['dismissal_rate'] = (agg['lost_wicket'] / agg['balls_faced']).round(2)
+        return agg
+    df = df.assign(bowler_wicket=df['wicket_type'].isin(leaderboards.BOWLER_DISMISSALS))
+    agg = df.groupby(['season', 'bowler']).agg(
+        wickets=('bowler_wicket', 'sum'),
+        runs_conceded=('total_runs', 'sum'),
+        balls_bowled=('ball', 'count'),
+        dot_balls=('batsman_runs', lambda x: (x == 0).sum()),
+        boundaries=('batsman_runs', lambda x: ((x == 4) | (x == 6)).sum()),
+        fours=('is_four', 'sum'),
+        sixes=('is_six', 'sum')).reset_index()
+    agg['economy_rate'] = (agg['runs_conceded'] / (agg['balls_bowled'] / 6)).round(2)
+    agg['balls_per_wicket'] = (agg['balls_bowled'] / agg['wickets'].replace(0, np.nan)).round(2)
+    agg['bowling_avg'] = (agg['runs_conceded'] / agg['wickets'].replace(0, np.nan)).round(2)
+    agg['dot_ball_pct'] = (agg['dot_balls'] / agg['balls_bowled']).round(2)
+    agg['boundary_pct'] = (agg['boundaries'] / agg['balls_bowled']).round(2)
+    agg['six_pct'] = (agg['sixes'] / agg['balls_bowled']).round(2)
+    return agg
+
+
+@pytest.mark.parametrize("kind", leaderboards.CUBES)
+def test_top_n_matches_the_baseline_tables(raw, deliveries, kind):
+    player, sort_by = leaderboards.CUBES[kind]["player"], SORT_BY[kind]
+    expected_all = baseline(raw, kind)
+    cube = leaderboards.build_cube(kind, deliveries)
+    for season in sorted(raw["season"].unique()):
+        expected = expected_all[expected_all["season"] == season].drop(columns="season")
+        top = leaderboards.top_n(cube, kind, season, sort_by, 10)
+        # Same leading values; players tied on the sort key may be listed in another order
+        assert top[sort_by].tolist() == expected[sort_by].nlargest(10).tolist()
+        expected = expected.set_index(player).loc[top[player], list(top.columns.drop(player))]
+        pd.testing.assert_frame_equal(top.set_index(player), expected, check_dtype=False, obj=f"{kind} {season}")
+
+
+@pytest.mark.parametrize("kind", leaderboards.CUBES)
+def test_appended_season_equals_a_full_build(deliveries, kind):
+    full = leaderboards.build_cube(kind, deliveries)
+    older = leaderboards.build_cube(kind, deliveries[deliveries["season"] < 2025])
+    appended = leaderboards.append_deliveries(older, kind, deliveries[deliveries["season"] == 2025])
+    pd.testing.assert_frame_equal(appended, full)
+
+
+def _write_store(deliveries, store_dir):
+    if store_dir.exists():
+        shutil.rmtree(store_dir)
+    deliveries.to_parquet(store_dir, partition_cols=["season"], index=False)
+
+
+@pytest.mark.parametrize("kind", leaderboards.CUBES)
+def test_later_match_days_of_a_season_reach_the_cube(tmp_path, kind):
+    columns = ["match_id", "date"] + leaderboards.CUBES[kind]["columns"]
+    deliveries = read_deliveries(columns, [2024, 2025], store_dir=ensure_store())
+    store_dir, cube_dir = tmp_path / "store", str(tmp_path / "cube")
+    last_day = deliveries.loc[deliveries["season"] == 2025, "date"].max()
+
+    _write_store(deliveries[deliveries["date"] < last_day], store_dir)
+    leaderboards.update_cube(kind, str(store_dir), cube_dir)
+    _write_store(deliveries, store_dir)
+    refreshed = leaderboards.update_cube(kind, str(store_dir), cube_dir)
+
+    pd.testing.assert_frame_equal(refreshed, leaderboards.build_cube(kind, deliveries))
+    pd.testing.assert_frame_equal(leaderboards.load_cube(kind, cube_dir)[0], refreshed)
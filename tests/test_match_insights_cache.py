@@ -0,0 +1,56 @@
+import os
+import shutil
+
+import pandas as pd
+
+import match_insights as mi
+
+BALLS = pd.DataFrame({
+    "match_id": [1, 1, 2], "season": [2024, 2024, 2024], "striker": ["A", "B", "A"],
+    "bowler": ["X", "X", "Y"], "runs_of_bat": [4, 1, 6], "legal_ball": [1, 1, 1],
+    "player_dismissed": [None, "B", None],
+})
+
+
+def _write(path, balls=BALLS):
+    balls.to_csv(path, index=False)
+    return str(path)
+
+
+def test_reload_reads_the_cached_copy(tmp_path):
+    csv = _write(tmp_path / "ipl.csv")
+    first = mi.load_cached_data(csv)
+    again = mi.load_cached_data(csv)
+    for a, b in zip(first, again):
+        pd.testing.assert_frame_equal(a.reset_index(drop=True), b, check_dtype=False)
+    assert len(os.listdir(tmp_path / ".cache")) == 1
+
+
+def test_changed_csv_replaces_only_its_own_copies(tmp_path):
+    csv = _write(tmp_path / "ipl.csv")
+    other = _write(tmp_path / "ipl-2024.csv")
+    mi.load_cached_data(other)
+    mi.load_cached_data(csv)
+    _write(csv, pd.concat([BALLS, BALLS.assign(match_id=3)]))
+    mi.load_cached_data(csv)
+
+    entries = sorted(os.listdir(tmp_path / ".cache"))
+    assert len(entries) == 2
+    assert [entry.count("-") for entry in entries] == [2, 3]
+
+
+def test_copy_published_by_a_parallel_process_is_kept(tmp_path, monkeypatch):
+    csv = _write(tmp_path / "ipl.csv")
+    replace = os.replace
+
+    def publish_first(src, dst):
+        # Another process publishes the same copy just before this one does
+        shutil.copytree(src, dst)
+        replace(src, dst)
+
+    monkeypatch.setattr(os, "replace", publish_first)
+    frames = mi.load_cached_data(csv)
+    monkeypatch.undo()
+    assert len(frames[0]) == len(BALLS)
+    assert len(os.listdir(tmp_path / ".cache")) == 1
+    pd.testing.assert_frame_equal(mi.load_cached_data(csv)[1], frames[1], check_dtype=False)
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import matchups
+from ipl_store import ensure_store, read_deliveries
+
+
+@pytest.fixture(scope="module")
+def deliveries():
+    return read_deliveries(matchups.COLUMNS, store_dir=ensure_store())
+
+
+@pytest.fixture(scope="module")
+def index(deliveries):
+    return matchups.build_index(matchups.build_cube(deliveries))
+
+
+@pytest.fixture(scope="module")
+def legal(deliveries):
+    legal = deliveries[deliveries["extras_type"] != "wide"]
+    return legal.assign(striker=legal["striker"].astype(str), bowler=legal["bowler"].astype(str),
+                        phase=legal["phase"].astype(str))
+
+
+def brute_force(balls):
+    """Counts and rates for a set of deliveries, straight from the balls."""
+    runs = balls["batsman_runs"].astype("int64")
+    agg = pd.DataFrame({
+        "balls": [len(balls)],
+        "runs": [runs.sum()],
+        "dismissals": [balls["wicket_type"].isin(matchups.BOWLER_DISMISSALS).sum()],
+        "dot_balls": [(runs == 0).sum()],
+        "boundaries": [runs.isin([4, 6]).sum()],
+    })
+    return matchups._rates(agg)
+
+
+def _busiest(legal, column, n, **where):
+    for name, value in where.items():
+        legal = legal[legal[name] == value]
+    return legal[column].value_counts().index[:n].tolist()
+
+
+def test_pair_summary_matches_the_deliveries(legal, index):
+    for striker in _busiest(legal, "striker", 3):
+        for bowler in _busiest(legal, "bowler", 3, striker=striker):
+            pair = legal[(legal["striker"] == striker) & (legal["bowler"] == bowler)]
+            summary = matchups.pair_summary(index, striker, bowler).set_index("phase")
+            for phase in summary.index:
+                balls = pair if phase == "All" else pair[pair["phase"] == phase]
+                expected = brute_force(balls).iloc[0]
+                pd.testing.assert_series_equal(summary.loc[phase], expected, check_dtype=False,
+                                               check_names=False, obj=f"{striker} v {bowler} {phase}")
+            assert set(summary.index) == set(pair["phase"]) | {"All"}
+
+
+def test_worst_matchups_match_a_brute_force_ranking(legal, index):
+    striker = _busiest(legal, "striker", 1)[0]
+    for metric, phase in [("strike_rate", None), ("dismissals", None), ("dot_ball_pct", "Death")]:
+        balls = legal[legal["striker"] == striker]
+        if phase:
+            balls = balls[balls["phase"] == phase]
+        per_bowler = pd.concat({bowler: brute_force(rows) for bowler, rows in balls.groupby("bowler")})
+        per_bowler = per_bowler.droplevel(1)
+        per_bowler = per_bowler[per_bowler["balls"] >= matchups.MIN_BALLS].dropna(subset=[metric])
+
+        worst = matchups.worst_matchups(index, striker, metric, k=5, phase=phase)
+        ascending = matchups.WORST_BY[metric]
+        expected = per_bowler[metric].sort_values(ascending=ascending).head(5)
+        assert worst[metric].tolist() == expected.tolist()
+        # Each listed bowler's figures match the deliveries (ties may list different bowlers)
+        np.testing.assert_array_equal(worst[matchups.COUNTS], per_bowler.loc[worst["bowler"], matchups.COUNTS])
+
+
+def test_unknown_names_give_empty_results(index):
+    assert matchups.pair_rows(index, "Nobody", "Nobody").empty
+    assert matchups.worst_matchups(index, "Nobody").empty
+    assert matchups.bowlers_faced(index, "Nobody") == []
+
+
+def test_appended_season_equals_a_full_build(deliveries):
+    full = matchups.build_cube(deliveries)
+    older = matchups.build_cube(deliveries[deliveries["season"] < 2025])
+    appended = matchups.append_deliveries(older, deliveries[deliveries["season"] == 2025])
+    pd.testing.assert_frame_equal(appended, full)
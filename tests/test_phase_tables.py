@@ -0,0 +1,56 @@
+import io
+import os
+
+import pandas as pd
+import pytest
+
+import phase_tables as pt
+from ipl_store import ensure_store, read_deliveries
+
+# Players the shipped 2020-25 tables count under another spelling in some seasons (see phase_tables)
+RESPELT = {"batting": {"YBK Jaiswal", "Jaiswal", "Nehal Wadhera"},
+           "bowling": {"YS Chahal", "Chahal", "M Pathirana", "Pathirana", "JD Unadkat", "A Nortje", "A Zampa"}}
+PLAYER_TABLES = {"batting": ("player_batting_20_25.csv", "striker"),
+                 "bowling": ("player_bowling_20_25.csv", "bowler")}
+
+
+@pytest.fixture(scope="module")
+def deliveries():
+    return read_deliveries(pt.SCAN_COLUMNS, store_dir=ensure_store())
+
+
+@pytest.fixture(scope="module")
+def tables(deliveries):
+    return pt.derive_tables(pt.build_cubes(deliveries))
+
+
+def test_tables_match_shipped_csvs(tables):
+    differences = pt.compare_tables(tables)
+    assert set(differences) == {name for name, _ in PLAYER_TABLES.values()}
+
+
+@pytest.mark.parametrize("kind", PLAYER_TABLES)
+def test_player_tables_differ_only_for_respelt_players(tables, kind):
+    name, player = PLAYER_TABLES[kind]
+    derived = pd.read_csv(io.StringIO(tables[name].to_csv(index=False)))
+    shipped = pd.read_csv(os.path.join(pt.SHIPPED_DIR, name))
+    counts = list(pt.PLAYER_KINDS[kind]["counts"])
+    keys = [player, "phase"]
+    derived = derived[~derived[player].isin(RESPELT[kind])].set_index(keys)[counts]
+    shipped = shipped[~shipped[player].isin(RESPELT[kind])].set_index(keys)[counts]
+    pd.testing.assert_frame_equal(derived, shipped)
+
+
+def test_refuses_to_overwrite_differing_shipped_tables(tmp_path):
+    before = {name: os.path.getmtime(os.path.join(pt.SHIPPED_DIR, name)) for name, _ in PLAYER_TABLES.values()}
+    with pytest.raises(ValueError, match="player_batting_20_25.csv"):
+        pt.refresh(output_dir=pt.SHIPPED_DIR, cube_dir=tmp_path)
+    assert before == {name: os.path.getmtime(os.path.join(pt.SHIPPED_DIR, name)) for name in before}
+
+
+def test_season_refresh_equals_full_build(deliveries):
+    full = pt.build_cubes(deliveries)
+    stale = pt.build_cubes(deliveries[deliveries["season"] != 2024])
+    partial = pt.build_cubes(deliveries[deliveries["season"] == 2024])
+    for name in pt.CUBES:
+        pd.testing.assert_frame_equal(pt._replace_seasons(stale[name], partial[name], [2024]), full[name])
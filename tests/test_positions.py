@@ -0,0 +1,65 @@
+import json
+
+import pandas as pd
+import pytest
+
+import ingestion
+import positions
+
+
+def _player(player_id, name, *spells):
+    return {"player_id": player_id, "player_name": name, "player_nickname": None, "jersey_number": player_id,
+            "country": {"id": 1, "name": "Nowhere"}, "cards": [], "positions": list(spells)}
+
+
+def _spell(position, start, end=None):
+    return {"position_id": 1, "position": position, "from": start, "to": end, "from_period": 1,
+            "to_period": None if end is None else 2, "start_reason": "Starting XI", "end_reason": "Final Whistle"}
+
+
+def _event(minute, player_id=None, name=None, kind="Pass"):
+    event = {"minute": minute, "second": 0, "type": {"name": kind}}
+    if player_id is not None:
+        event["player"] = {"id": player_id, "name": name}
+    return event
+
+
+@pytest.fixture
+def match(tmp_path):
+    """One match running to 94:00: a full-match CB, a CB -> LCB switch and a late sub."""
+    lineup = [{"team_id": 1, "team_name": "Home", "lineup": [
+        _player(12, "Late Sub", _spell("Left Wing", "80:00")),
+        _player(10, "Full Match", _spell("Center Back", "00:00")),
+        _player(11, "Switched", _spell("Center Back", "00:00", "60:00"), _spell("Left Center Back", "60:00")),
+        _player(13, "Unused Sub"),
+    ]}]
+    events = [_event(0, 10, "Full Match"), _event(30, 11, "Switched"), _event(94)]
+    for kind, payload in (("lineups", lineup), ("events", events)):
+        (tmp_path / kind).mkdir()
+        (tmp_path / kind / "1.json").write_text(json.dumps(payload))
+    return ingestion.ingest_match(tmp_path, 1)
+
+
+def test_open_spells_close_at_the_last_event_in_both_places(match):
+    partials, lineups = match
+    index = positions.build_position_index(lineups)
+    assert index["Center Back"].to_dict() == {10: 94.0, 11: 60.0}
+    assert index["Left Wing"].to_dict() == {12: 14.0}
+
+    # Minutes across every position equal the minutes the season stats are built from
+    in_position = pd.concat([index["All Defenders"], index["All Forwards"]]).groupby(level=0).sum()
+    played = partials.set_index("player_id")["minutes_played"]
+    pd.testing.assert_series_equal(in_position.sort_index(), played[played > 0].sort_index(),
+                                   check_names=False, check_index_type=False)
+
+
+def test_spell_minutes_default_to_regulation_time():
+    lineups = pd.DataFrame({"from_min": [0.0, 80.0, None], "minutes_played": [None, None, None]})
+    assert positions.spell_minutes(lineups).tolist() == [90.0, 10.0, 0.0]
+    assert positions.spell_minutes(lineups, pd.Series([95.0, 95.0, 95.0])).tolist() == [95.0, 15.0, 0.0]
+
+
+def test_position_options_are_groups_then_sorted_positions(match):
+    index = positions.build_position_index(match[1])
+    assert positions.position_options(index) == [
+        "All Defenders", "All Forwards", "Center Back", "Left Center Back", "Left Wing"]
@@ -0,0 +1,31 @@
+import os
+
+import pandas as pd
+
+import figures
+import report
+
+TABLES = {"orange_cap", "purple_cap", "top_batters", "top_bowlers", "form_top_batters", "form_top_bowlers",
+          "matchups", "matchups_by_season", "team_batting_trends", "team_bowling_trends",
+          "player_batting_trends", "player_bowling_trends"}
+
+
+def test_report_has_every_table_without_kaleido(tmp_path, monkeypatch):
+    monkeypatch.setattr(report, "png_available", lambda: False)
+    written = report.build_report(str(tmp_path), formats=("csv", "png"), workers=2)
+    assert {os.path.basename(path) for path in written} == {f"{name}.csv" for name in TABLES}
+
+    for view, config in figures.TREND_VIEWS.items():
+        trends = pd.read_csv(tmp_path / f"{view}_trends.csv")
+        source = pd.read_csv(figures.TREND_SOURCES[view]).dropna(subset=[config["entity"]])
+        # Every team and every player, not only the ones charted
+        assert set(trends[config["entity"]]) == set(source[config["entity"]])
+        assert len(trends) == len(source)
+
+    matchups = pd.read_csv(tmp_path / "matchups.csv")
+    by_season = pd.read_csv(tmp_path / "matchups_by_season.csv")
+    assert matchups["balls"].sum() == by_season["balls"].sum()
+    assert not matchups.duplicated(["striker", "bowler"]).any()
+
+    form_boards = pd.read_csv(tmp_path / "form_top_batters.csv")
+    assert {"phase", "metric", "rank", "value"} <= set(form_boards.columns)
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import win_probability as wp
+from ipl_store import ensure_store, read_deliveries
+
+
+def _innings(match_id, inning, runs, batting, bowling, target, winner):
+    n = len(runs)
+    return pd.DataFrame({
+        "match_id": match_id, "inning": inning, "over": np.arange(n) // 6, "ball": np.arange(n) % 6 + 1,
+        "batting_team": batting, "bowling_team": bowling, "striker": "a", "bowler": "b",
+        "total_runs": runs, "extras_type": None, "is_wicket": False, "player_dismissed": None,
+        "target_runs": target, "winner": winner,
+    })
+
+
+def _match(match_id=1, target=np.nan):
+    """A short match: A make 12 in two overs, B chase and win in the last ball of the second."""
+    first = _innings(match_id, 1, [1, 0, 4, 1, 0, 0, 2, 1, 0, 1, 1, 1], "A", "B", target, "B")
+    second = _innings(match_id, 2, [0, 1, 1, 0, 2, 1, 1, 1, 0, 0, 2, 4], "B", "A", target, "B")
+    return pd.concat([first, second], ignore_index=True)
+
+
+@pytest.fixture(scope="module")
+def table():
+    return wp.build_table(*wp.count_outcomes(read_deliveries(wp.COLUMNS, [2023, 2024], store_dir=ensure_store())))
+
+
+def test_missing_target_is_first_innings_total_plus_one():
+    target = wp.chase_targets(_match())
+    assert (target[_match()["inning"] == 2] == 13).all()
+
+
+def test_missing_target_scores_like_recorded_target(table):
+    recorded = wp.score_deliveries(_match(target=13), table)
+    missing = wp.score_deliveries(_match(), table)
+    pd.testing.assert_frame_equal(missing.drop(columns="target_runs"), recorded.drop(columns="target_runs"))
+
+    chase = missing[missing["inning"] == 2]
+    assert 0 < chase["wp_after"].iloc[:-1].mean() < 1
+    # Winning run: the side batting first has lost
+    assert chase["wp_after"].iloc[-1] == 0
+
+
+def test_underivable_target_drops_the_chase(table):
+    chase_only = _match().query("inning == 2")
+    assert wp.score_deliveries(chase_only, table).empty
+    seen, wins = wp.count_outcomes(chase_only)
+    assert seen.sum() == 0 and wins.sum() == 0
+
+
+def test_missing_targets_count_like_recorded_ones():
+    deliveries = read_deliveries(wp.COLUMNS, [2024], store_dir=ensure_store())
+    blanked = deliveries.assign(target_runs=pd.Series(pd.NA, index=deliveries.index, dtype="Int16"))
+    for recorded, missing in zip(wp.count_outcomes(deliveries), wp.count_outcomes(blanked)):
+        np.testing.assert_array_equal(recorded, missing)
+
+
+def test_store_seasons_without_targets_score_both_innings(table):
+    deliveries = read_deliveries(wp.COLUMNS, [2025], store_dir=ensure_store())
+    assert deliveries["target_runs"].isna().all()
+    scored = wp.score_deliveries(deliveries, table)
+    chases = scored[scored["inning"] == 2]
+    assert len(chases) == (deliveries["inning"] == 2).sum()
+    # Before the fix every 2025 chase counted as already won: wp 0 for the side batting first
+    assert chases["wp_after"].mean() > 0.2